@@ -0,0 +1,93 @@
+"""Benchmark the case list response path: ORM + pydantic vs. column rows + orjson.
+
+Seeds an in-memory SQLite database with N cases and times building the JSON
+body the way list endpoints used to (load CaseDB objects, build Case models,
+validate and dump them against ``list[Case]``) against the current path
+(select CASE_LIST_COLUMNS, encode rows with orjson). Peak memory is measured
+with tracemalloc in a separate run so it does not skew the timings.
+
+Usage:
+    uv run python -m benchmarks.case_list_serialization [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.api.db.database import Base
+from src.api.v1.case.models import CASE_LIST_COLUMNS, CASE_LIST_DEFAULTS, Case, CaseDB, case_from_row
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.serialization import dumps_rows
+from src.api.v1.user.models import UserDB
+
+CASE_LIST = TypeAdapter(list[Case])
+
+
+def _seed(db: Session, rows: int) -> None:
+    db.add(UserDB(username='bench', email='bench@example.com', password='x', is_admin=False))
+    company_id = str(uuid.uuid4())
+    db.add(CompanyDB(id=company_id, name='Bench Co', created_at=datetime.now(timezone.utc)))
+    db.flush()
+    now = datetime.now(timezone.utc)
+    db.bulk_insert_mappings(CaseDB, [
+        {
+            'id': str(uuid.uuid4()), 'responsible_person': f'Person {i % 50}', 'responsible_user_id': 'bench',
+            'status': 'open', 'customer': f'Customer {i}', 'company_id': company_id, 'archived': i % 7 == 0,
+            'created_at': now, 'updated_at': now, 'user_id': 'bench',
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+
+
+def pydantic_path(db: Session) -> bytes:
+    """Build Case models from ORM objects, then validate and dump them like response_model (old path)."""
+    db.expunge_all()
+    cases = [case_from_row(c) for c in db.query(CaseDB).all()]
+    return CASE_LIST.dump_json(CASE_LIST.validate_python(cases))
+
+
+def orjson_path(db: Session) -> bytes:
+    """Encode column rows with orjson (new path)."""
+    return dumps_rows(db.query(CaseDB).with_entities(*CASE_LIST_COLUMNS).all(), CASE_LIST_DEFAULTS)
+
+
+def _measure(fn: Callable[[Session], bytes], db: Session, repeat: int) -> tuple[float, int, int]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(db)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(db)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, len(body)
+
+
+def main() -> None:
+    """Run both paths and print best-of-N time, peak memory and body size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        _seed(db, args.rows)
+        print(f'{args.rows} cases, best of {args.repeat}')
+        for name, fn in (('pydantic', pydantic_path), ('orjson', orjson_path)):
+            seconds, peak, size = _measure(fn, db, args.repeat)
+            print(f'  {name:<9} {seconds * 1000:8.1f} ms  peak {peak / 1_048_576:6.1f} MiB  body {size:,} B')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark how long a cold worker takes to import the application.
+
+Each run imports ``src.api.main`` in a fresh interpreter with ``-X importtime``
+(so nothing is cached in ``sys.modules``) and records the wall time of the
+import. The slowest modules by cumulative import time are listed from the
+last run, and modules that must stay lazy (``LAZY_MODULES``) are reported if
+the import pulled them in anyway.
+
+Usage:
+    uv run python -m benchmarks.import_time [--repeat 5] [--top 15]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Heavy optional dependencies that only specific endpoints need
+LAZY_MODULES = ('markitdown', 'pdfminer')
+
+_PROBE = (
+    'import sys, time\n'
+    'start = time.perf_counter()\n'
+    'import src.api.main\n'
+    'print(time.perf_counter() - start)\n'
+    'print(",".join(m for m in {lazy!r} if m in sys.modules))\n'
+)
+
+
+def _import_once() -> tuple[float, list[str], list[tuple[int, str]]]:
+    """Import the app in a new interpreter; return seconds, eagerly loaded lazy modules and per-module timings."""
+    env = {**os.environ, 'JWT_SECRET_KEY': os.environ.get('JWT_SECRET_KEY', 'benchmark')}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE.format(lazy=LAZY_MODULES)],
+        capture_output=True, text=True, check=True, env=env,
+    )
+    seconds, loaded = result.stdout.splitlines()[-2:]
+    timings = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+            _, cumulative, module = line.split('|', 2)
+            timings.append((int(cumulative), module.strip()))
+    return float(seconds), [m for m in loaded.split(',') if m], timings
+
+
+def main() -> None:
+    """Import the app N times and print best/median import time, the slowest modules and eager heavy imports."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [_import_once() for _ in range(args.repeat)]
+    seconds = sorted(r[0] for r in runs)
+    print(f'import src.api.main, {args.repeat} cold runs')
+    print(f'  best {seconds[0] * 1000:8.1f} ms  median {seconds[len(seconds) // 2] * 1000:8.1f} ms')
+
+    _, loaded, timings = runs[-1]
+    print('  slowest modules (cumulative, last run):')
+    for cumulative, module in sorted(timings, reverse=True)[:args.top]:
+        print(f'    {cumulative / 1000:8.1f} ms  {module}')
+    print(f'  eagerly imported heavy modules: {", ".join(loaded) or "none"}')
+
+
+if __name__ == '__main__':
+    main()
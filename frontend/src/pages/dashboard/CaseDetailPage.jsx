@@ -1,12 +1,28 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useLocation, useNavigate } from "react-router-dom";
 
-import { API } from "./constants";
+import { ACTIVITY_PAGE_SIZE, API } from "./constants";
 import { ActivityTimeline } from "./ActivityTimeline";
 import { CaseDetail } from "./CaseDetail";
 import { CaseEditForm } from "./CaseEditForm";
 import { DocumentsTable } from "./DocumentsTable";
 
+// The activity log is paged: follow after_id until a page comes back short.
+async function fetchActivity(caseId, afterId = null) {
+  const entries = [];
+  let cursor = afterId;
+  for (;;) {
+    const params = new URLSearchParams({ limit: ACTIVITY_PAGE_SIZE });
+    if (cursor) params.set("after_id", cursor);
+    const r = await fetch(`${API}/case/${caseId}/activity?${params}`, { credentials: "include" });
+    if (!r.ok) return entries;
+    const page = await r.json();
+    entries.push(...page);
+    if (page.length < ACTIVITY_PAGE_SIZE) return entries;
+    cursor = page[page.length - 1].id;
+  }
+}
+
 export function CaseDetailPage({ caseId, editMode, user }) {
   const location = useLocation();
   const [c, setC] = useState(location.state?.case || null);
@@ -37,20 +53,45 @@ export function CaseDetailPage({ caseId, editMode, user }) {
         setDocs(d);
         setLoadingDocs(false);
       });
-    fetch(`${API}/case/${caseId}/activity`, { credentials: "include" })
-      .then((r) => (r.ok ? r.json() : []))
-      .then((a) => {
-        setActivity(a);
-        setLoadingActivity(false);
-      });
+    fetchActivity(caseId).then((a) => {
+      setActivity(a);
+      setLoadingActivity(false);
+    });
   }, [caseId]);
 
-  function reloadActivity() {
-    fetch(`${API}/case/${caseId}/activity`, { credentials: "include" })
-      .then((r) => (r.ok ? r.json() : []))
-      .then(setActivity);
+  const lastActivityId = useRef(null);
+  useEffect(() => {
+    lastActivityId.current = activity.length ? activity[activity.length - 1].id : null;
+  }, [activity]);
+
+  function appendActivity(entries) {
+    setActivity((prev) => {
+      const seen = new Set(prev.map((a) => a.id));
+      const fresh = entries.filter((a) => !seen.has(a.id));
+      return fresh.length ? [...prev, ...fresh] : prev;
+    });
   }
 
+  useEffect(() => {
+    const source = new EventSource(`${API}/case/${caseId}/events`, { withCredentials: true });
+    // After a reconnect, fetch only the entries missed while the stream was down.
+    source.addEventListener("open", () => {
+      if (!lastActivityId.current) return;
+      fetchActivity(caseId, lastActivityId.current).then(appendActivity);
+    });
+    source.addEventListener("activity", (e) => appendActivity([JSON.parse(e.data)]));
+    source.addEventListener("case", (e) => setC(JSON.parse(e.data)));
+    // Sent instead of "case"/"activity" when the data was too large for one event.
+    source.addEventListener("stale", () => {
+      fetch(`${API}/case/${caseId}`, { credentials: "include" })
+        .then((r) => (r.ok ? r.json() : null))
+        .then((data) => data && setC(data));
+      fetchActivity(caseId, lastActivityId.current).then(appendActivity);
+    });
+    source.addEventListener("deleted", () => source.close());
+    return () => source.close();
+  }, [caseId]);
+
   async function deleteDocument(filename) {
     await fetch(`${API}/case/${caseId}/documents/${filename}`, {
       method: "DELETE",
@@ -110,7 +151,6 @@ export function CaseDetailPage({ caseId, editMode, user }) {
       }
       const updated = await fetch(`${API}/case/${caseId}/documents`, { credentials: "include" });
       setDocs(updated.ok ? await updated.json() : docs);
-      reloadActivity();
     } catch {
       setUploadError("Network error.");
     } finally {
@@ -312,10 +352,7 @@ export function CaseDetailPage({ caseId, editMode, user }) {
             c={c}
             caseId={caseId}
             isAdmin={!!user?.is_admin}
-            onSaved={(updated) => {
-              setC(updated);
-              reloadActivity();
-            }}
+            onSaved={setC}
           />
         </section>
       )}
@@ -1,2 +1,4 @@
 export const API = "/api/v1";
 export const PAGE_SIZE = 10;
+// Page size for GET /case/{id}/activity (the server caps a page at 1000 entries)
+export const ACTIVITY_PAGE_SIZE = 200;
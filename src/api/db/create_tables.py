@@ -1,14 +1,36 @@
-"""Module creates the necessary tables in the PostgreSQL database."""
+"""Explicit migration step: create the schema and bootstrap storage before the API starts.
 
-# import sys
-# from pathlib import Path
+Brings every table, added column and index up to date (``create_tables``),
+backfills ``team_companies`` and makes sure the MinIO bucket exists. API
+workers no longer do this in their lifespan, so a deploy runs it once instead
+of every worker reflecting the whole schema before it can serve.
 
-# # Add the parent directory to the path to allow imports
-# sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+Run via:  make migrate
+"""
 
-# from src.api.db.database import create_tables
+from dotenv import load_dotenv
 
-# if __name__ == "__main__":
-#     print("Creating database tables...")
-#     create_tables()
-#     print("Tables created successfully.")
+load_dotenv()
+
+from src.api.db.database import SessionLocal, create_tables  # noqa: E402
+from src.api.v1.case.models import db_backfill_team_companies  # noqa: E402
+from src.api.v1.case.storage import ensure_bucket  # noqa: E402
+
+# Register every table on Base.metadata before create_all
+from src.api.v1.company.models import CompanyDB  # noqa: E402, F401
+from src.api.v1.customer.models import CustomerDB  # noqa: E402, F401
+from src.api.v1.user.models import UserChangelogDB, UserDB  # noqa: E402, F401
+
+
+def migrate() -> None:
+    """Create missing tables, columns and indexes, backfill derived tables and ensure the bucket exists."""
+    create_tables()
+    with SessionLocal() as db:
+        db_backfill_team_companies(db)
+    ensure_bucket()
+
+
+if __name__ == "__main__":
+    print("Migrating database schema...")
+    migrate()
+    print("Schema is up to date.")
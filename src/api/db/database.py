@@ -1,9 +1,19 @@
-"""Database connection module for SQLAlchemy."""
+"""Database connection module for SQLAlchemy.
 
+An optional ``[postgresql_replica]`` section in ``database.ini`` adds a second
+engine for read-only routes (``get_read_db``). Reads fall back to the primary
+when no replica is configured, and for ``REPLICA_STICKY_SECONDS`` after the
+same browser session performed a write, so users always see their own changes.
+"""
+
+import os
+import time
 from configparser import ConfigParser
-from typing import Generator
+from typing import Generator, Optional
 
-from sqlalchemy import create_engine
+from fastapi import Depends, Request
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 # Create a base class for declarative models
@@ -34,10 +44,50 @@ config = load_config()
 DATABASE_URL = (
     f"postgresql://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
 )
-engine = create_engine(DATABASE_URL)
+# Without it libpq waits for the OS TCP timeout (minutes) when Postgres is unreachable.
+DB_CONNECT_TIMEOUT_SECONDS = int(os.getenv("DB_CONNECT_TIMEOUT_SECONDS", "10"))
+engine = create_engine(DATABASE_URL, connect_args={"connect_timeout": DB_CONNECT_TIMEOUT_SECONDS})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+REPLICA_SECTION = "postgresql_replica"
+_REPLICA_KEYS = ("user", "password", "host", "port", "database")
+
+
+def _load_replica_config(filename: str = "database.ini") -> Optional[dict]:
+    """Return the replica section of database.ini, or None when it is absent.
+
+    A present but incomplete section is a configuration mistake, not "no replica",
+    so it raises instead of silently sending every read to the primary.
+    """
+    parser = ConfigParser()
+    parser.read(filename)
+    if not parser.has_section(REPLICA_SECTION):
+        return None
+    replica = load_config(filename, section=REPLICA_SECTION)
+    missing = [key for key in _REPLICA_KEYS if not replica.get(key)]
+    if missing:
+        raise ValueError(f"Section {REPLICA_SECTION} in {filename} is missing: {', '.join(missing)}")
+    return replica
+
+
+replica_config = _load_replica_config()
+replica_engine: Optional[Engine] = None
+ReplicaSessionLocal: Optional[sessionmaker] = None
+if replica_config:
+    REPLICA_DATABASE_URL = (
+        f"postgresql://{replica_config['user']}:{replica_config['password']}"
+        f"@{replica_config['host']}:{replica_config['port']}/{replica_config['database']}"
+    )
+    replica_engine = create_engine(REPLICA_DATABASE_URL, connect_args={"connect_timeout": DB_CONNECT_TIMEOUT_SECONDS})
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+# Read-your-writes: after a successful mutation the client carries this cookie and
+# its reads go to the primary until it expires (covers typical replication lag).
+STICKY_COOKIE = "db_primary_until"
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+
 def get_db() -> Generator[Session, None, None]:
     """Get database session."""
     db = SessionLocal()
@@ -47,6 +97,55 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def _is_sticky(request: Request) -> bool:
+    """Return True while the client is inside its read-your-writes window."""
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, "0")) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)) -> Generator[Session, None, None]:  # noqa: B008
+    """Get a session for read-only work — the replica when configured and not sticky, else the primary.
+
+    Depends on ``get_db`` so that, without a replica, the route shares the primary
+    session already opened by the auth dependency instead of opening a second one.
+    """
+    if ReplicaSessionLocal is None or _is_sticky(request):
+        yield db
+        return
+    replica = ReplicaSessionLocal()
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+
+def _add_missing_columns(bind: Engine) -> None:
+    """Add model columns missing from existing tables; new columns must be nullable or have a server default."""
+    inspector = inspect(bind)
+    preparer = bind.dialect.identifier_preparer
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = (
+                    f'ALTER TABLE {preparer.format_table(table)} '
+                    f'ADD COLUMN {preparer.format_column(column)} {column.type.compile(bind.dialect)}'
+                )
+                if column.server_default is not None:
+                    ddl += f' DEFAULT {column.server_default.arg}'
+                if not column.nullable:
+                    ddl += ' NOT NULL'
+                conn.execute(text(ddl))
+
+
 def create_tables() -> None:
-    """Create all tables defined in models."""
+    """Create all tables defined in models, plus any columns and indexes added to existing tables since."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns(engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,80 @@
+"""Per-request SQL statement counting and N+1 detection.
+
+Listeners are attached to the SQLAlchemy ``Engine`` class, so every engine —
+the application engine and the in-memory test engines alike — is covered.
+Counting only happens inside ``track_queries()``; outside of it the listeners
+return immediately.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class QueryStats:
+    """Statements executed and time spent in the database during one unit of work."""
+
+    def __init__(self) -> None:
+        """Start with no statements recorded."""
+        self.count = 0
+        self.total_ms = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        """Add one executed statement."""
+        self.count += 1
+        self.total_ms += duration_ms
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Return statements executed at least ``threshold`` times, most frequent first."""
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar('kanapi_query_stats', default=None)
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn: Any, *_: Any) -> None:  # noqa: ANN401
+    if _current.get() is not None:
+        conn.info.setdefault('kanapi_query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn: Any, _cursor: Any, statement: str, *_: Any) -> None:  # noqa: ANN401
+    stats = _current.get()
+    starts = conn.info.get('kanapi_query_start')
+    if stats is None or not starts:
+        return
+    stats.record(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in the current context (request, test, script)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Test helper — fail if the enclosed block executes more than ``limit`` statements."""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        listing = '\n'.join(f'  {n}x {s}' for s, n in stats.statements.most_common())
+        raise AssertionError(f'Expected at most {limit} queries, got {stats.count}:\n{listing}')
@@ -23,7 +23,7 @@ from uuid_extensions import uuid7
 load_dotenv()
 
 from src.api.db.database import SessionLocal, create_tables  # noqa: E402
-from src.api.v1.case.models import CaseDB  # noqa: E402
+from src.api.v1.case.models import CaseDB, db_rebuild_team_companies  # noqa: E402
 from src.api.v1.case.storage import BUCKET, _client, ensure_bucket  # noqa: E402
 from src.api.v1.company.models import CompanyDB  # noqa: E402
 from src.api.v1.user.models import UserDB  # noqa: E402
@@ -206,6 +206,7 @@ def run() -> None:
     # Drop all tables to cleanly apply schema changes (seed is always destructive)
     db_init = SessionLocal()
     try:
+        db_init.execute(text("DROP TABLE IF EXISTS team_companies CASCADE"))
         db_init.execute(text("DROP TABLE IF EXISTS cases CASCADE"))
         db_init.execute(text("DROP TABLE IF EXISTS customers CASCADE"))
         db_init.execute(text("DROP TABLE IF EXISTS users CASCADE"))
@@ -332,6 +333,7 @@ def run() -> None:
         globex_case_ids = _add_cases(db, user_ids=globex_users, company_ids=[globex_client1_id])
 
         db.commit()
+        db_rebuild_team_companies(db)
 
         # ── MinIO documents ──────────────────────────────────────────────────
         ensure_bucket()
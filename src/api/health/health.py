@@ -1,22 +1,219 @@
-"""Health check endpoints for the application."""
+"""Health check endpoints for the application.
 
+``/health/live`` only says the process is running. ``/health/startup`` fails
+until ``warm_up``, started in the background by the app lifespan, has opened
+database connections, the MinIO and OpenFGA clients and the per-worker caches
+so the first real requests do not pay for them.
+
+``/health/ready`` probes Postgres, MinIO and OpenFGA concurrently, each bounded
+by ``HEALTH_CHECK_TIMEOUT_SECONDS``, and answers 503 with the per-dependency
+latency when any of them is down. The result is cached per worker for
+``HEALTH_CACHE_SECONDS`` and concurrent probes share one round of checks, so
+frequent kubelet probes do not add load to the dependencies.
+"""
+
+from __future__ import annotations
+
+import asyncio
 import http
+import logging
+import math
+import os
+import time
+from typing import TYPE_CHECKING
+
+import jwt
+from fastapi import APIRouter, Response
+from pydantic import BaseModel
+from sqlalchemy import create_engine, text
 
-from fastapi import APIRouter
+from src.api.db.database import SessionLocal, engine
+from src.api.metrics.metrics import DEPENDENCY_CHECK_SECONDS, DEPENDENCY_UP
+from src.api.v1.auth.auth import ALGORITHM, SECRET_KEY, create_access_token
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv('HEALTH_CHECK_TIMEOUT_SECONDS', '2'))
+HEALTH_CACHE_SECONDS = float(os.getenv('HEALTH_CACHE_SECONDS', '5'))
+WARMUP_TIMEOUT_SECONDS = float(os.getenv('WARMUP_TIMEOUT_SECONDS', '10'))
+WARMUP_DB_CONNECTIONS = int(os.getenv('WARMUP_DB_CONNECTIONS', '5'))
+
+
+class DependencyHealth(BaseModel):
+    """Outcome of probing one dependency."""
+
+    ok: bool
+    latency_ms: float
+    error: str | None = None
+
+
+class Readiness(BaseModel):
+    """Readiness of this worker and each dependency it needs."""
+
+    ready: bool
+    dependencies: dict[str, DependencyHealth]
+
+
+# asyncio.wait_for cannot stop the worker thread behind a timed-out probe, so the probe's own
+# connection gives up on its own: no waiting for the app pool, and connect/statement timeouts.
+_probe_engine = create_engine(
+    engine.url,
+    pool_size=1,
+    max_overflow=0,
+    pool_timeout=HEALTH_CHECK_TIMEOUT_SECONDS,
+    connect_args={
+        'connect_timeout': max(2, math.ceil(HEALTH_CHECK_TIMEOUT_SECONDS)),  # libpq's minimum is 2
+        'options': f'-c statement_timeout={int(HEALTH_CHECK_TIMEOUT_SECONDS * 1000)}',
+    },
+)
+
+
+def _ping_postgres() -> None:
+    with _probe_engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+
+
+async def _check_postgres() -> None:
+    await asyncio.to_thread(_ping_postgres)
+
+
+# The MinIO, OpenFGA and company modules are imported on first use so this module stays cheap to import.
+async def _check_minio() -> None:
+    from src.api.v1.case.storage import check_bucket
+    await asyncio.to_thread(check_bucket)
+
+
+async def _check_openfga() -> None:
+    from src.api.v1.auth.fga import ping_fga
+    await ping_fga()
+
+
+PROBES: dict[str, Callable[[], Awaitable[None]]] = {
+    'postgres': _check_postgres,
+    'minio': _check_minio,
+    'openfga': _check_openfga,
+}
+
+
+async def _probe(name: str, check: Callable[[], Awaitable[None]]) -> DependencyHealth:
+    start = time.perf_counter()
+    error = None
+    try:
+        await asyncio.wait_for(check(), HEALTH_CHECK_TIMEOUT_SECONDS)
+    except TimeoutError:
+        error = f'timed out after {HEALTH_CHECK_TIMEOUT_SECONDS:g}s'
+    except Exception as e:
+        # The endpoint is unauthenticated: report the error type only, log the details
+        error = type(e).__name__
+        logger.warning("Readiness probe for %s failed: %s", name, e)
+    elapsed = time.perf_counter() - start
+    DEPENDENCY_CHECK_SECONDS.labels(name).observe(elapsed)
+    DEPENDENCY_UP.labels(name).set(error is None)
+    return DependencyHealth(ok=error is None, latency_ms=round(elapsed * 1000, 2), error=error)
+
+
+async def _probe_all() -> Readiness:
+    results = await asyncio.gather(*(_probe(name, check) for name, check in PROBES.items()))
+    dependencies = dict(zip(PROBES, results))
+    return Readiness(ready=all(d.ok for d in results), dependencies=dependencies)
+
+
+_cached: tuple[float, Readiness] | None = None
+_inflight: asyncio.Task[Readiness] | None = None
+
+
+async def check_readiness() -> Readiness:
+    """Return the cached readiness report, probing the dependencies when it has expired."""
+    global _cached, _inflight
+    if _cached is not None and _cached[0] > time.monotonic():
+        return _cached[1]
+    if _inflight is None or _inflight.done():
+        _inflight = asyncio.get_running_loop().create_task(_probe_all())
+    report = await asyncio.shield(_inflight)
+    _cached = (time.monotonic() + HEALTH_CACHE_SECONDS, report)
+    return report
+
+
+# ─── Startup warm-up ──────────────────────────────────────────────────────
+
+
+def _warm_postgres() -> None:
+    pool_size = getattr(engine.pool, 'size', lambda: WARMUP_DB_CONNECTIONS)()
+    connections = [engine.connect() for _ in range(min(WARMUP_DB_CONNECTIONS, pool_size))]
+    try:
+        for conn in connections:
+            conn.execute(text('SELECT 1'))
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+def _warm_company_cache() -> None:
+    from src.api.v1.company.models import db_get_company_directory
+    with SessionLocal() as db:
+        db_get_company_directory(db)
+
+
+async def _warm_jwt() -> None:
+    jwt.decode(create_access_token({'sub': 'warmup'}), SECRET_KEY, algorithms=[ALGORITHM])
+
+
+WARMUP_STEPS: dict[str, Callable[[], Awaitable[None]]] = {
+    'postgres': lambda: asyncio.to_thread(_warm_postgres),
+    'company_cache': lambda: asyncio.to_thread(_warm_company_cache),
+    'minio': _check_minio,
+    'openfga': _check_openfga,
+    'jwt': _warm_jwt,
+}
+
+_started = False
+
+
+async def _warm(name: str, step: Callable[[], Awaitable[None]]) -> None:
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(step(), WARMUP_TIMEOUT_SECONDS)
+    except Exception:
+        logger.warning("Warm-up step %s failed; the first requests will pay for it", name, exc_info=True)
+        return
+    logger.info("Warm-up step %s took %.1f ms", name, (time.perf_counter() - start) * 1000)
+
+
+async def warm_up() -> None:
+    """Open pooled connections and fill per-worker caches, then let the startup probe pass.
+
+    A failing step is logged and skipped: the readiness probe keeps the worker out of rotation
+    while a dependency is actually down, so warm-up never blocks startup on it.
+    """
+    global _started
+    await asyncio.gather(*(_warm(name, step) for name, step in WARMUP_STEPS.items()))
+    _started = True
+
+
+# ─── Endpoints ────────────────────────────────────────────────────────────
+
 
 @router.get("/startup", status_code=http.HTTPStatus.OK)
-async def startup_health() -> http.HTTPStatus:
-    """Health check for application startup."""
+async def startup_health(response: Response) -> http.HTTPStatus:
+    """Health check for application startup; 503 until the warm-up has finished."""
+    if not _started:
+        response.status_code = http.HTTPStatus.SERVICE_UNAVAILABLE
+        return http.HTTPStatus.SERVICE_UNAVAILABLE
     return http.HTTPStatus.OK
 
 
-@router.get("/ready", status_code=http.HTTPStatus.OK)
-async def readiness_check() -> http.HTTPStatus:
-    """Check if the application is ready to receive traffic."""
-    return http.HTTPStatus.OK
+@router.get("/ready", status_code=http.HTTPStatus.OK, responses={503: {"model": Readiness}})
+async def readiness_check(response: Response) -> Readiness:
+    """Check if the application is ready to receive traffic; 503 if a dependency is down."""
+    report = await check_readiness()
+    if not report.ready:
+        response.status_code = http.HTTPStatus.SERVICE_UNAVAILABLE
+    return report
 
 
 @router.get("/live", status_code=http.HTTPStatus.OK)
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -16,20 +17,27 @@ from slowapi.errors import RateLimitExceeded
 load_dotenv(Path(__file__).resolve().parents[3] / ".env", override=True)
 
 # These imports must come after load_dotenv() so env vars are available.
-from .db.database import create_tables  # noqa: E402
+from .db.database import engine, replica_engine  # noqa: E402
 from .health.health import router as health_router  # noqa: E402
+from .health.health import warm_up  # noqa: E402
+from .metrics import router as metrics_router  # noqa: E402
+from .metrics.metrics import instrument_engine, mark_worker_dead  # noqa: E402
 from .middleware.audit import AuditMiddleware  # noqa: E402
+from .middleware.metrics import MetricsMiddleware  # noqa: E402
+from .middleware.profiling import ProfilingMiddleware  # noqa: E402
+from .middleware.query_stats import QueryStatsMiddleware  # noqa: E402
+from .middleware.replica import ReadYourWritesMiddleware  # noqa: E402
 from .middleware.security import SecurityHeadersMiddleware  # noqa: E402
+from .profiling import router as profiling_router  # noqa: E402
+from .profiling.profiler import PROFILING_ENABLED  # noqa: E402
 from .v1.audit import audit_router as audit_v1_router  # noqa: E402
 from .v1.auth.auth import limiter  # noqa: E402
 from .v1.auth.auth import router as auth_v1_router  # noqa: E402
 from .v1.auth.fga import close_fga_client  # noqa: E402
+from .v1.auth.fga_mirror import start_mirror, stop_mirror  # noqa: E402
 from .v1.case.case import router as case_v1_router  # noqa: E402
-from .v1.case.models import (  # noqa: E402, F401
-    CaseActivityDB,
-    CaseDocumentDB,
-)
-from .v1.case.storage import ensure_bucket  # noqa: E402
+from .v1.case.events import start_listener, stop_listener  # noqa: E402
+from .v1.case.models import CaseActivityDB, CaseDocumentDB  # noqa: E402, F401
 from .v1.company import router as company_v1_router  # noqa: E402
 from .v1.company.models import CompanyDB  # noqa: E402, F401
 from .v1.customer import router as customer_v1_rounter  # noqa: E402
@@ -42,12 +50,28 @@ if TYPE_CHECKING:
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
-    """Run startup tasks before yielding, then cleanup on shutdown."""
-    create_tables()
-    ensure_bucket()
+    """Run startup tasks before yielding, then cleanup on shutdown.
+
+    Schema creation and bucket setup are a separate deploy step (``make migrate``). Warm-up runs in the
+    background so the worker accepts connections at once; ``/health/startup`` fails until it is done.
+    """
+    if engine.dialect.name == "postgresql":
+        start_listener()
+    start_mirror()
+    warmup = asyncio.create_task(warm_up())
     yield
+    warmup.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup
+    await stop_mirror()
+    stop_listener()
     await close_fga_client()
+    mark_worker_dead()
+
 
+instrument_engine(engine)
+if replica_engine is not None:
+    instrument_engine(replica_engine)
 
 app = FastAPI(title="kanAPI", description="API for managing cases", lifespan=lifespan)
 
@@ -55,6 +79,12 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(AuditMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if replica_engine is not None:
+    app.add_middleware(ReadYourWritesMiddleware)
 
 _cors_origins = [o.strip() for o in os.environ.get('CORS_ORIGINS', 'http://localhost:5173').split(',') if o.strip()]
 app.add_middleware(
@@ -68,6 +98,8 @@ app.add_middleware(
 prefix = "/api/v1"
 # auxiliary routers
 app.include_router(health_router, prefix=prefix, tags=["health"])
+app.include_router(metrics_router)
+app.include_router(profiling_router, prefix=prefix, tags=["profiling"])
 # v1 routers
 app.include_router(auth_v1_router, prefix=prefix, tags=["v1", "auth"])
 app.include_router(case_v1_router, prefix=prefix, tags=["v1", "case"])
@@ -0,0 +1,5 @@
+"""Prometheus metrics module."""
+
+from .metrics import router
+
+__all__ = ["router"]
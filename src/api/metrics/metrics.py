@@ -0,0 +1,191 @@
+"""Prometheus collectors, timing helpers and the /metrics scrape endpoint.
+
+When uvicorn runs with ``--workers N`` every worker is a separate process, so
+in-process counters would only describe whichever worker answered the scrape.
+Set ``PROMETHEUS_MULTIPROC_DIR`` to an empty, writable directory before the
+workers start; each process then writes its samples there and ``/metrics``
+aggregates all of them.
+
+``/metrics`` is served on the public port, so it requires
+``Authorization: Bearer $METRICS_TOKEN`` and answers 404 while ``METRICS_TOKEN``
+is unset.
+"""
+
+from __future__ import annotations
+
+import hmac
+import http
+import os
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy.engine import Engine
+
+router = APIRouter(tags=["metrics"])
+
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# ── HTTP ────────────────────────────────────────────────────────────────
+HTTP_REQUEST_SECONDS = Histogram(
+    'kanapi_http_request_duration_seconds',
+    'HTTP request latency by route template and method.',
+    ['method', 'route'],
+)
+HTTP_REQUESTS_TOTAL = Counter(
+    'kanapi_http_requests_total',
+    'HTTP requests by route template, method and status code.',
+    ['method', 'route', 'status'],
+)
+HTTP_IN_FLIGHT = Gauge(
+    'kanapi_http_requests_in_flight',
+    'HTTP requests currently being processed.',
+    ['method'],
+    multiprocess_mode='livesum',
+)
+
+# ── SQLAlchemy pool ─────────────────────────────────────────────────────
+DB_POOL_CONNECTIONS = Gauge(
+    'kanapi_db_pool_connections',
+    'Open DBAPI connections held by the SQLAlchemy pool.',
+    multiprocess_mode='livesum',
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'kanapi_db_pool_checked_out',
+    'Pool connections currently checked out by a request.',
+    multiprocess_mode='livesum',
+)
+
+# ── OpenFGA ─────────────────────────────────────────────────────────────
+FGA_REQUEST_SECONDS = Histogram(
+    'kanapi_fga_request_duration_seconds',
+    'OpenFGA call latency by operation.',
+    ['operation'],
+)
+FGA_ERRORS_TOTAL = Counter(
+    'kanapi_fga_errors_total',
+    'OpenFGA calls that raised, by operation.',
+    ['operation'],
+)
+FGA_CHECKS_COALESCED_TOTAL = Counter(
+    'kanapi_fga_checks_coalesced_total',
+    'Permission checks that joined an identical check already queued or in flight instead of calling OpenFGA.',
+)
+FGA_CIRCUIT_OPEN = Gauge(
+    'kanapi_fga_circuit_open',
+    '1 while the OpenFGA circuit breaker is open and calls fail fast, else 0.',
+    multiprocess_mode='max',
+)
+FGA_LOCAL_CHECKS_TOTAL = Counter(
+    'kanapi_fga_local_checks_total',
+    'Permission checks answered by the local tuple mirror (hit) or sent to OpenFGA (miss).',
+    ['result'],
+)
+FGA_MIRROR_LAG_SECONDS = Gauge(
+    'kanapi_fga_mirror_lag_seconds',
+    'Seconds since the local tuple mirror last caught up with the OpenFGA change feed.',
+    multiprocess_mode='max',
+)
+
+# ── MinIO ───────────────────────────────────────────────────────────────
+MINIO_OPERATION_SECONDS = Histogram(
+    'kanapi_minio_operation_duration_seconds',
+    'MinIO operation latency by operation.',
+    ['operation'],
+)
+MINIO_ERRORS_TOTAL = Counter(
+    'kanapi_minio_errors_total',
+    'MinIO operations that raised, by operation.',
+    ['operation'],
+)
+
+# ── Document conversion ─────────────────────────────────────────────────
+DOCUMENT_CONVERSION_SECONDS = Histogram(
+    'kanapi_document_conversion_duration_seconds',
+    'PDF → Markdown conversion time (markitdown + rumdl), by outcome.',
+    ['status'],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+# ── Health ──────────────────────────────────────────────────────────────
+DEPENDENCY_CHECK_SECONDS = Histogram(
+    'kanapi_dependency_check_duration_seconds',
+    'Readiness probe latency by dependency.',
+    ['dependency'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DEPENDENCY_UP = Gauge(
+    'kanapi_dependency_up',
+    '1 if the last readiness probe of the dependency succeeded, else 0.',
+    ['dependency'],
+    multiprocess_mode='min',
+)
+
+
+@contextmanager
+def observe(histogram: Histogram, operation: str, errors: Counter | None = None) -> Iterator[None]:
+    """Time the enclosed block into ``histogram`` and count exceptions in ``errors``."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if errors is not None:
+            errors.labels(operation).inc()
+        raise
+    finally:
+        histogram.labels(operation).observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Track open and checked-out pool connections through SQLAlchemy pool events."""
+    event.listen(engine, 'connect', lambda *_: DB_POOL_CONNECTIONS.inc())
+    event.listen(engine, 'close', lambda *_: DB_POOL_CONNECTIONS.dec())
+    event.listen(engine, 'close_detached', lambda *_: DB_POOL_CONNECTIONS.dec())
+    event.listen(engine, 'checkout', lambda *_: DB_POOL_CHECKED_OUT.inc())
+    event.listen(engine, 'checkin', lambda *_: DB_POOL_CHECKED_OUT.dec())
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess directory on shutdown."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def require_metrics_token(request: Request) -> None:
+    """Allow the scrape only with the configured bearer token; 404 when none is configured."""
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=http.HTTPStatus.NOT_FOUND, detail='Not Found')
+    scheme, _, token = request.headers.get('authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=http.HTTPStatus.UNAUTHORIZED,
+            detail='Invalid metrics token.',
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
+
+
+@router.get('/metrics', include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+def metrics() -> Response:
+    """Expose all collectors in the Prometheus text format."""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
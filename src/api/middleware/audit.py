@@ -41,6 +41,7 @@ _SKIP_PATHS: set[str] = {
     '/api/v1/health/startup',
     '/api/v1/health/ready',
     '/api/v1/health/live',
+    '/metrics',
 }
 
 # Also skip any path starting with these prefixes
@@ -0,0 +1,47 @@
+"""Request metrics middleware — per-route latency histograms and in-flight gauge.
+
+Routes are labelled by their template (``/api/v1/case/{case_id}``), never by
+the raw path, so label cardinality stays bounded.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.metrics.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_SECONDS, HTTP_REQUESTS_TOTAL
+
+if TYPE_CHECKING:
+    from starlette.middleware.base import RequestResponseEndpoint
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+_SKIP_PATHS: set[str] = {
+    '/metrics',
+}
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Record latency, status and concurrency for every routed request."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:  # noqa: D102
+        if request.url.path in _SKIP_PATHS:
+            return await call_next(request)
+
+        method = request.method
+        status = 500
+        HTTP_IN_FLIGHT.labels(method).inc()
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            duration = time.perf_counter() - start
+            HTTP_IN_FLIGHT.labels(method).dec()
+            route = request.scope.get('route')
+            template = getattr(route, 'path', None) or 'unmatched'
+            HTTP_REQUEST_SECONDS.labels(method, template).observe(duration)
+            HTTP_REQUESTS_TOTAL.labels(method, template, str(status)).inc()
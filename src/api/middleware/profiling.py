@@ -0,0 +1,62 @@
+"""Per-request profiling middleware — only installed when PROFILING_ENABLED is set.
+
+A super admin can send ``X-Profile: 1`` with any request; the worker is sampled
+while that request runs and the response body is replaced with the folded
+stacks. Concurrent requests on the same worker show up in the profile too.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException
+from fastapi.responses import PlainTextResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.db.database import SessionLocal
+from src.api.profiling.profiler import PROFILE_HEADER, StackSampler
+from src.api.v1.auth.auth import is_super_admin, user_from_session
+
+if TYPE_CHECKING:
+    from starlette.middleware.base import RequestResponseEndpoint
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    from src.api.v1.user.models import User
+
+
+def _session_user(session: str | None) -> User:
+    with SessionLocal() as db:
+        return user_from_session(db, session)
+
+
+async def _is_super_admin_request(request: Request) -> bool:
+    """Resolve the session cookie to a user, as get_current_user_from_cookie does, and check for super admin."""
+    try:
+        # The lookup is a blocking query; keep it off the event loop.
+        user = await asyncio.to_thread(_session_user, request.cookies.get('session'))
+    except HTTPException:
+        return False
+    return is_super_admin(user)
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Return a sampling profile instead of the response for flagged super admin requests."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:  # noqa: D102
+        if not request.headers.get(PROFILE_HEADER) or not await _is_super_admin_request(request):
+            return await call_next(request)
+
+        sampler = StackSampler(interval=0.001)
+        sampler.start()
+        try:
+            response = await call_next(request)
+            async for _ in response.body_iterator:
+                pass
+        finally:
+            await sampler.stop_async()
+        return PlainTextResponse(
+            sampler.folded(),
+            headers={'X-Profiled-Status': str(response.status_code)},
+        )
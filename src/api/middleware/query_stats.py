@@ -0,0 +1,75 @@
+"""SQL query stats middleware — logs requests that are heavy on the database.
+
+A request is logged when it exceeds ``SQL_QUERY_COUNT_THRESHOLD`` statements or
+``SQL_QUERY_TIME_THRESHOLD_MS`` of database time. Any statement repeated at
+least ``SQL_REPEAT_THRESHOLD`` times is flagged as a likely N+1.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.db.query_stats import track_queries
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from starlette.middleware.base import RequestResponseEndpoint
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+    from src.api.db.query_stats import QueryStats
+
+logger = logging.getLogger(__name__)
+
+_COUNT_THRESHOLD = int(os.getenv('SQL_QUERY_COUNT_THRESHOLD', '25'))
+_TIME_THRESHOLD_MS = float(os.getenv('SQL_QUERY_TIME_THRESHOLD_MS', '200'))
+_REPEAT_THRESHOLD = int(os.getenv('SQL_REPEAT_THRESHOLD', '5'))
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """Count statements and DB time per request and log the outliers.
+
+    The route keeps running while its body is streamed, so the stats are logged
+    once the body iterator is exhausted rather than when ``call_next`` returns.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:  # noqa: D102
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        body = response.body_iterator
+
+        async def body_then_log() -> AsyncIterator[bytes]:
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                _log_stats(request, stats)
+
+        response.body_iterator = body_then_log()
+        return response
+
+
+def _log_stats(request: Request, stats: QueryStats) -> None:
+    """Warn about a request over the count/time thresholds and about repeated statements."""
+    if stats.count > _COUNT_THRESHOLD or stats.total_ms > _TIME_THRESHOLD_MS:
+        logger.warning(
+            '%s %s ran %d SQL statements in %.1fms',
+            request.method,
+            request.url.path,
+            stats.count,
+            stats.total_ms,
+        )
+    for statement, times in stats.repeated(_REPEAT_THRESHOLD):
+        logger.warning(
+            'Possible N+1 in %s %s: statement executed %d times: %s',
+            request.method,
+            request.url.path,
+            times,
+            ' '.join(statement.split())[:300],
+        )
@@ -0,0 +1,41 @@
+"""Read-your-writes middleware for read-replica routing.
+
+After a successful mutating request, sets a short-lived cookie that makes
+``get_read_db`` serve that client's reads from the primary. The cookie carries
+its own expiry, so stickiness works across uvicorn workers without shared state.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.api.db.database import REPLICA_STICKY_SECONDS, STICKY_COOKIE
+
+if TYPE_CHECKING:
+    from starlette.middleware.base import RequestResponseEndpoint
+    from starlette.requests import Request
+    from starlette.responses import Response
+
+_MUTATING_METHODS: set[str] = {'POST', 'PUT', 'PATCH', 'DELETE'}
+_SECURE_COOKIES = os.getenv('COOKIE_SECURE', 'true').lower() in ('true', '1', 'yes')
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Pin a client's reads to the primary for a few seconds after it writes."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:  # noqa: D102
+        response = await call_next(request)
+        if request.method in _MUTATING_METHODS and response.status_code < 400:
+            response.set_cookie(
+                key=STICKY_COOKIE,
+                value=f'{time.time() + REPLICA_STICKY_SECONDS:.3f}',
+                max_age=REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='lax',
+                secure=_SECURE_COOKIES,
+            )
+        return response
@@ -0,0 +1,5 @@
+"""Sampling profiler module."""
+
+from .profiler import router
+
+__all__ = ["router"]
@@ -0,0 +1,112 @@
+"""Opt-in sampling profiler for live uvicorn workers.
+
+Disabled unless ``PROFILING_ENABLED`` is set; when disabled the endpoint
+returns 404 and the request middleware is not installed, so there is no
+per-request cost. Output is in the collapsed ("folded") stack format read by
+``flamegraph.pl``, speedscope and most flamegraph viewers: one line per
+unique stack, frames separated by ``;``, followed by the sample count.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http
+import os
+import sys
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from src.api.v1.auth.auth import get_current_user_from_cookie, is_super_admin
+from src.api.v1.user.models import User
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() in ('true', '1', 'yes')
+PROFILE_HEADER = 'X-Profile'
+
+
+
+def _require_profiling_enabled() -> None:
+    """Answer 404 while profiling is disabled, before authentication, so the route stays hidden."""
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=http.HTTPStatus.NOT_FOUND, detail='Not Found')
+
+
+router = APIRouter(prefix='/profiling', tags=['profiling'], dependencies=[Depends(_require_profiling_enabled)])
+
+CurrentUser = Annotated[User, Depends(get_current_user_from_cookie)]
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    marker = f'{os.sep}site-packages{os.sep}'
+    if marker in filename:
+        filename = filename.split(marker, 1)[1]
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class StackSampler:
+    """Background thread that periodically snapshots the stacks of every other thread."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        """Configure the sampling interval in seconds."""
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='kanapi-profiler', daemon=True)
+
+    def start(self) -> None:
+        """Begin sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        self._thread.join()
+
+    async def stop_async(self) -> None:
+        """Stop sampling; wait for the sampler thread in a worker thread so the event loop keeps running."""
+        self._stop.set()
+        await asyncio.to_thread(self._thread.join)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Return collected samples in collapsed-stack format."""
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.most_common())
+
+
+@router.get('/worker', response_class=PlainTextResponse, status_code=http.HTTPStatus.OK)
+async def profile_worker(
+    current_user: CurrentUser,
+    seconds: float = Query(default=10, gt=0, le=60, description='How long to sample this worker'),
+    interval_ms: float = Query(default=5, ge=1, le=100, description='Sampling interval in milliseconds'),
+) -> PlainTextResponse:
+    """Sample every thread of the worker that serves this request and return folded stacks. Super admin only."""
+    if not is_super_admin(current_user):
+        raise HTTPException(status_code=http.HTTPStatus.FORBIDDEN, detail='Super admin access required.')
+    sampler = StackSampler(interval=interval_ms / 1000)
+    sampler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        await sampler.stop_async()
+    return PlainTextResponse(sampler.folded(), headers={'X-Profile-Pid': str(os.getpid())})
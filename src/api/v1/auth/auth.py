@@ -157,23 +157,13 @@ async def get_current_user(
     return User.model_validate(user_db)
 
 
-async def get_current_user_from_cookie(
-    db: Annotated[Session, Depends(get_db)],
-    session: Annotated[str | None, Cookie()] = None,
-) -> User:
-    """Get the current user from the session cookie.
+def is_super_admin(user: User) -> bool:
+    """Return True for super admins: admins without a parent account."""
+    return bool(user.is_admin) and user.parent_id is None
 
-    Args:
-        session: Session cookie
-        db: SQLAlchemy database session
 
-    Returns:
-        User object
-
-    Raises:
-        HTTPException: If cookie is invalid or user not found
-
-    """
+def user_from_session(db: Session, session: str | None) -> User:
+    """Resolve a session cookie value to its user; raise 401 if it is missing, invalid or the user is gone."""
     if not session:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -205,6 +195,26 @@ async def get_current_user_from_cookie(
     return User.model_validate(user_db)
 
 
+async def get_current_user_from_cookie(
+    db: Annotated[Session, Depends(get_db)],
+    session: Annotated[str | None, Cookie()] = None,
+) -> User:
+    """Get the current user from the session cookie.
+
+    Args:
+        session: Session cookie
+        db: SQLAlchemy database session
+
+    Returns:
+        User object
+
+    Raises:
+        HTTPException: If cookie is invalid or user not found
+
+    """
+    return user_from_session(db, session)
+
+
 @router.post("/token", response_model=Token)
 @limiter.limit(_AUTH_RATE_LIMIT or "10/minute")
 async def login_for_access_token(
@@ -1,12 +1,35 @@
-"""OpenFGA authorization client and FastAPI dependency helpers."""
+"""OpenFGA authorization client and FastAPI dependency helpers.
+
+The shared client is tuned from the environment: ``FGA_MAX_CONNECTIONS`` and
+``FGA_KEEPALIVE_SECONDS`` size its connection pool, ``FGA_TIMEOUT_SECONDS``
+bounds each HTTP call, and 429/5xx responses are retried up to
+``FGA_MAX_RETRIES`` times with jittered exponential backoff starting at
+``FGA_RETRY_MIN_WAIT_MS``. ``batch_check`` requests are split into chunks of
+``FGA_BATCH_CHECK_SIZE`` sent at most ``FGA_MAX_PARALLEL_REQUESTS`` at a time.
+
+Every call goes through a circuit breaker: after ``FGA_BREAKER_THRESHOLD``
+consecutive timeouts, connection errors or 5xx responses it opens and calls
+fail fast with 503 for ``FGA_BREAKER_RESET_SECONDS``, after which a single
+trial call decides whether it closes again.
+
+``check_permission`` calls are coalesced per worker: concurrent checks for
+the same (user, relation, object) share one in-flight request, and distinct
+checks arriving within ``FGA_CHECK_BATCH_WINDOW_MS`` are sent together as one
+``batch_check``.
+"""
 
 from __future__ import annotations
 
+import asyncio
 import http
 import logging
 import os
+import ssl
+import time
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, Annotated
 
+import aiohttp
 from fastapi import Depends, HTTPException
 from openfga_sdk.client import ClientConfiguration, OpenFgaClient
 from openfga_sdk.client.models import (
@@ -16,20 +39,168 @@ from openfga_sdk.client.models import (
     ClientTuple,
     ClientWriteRequest,
 )
+from openfga_sdk.configuration import RetryParams
 from openfga_sdk.credentials import CredentialConfiguration, Credentials
-from openfga_sdk.exceptions import FgaValidationException, ValidationException
+from openfga_sdk.exceptions import (
+    FgaValidationException,
+    RateLimitExceededError,
+    ServiceException,
+    ValidationException,
+)
 
+from src.api.metrics.metrics import (
+    FGA_CHECKS_COALESCED_TOTAL,
+    FGA_CIRCUIT_OPEN,
+    FGA_ERRORS_TOTAL,
+    FGA_REQUEST_SECONDS,
+    observe,
+)
 from src.api.v1.auth.auth import get_current_user_from_cookie
+from src.api.v1.auth.fga_mirror import local_check, record_writes
 from src.api.v1.user.models import User  # noqa #TC001
 
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable, Iterator
+
+# OpenFGA rejects write requests with more than 100 tuples
+FGA_WRITE_CHUNK_SIZE = 100
+
+FGA_MAX_CONNECTIONS = int(os.getenv('FGA_MAX_CONNECTIONS', '100'))
+FGA_KEEPALIVE_SECONDS = float(os.getenv('FGA_KEEPALIVE_SECONDS', '30'))
+FGA_TIMEOUT_SECONDS = float(os.getenv('FGA_TIMEOUT_SECONDS', '5'))
+FGA_MAX_RETRIES = int(os.getenv('FGA_MAX_RETRIES', '3'))
+FGA_RETRY_MIN_WAIT_MS = int(os.getenv('FGA_RETRY_MIN_WAIT_MS', '50'))
+FGA_RETRY_MAX_WAIT_SECONDS = int(os.getenv('FGA_RETRY_MAX_WAIT_SECONDS', '2'))
+FGA_BATCH_CHECK_SIZE = int(os.getenv('FGA_BATCH_CHECK_SIZE', '50'))
+FGA_MAX_PARALLEL_REQUESTS = int(os.getenv('FGA_MAX_PARALLEL_REQUESTS', '10'))
+FGA_BREAKER_THRESHOLD = int(os.getenv('FGA_BREAKER_THRESHOLD', '5'))
+FGA_BREAKER_RESET_SECONDS = float(os.getenv('FGA_BREAKER_RESET_SECONDS', '30'))
+FGA_CHECK_BATCH_WINDOW_SECONDS = float(os.getenv('FGA_CHECK_BATCH_WINDOW_MS', '2')) / 1000
+
+# Failures that say OpenFGA is unreachable or unhealthy. Not every aiohttp error is an OSError
+# (e.g. ServerDisconnectedError), so ClientError is listed too.
+_TRANSIENT_ERRORS = (ServiceException, RateLimitExceededError, TimeoutError, OSError, aiohttp.ClientError)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker: closed → open → half-open (one trial call) → closed."""
+
+    def __init__(self, threshold: int, reset_after: float) -> None:
+        """Start closed; open after ``threshold`` consecutive failures for ``reset_after`` seconds."""
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Return ``closed``, ``open`` or ``half_open``."""
+        if self._opened_at is None:
+            return 'closed'
+        return 'open' if self.retry_after() > 0 else 'half_open'
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a trial call through."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_after - time.monotonic())
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed; in half-open state only one caller gets through."""
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'open' or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker and reset the failure count."""
+        self.failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        FGA_CIRCUIT_OPEN.set(0)
+
+    def record_failure(self) -> None:
+        """Count a failure; open (or re-open after a failed trial) once the threshold is reached."""
+        self.failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self.failures >= self.threshold:
+            if self._opened_at is None:
+                logger.warning("OpenFGA circuit opened after %d consecutive failures", self.failures)
+            self._opened_at = time.monotonic()
+            FGA_CIRCUIT_OPEN.set(1)
+
+    def release(self) -> None:
+        """Give up a half-open trial slot without deciding (the call was cancelled)."""
+        self._trial_in_flight = False
+
+
+breaker = CircuitBreaker(FGA_BREAKER_THRESHOLD, FGA_BREAKER_RESET_SECONDS)
+
+
+@contextmanager
+def _fga_call(operation: str) -> Iterator[None]:
+    """Time one OpenFGA call and feed its outcome to the breaker; raise 503 while the breaker is open."""
+    if not breaker.allow():
+        FGA_ERRORS_TOTAL.labels(operation).inc()
+        raise HTTPException(
+            status_code=http.HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Authorization service unavailable.",
+            headers={"Retry-After": str(max(1, round(breaker.retry_after())))},
+        )
+    try:
+        with observe(FGA_REQUEST_SECONDS, operation, FGA_ERRORS_TOTAL):
+            yield
+    except _TRANSIENT_ERRORS:
+        breaker.record_failure()
+        raise
+    except Exception:
+        # OpenFGA answered (e.g. a validation error), so it is healthy
+        breaker.record_success()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+
 
 _fga_client: OpenFgaClient | None = None
 
 
+def _ssl_context(config: ClientConfiguration) -> ssl.SSLContext:
+    """Build the TLS context the SDK's own REST client would (openfga_sdk/rest.py): CA, client cert, verify_ssl."""
+    context = ssl.create_default_context(cafile=config.ssl_ca_cert)
+    if config.cert_file:
+        context.load_cert_chain(config.cert_file, keyfile=config.key_file)
+    if not config.verify_ssl:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def _use_keepalive_session(client: OpenFgaClient, config: ClientConfiguration) -> aiohttp.ClientSession:
+    """Swap the SDK's HTTP session for one with our keep-alive; return the original so it can be closed.
+
+    The SDK only exposes the pool size, so the replacement keeps its limit and TLS setup
+    (see ``_ssl_context``) and adds ``keepalive_timeout``. The attribute path is private,
+    hence the exact ``openfga-sdk`` pin in pyproject.toml.
+    """
+    rest_client = client._api_client.rest_client
+    original = rest_client.pool_manager
+    connector = aiohttp.TCPConnector(
+        limit=config.connection_pool_maxsize,
+        keepalive_timeout=FGA_KEEPALIVE_SECONDS,
+        ssl=_ssl_context(config),
+    )
+    rest_client.pool_manager = aiohttp.ClientSession(connector=connector, trust_env=True)
+    return original
+
+
 async def get_fga_client() -> OpenFgaClient:
     """Return a reusable OpenFGA client (singleton)."""
     global _fga_client
@@ -50,11 +221,27 @@ async def get_fga_client() -> OpenFgaClient:
             store_id=store_id,
             authorization_model_id=model_id,
             credentials=credentials,
+            timeout_millisec=int(FGA_TIMEOUT_SECONDS * 1000),
+            retry_params=RetryParams(
+                max_retry=FGA_MAX_RETRIES,
+                min_wait_in_ms=FGA_RETRY_MIN_WAIT_MS,
+                max_wait_in_sec=FGA_RETRY_MAX_WAIT_SECONDS,
+            ),
         )
-        _fga_client = OpenFgaClient(config)
+        config.connection_pool_maxsize = FGA_MAX_CONNECTIONS
+        client = OpenFgaClient(config)
+        await _use_keepalive_session(client, config).close()
+        _fga_client = client
     return _fga_client
 
 
+async def ping_fga() -> None:
+    """Read the configured authorization model, proving OpenFGA and the store are reachable."""
+    client = await get_fga_client()
+    with _fga_call('read_model'):
+        await client.read_authorization_model()
+
+
 async def close_fga_client() -> None:
     """Close the FGA client on app shutdown."""
     global _fga_client
@@ -63,17 +250,128 @@ async def close_fga_client() -> None:
         _fga_client = None
 
 
-async def check_permission(user_id: str, relation: str, object_type: str, object_id: str) -> bool:
-    """Return True if user has the given relation to the object."""
+# (user_id, relation, object_type, object_id)
+CheckKey = tuple[str, str, str, str]
+
+
+async def _check_one(key: CheckKey) -> bool:
+    user_id, relation, object_type, object_id = key
     client = await get_fga_client()
-    response = await client.check(
-        ClientCheckRequest(
+    with _fga_call('check'):
+        response = await client.check(
+            ClientCheckRequest(
+                user=f"user:{user_id}",
+                relation=relation,
+                object=f"{object_type}:{object_id}",
+            ),
+        )
+    return response.allowed
+
+
+async def _check_remote(keys: list[CheckKey]) -> dict[CheckKey, bool | Exception]:
+    """Ask OpenFGA about each key; return each key's own decision or the exception its check raised.
+
+    One key is a plain check; several go out as one batch_check. Items the batch answered with an error,
+    or did not answer at all, are re-checked individually and concurrently, so a failure only reaches the
+    callers of that key. Only a failure of the batch request itself is shared by every key (it is raised).
+    """
+    if len(keys) == 1:
+        try:
+            return {keys[0]: await _check_one(keys[0])}
+        except Exception as e:
+            return {keys[0]: e}
+    client = await get_fga_client()
+    checks = [
+        ClientBatchCheckItem(
             user=f"user:{user_id}",
             relation=relation,
             object=f"{object_type}:{object_id}",
-        ),
-    )
-    return response.allowed
+            correlation_id=str(i),
+        )
+        for i, (user_id, relation, object_type, object_id) in enumerate(keys)
+    ]
+    options = {'max_batch_size': FGA_BATCH_CHECK_SIZE, 'max_parallel_requests': FGA_MAX_PARALLEL_REQUESTS}
+    with _fga_call('batch_check'):
+        response = await client.batch_check(ClientBatchCheckRequest(checks=checks), options)
+    results: dict[CheckKey, bool | Exception] = {
+        keys[int(item.correlation_id)]: item.allowed for item in response.result if not item.error
+    }
+    retry = [key for key in keys if key not in results]
+    outcomes = await asyncio.gather(*(_check_one(key) for key in retry), return_exceptions=True)
+    results.update(zip(retry, outcomes))
+    return results
+
+
+class CheckCoalescer:
+    """Single-flight deduplication and micro-batching of permission checks within one worker."""
+
+    def __init__(self, window: float, max_batch: int) -> None:
+        """Collect checks for ``window`` seconds (or until ``max_batch`` are queued) before sending them."""
+        self.window = window
+        self.max_batch = max_batch
+        self._inflight: dict[CheckKey, asyncio.Future[bool]] = {}
+        self._queued: list[CheckKey] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def check(self, key: CheckKey) -> bool:
+        """Return the decision for ``key``, joining an identical check that is already queued or in flight."""
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._inflight[key] = loop.create_future()
+            self._queued.append(key)
+            if len(self._queued) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+        else:
+            FGA_CHECKS_COALESCED_TOTAL.inc()
+        # shield: one caller being cancelled must not cancel the answer the others are waiting for
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        keys, self._queued = self._queued, []
+        if keys:
+            task = asyncio.get_running_loop().create_task(self._send(keys))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, keys: list[CheckKey]) -> None:
+        error: BaseException | None = None
+        try:
+            results = await _check_remote(keys)
+            for key in keys:
+                future = self._inflight[key]
+                outcome = results.get(key)
+                if isinstance(outcome, BaseException):
+                    future.set_exception(outcome)
+                elif outcome is not None:
+                    future.set_result(outcome)
+        except BaseException as e:
+            error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            # Never leave a waiter hanging: anything still unresolved gets the batch's error
+            for key in keys:
+                future = self._inflight.pop(key)
+                if not future.done():
+                    future.set_exception(error or RuntimeError(f"OpenFGA returned no answer for {key}"))
+
+
+coalescer = CheckCoalescer(FGA_CHECK_BATCH_WINDOW_SECONDS, FGA_BATCH_CHECK_SIZE)
+
+
+async def check_permission(user_id: str, relation: str, object_type: str, object_id: str) -> bool:
+    """Return True if user has the given relation to the object."""
+    local = local_check(user_id, relation, object_type, object_id)
+    if local is not None:
+        return local
+    return await coalescer.check((user_id, relation, object_type, object_id))
 
 
 async def write_tuple(
@@ -85,17 +383,48 @@ async def write_tuple(
 ) -> None:
     """Write a relationship tuple (e.g. user:X creator case:Y)."""
     client = await get_fga_client()
-    await client.write(
-        ClientWriteRequest(
-            writes=[
-                ClientTuple(
-                    user=f"{subject_type}:{subject_id}",
-                    relation=relation,
-                    object=f"{object_type}:{object_id}",
-                ),
-            ],
-        ),
-    )
+    with _fga_call('write'):
+        await client.write(
+            ClientWriteRequest(
+                writes=[
+                    ClientTuple(
+                        user=f"{subject_type}:{subject_id}",
+                        relation=relation,
+                        object=f"{object_type}:{object_id}",
+                    ),
+                ],
+            ),
+        )
+    record_writes([(f"{subject_type}:{subject_id}", relation, f"{object_type}:{object_id}")], write=True)
+
+
+def _client_tuples(tuples: Iterable[tuple[str, str, str, str, str]]) -> list[ClientTuple]:
+    return [
+        ClientTuple(user=f"{subject_type}:{subject_id}", relation=relation, object=f"{object_type}:{object_id}")
+        for subject_id, relation, object_type, object_id, subject_type in tuples
+    ]
+
+
+async def write_tuples(tuples: Iterable[tuple[str, str, str, str, str]]) -> None:
+    """Write many ``(subject_id, relation, object_type, object_id, subject_type)`` tuples in chunked requests."""
+    client = await get_fga_client()
+    pending = _client_tuples(tuples)
+    for start in range(0, len(pending), FGA_WRITE_CHUNK_SIZE):
+        chunk = pending[start:start + FGA_WRITE_CHUNK_SIZE]
+        with _fga_call('write'):
+            await client.write(ClientWriteRequest(writes=chunk))
+        record_writes([(t.user, t.relation, t.object) for t in chunk], write=True)
+
+
+async def delete_tuples(tuples: Iterable[tuple[str, str, str, str, str]]) -> None:
+    """Delete many tuples (same shape as ``write_tuples``) in chunked requests."""
+    client = await get_fga_client()
+    pending = _client_tuples(tuples)
+    for start in range(0, len(pending), FGA_WRITE_CHUNK_SIZE):
+        chunk = pending[start:start + FGA_WRITE_CHUNK_SIZE]
+        with _fga_call('delete'):
+            await client.write(ClientWriteRequest(deletes=chunk))
+        record_writes([(t.user, t.relation, t.object) for t in chunk], write=False)
 
 
 async def delete_tuple(
@@ -107,17 +436,19 @@ async def delete_tuple(
 ) -> None:
     """Delete a relationship tuple."""
     client = await get_fga_client()
-    await client.write(
-        ClientWriteRequest(
-            deletes=[
-                ClientTuple(
-                    user=f"{subject_type}:{subject_id}",
-                    relation=relation,
-                    object=f"{object_type}:{object_id}",
-                ),
-            ],
-        ),
-    )
+    with _fga_call('delete'):
+        await client.write(
+            ClientWriteRequest(
+                deletes=[
+                    ClientTuple(
+                        user=f"{subject_type}:{subject_id}",
+                        relation=relation,
+                        object=f"{object_type}:{object_id}",
+                    ),
+                ],
+            ),
+        )
+    record_writes([(f"{subject_type}:{subject_id}", relation, f"{object_type}:{object_id}")], write=False)
 
 
 async def write_tuple_safe(
@@ -146,18 +477,29 @@ async def filter_by_permission(cases: list, user_id: str, relation: str = "viewe
     """Filter a list of Case objects to those the user has the given relation to."""
     if not cases:
         return []
-    client = await get_fga_client()
-    checks = [
-        ClientBatchCheckItem(
-            user=f"user:{user_id}",
-            relation=relation,
-            object=f"case:{case.id}",
-            correlation_id=case.id,
-        )
-        for case in cases
-    ]
-    response = await client.batch_check(ClientBatchCheckRequest(checks=checks))
-    allowed_ids = {r.correlation_id for r in response.result if r.allowed}
+    allowed_ids: set[str] = set()
+    remote: list = []
+    for case in cases:
+        local = local_check(user_id, relation, "case", case.id)
+        if local is None:
+            remote.append(case)
+        elif local:
+            allowed_ids.add(case.id)
+    if remote:
+        client = await get_fga_client()
+        checks = [
+            ClientBatchCheckItem(
+                user=f"user:{user_id}",
+                relation=relation,
+                object=f"case:{case.id}",
+                correlation_id=case.id,
+            )
+            for case in remote
+        ]
+        options = {'max_batch_size': FGA_BATCH_CHECK_SIZE, 'max_parallel_requests': FGA_MAX_PARALLEL_REQUESTS}
+        with _fga_call('batch_check'):
+            response = await client.batch_check(ClientBatchCheckRequest(checks=checks), options)
+        allowed_ids.update(r.correlation_id for r in response.result if r.allowed)
     return [c for c in cases if c.id in allowed_ids]
 
 
@@ -0,0 +1,207 @@
+"""Optional in-process mirror of OpenFGA tuples for local permission checks.
+
+With ``FGA_LOCAL_EVALUATION=1`` each worker keeps the ``company`` and ``case``
+tuples in memory and evaluates ``CASE_AUTH_MODEL`` (``this``,
+``computedUserset``, ``tupleToUserset`` and ``union`` rewrites) itself, so
+``check_permission`` and ``filter_by_permission`` answer without a round trip.
+
+The mirror is fed incrementally from OpenFGA's read-changes API by a
+background task started in the app lifespan, and this worker's own writes are
+applied immediately so it reads its own grants. It answers only while it has
+caught up with the change feed within ``FGA_MIRROR_MAX_LAG_SECONDS`` and only
+for objects it has seen tuples for; anything else is a miss and goes to the
+server. ``kanapi_fga_mirror_lag_seconds`` reports how far behind it is.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+from openfga_sdk.client.models import ClientReadChangesRequest
+from openfga_sdk.models import TupleOperation
+
+from src.api.db.seed_fga import CASE_AUTH_MODEL
+from src.api.metrics.metrics import FGA_LOCAL_CHECKS_TOTAL, FGA_MIRROR_LAG_SECONDS
+
+if TYPE_CHECKING:
+    from openfga_sdk.client import OpenFgaClient
+
+logger = logging.getLogger(__name__)
+
+FGA_LOCAL_EVALUATION = os.getenv('FGA_LOCAL_EVALUATION', '0') == '1'
+FGA_MIRROR_POLL_SECONDS = float(os.getenv('FGA_MIRROR_POLL_SECONDS', '1'))
+FGA_MIRROR_MAX_LAG_SECONDS = float(os.getenv('FGA_MIRROR_MAX_LAG_SECONDS', '5'))
+_PAGE_SIZE = 100
+
+
+class UnsupportedRewriteError(Exception):
+    """The model uses a rewrite the local evaluator does not implement."""
+
+
+class TupleMirror:
+    """In-memory tuple index plus an evaluator for the rewrites used by an authorization model."""
+
+    def __init__(self, model: dict[str, Any], *, max_lag: float = FGA_MIRROR_MAX_LAG_SECONDS) -> None:
+        """Index the model's relation rewrites; the mirror is empty and stale until the first sync."""
+        self.max_lag = max_lag
+        self._rewrites = {t['type']: t.get('relations', {}) for t in model['type_definitions']}
+        # (object_type, object_id, relation) → subjects such as 'user:bob', 'company:c1' or 'company:c1#member'
+        self._tuples: dict[tuple[str, str, str], set[str]] = {}
+        # (object_type, object_id) → relations with at least one tuple; an object absent here is a miss
+        self._objects: dict[tuple[str, str], set[str]] = {}
+        self._tokens: dict[str, str] = {}
+        self._caught_up_at: float | None = None
+
+    # ─── Maintenance ──────────────────────────────────────────────────────
+
+    def apply(self, user: str, relation: str, obj: str, *, write: bool) -> None:
+        """Apply one tuple write or delete (``obj`` is ``type:id``)."""
+        object_type, _, object_id = obj.partition(':')
+        key = (object_type, object_id, relation)
+        if write:
+            self._tuples.setdefault(key, set()).add(user)
+            self._objects.setdefault((object_type, object_id), set()).add(relation)
+            return
+        subjects = self._tuples.get(key)
+        if subjects is None:
+            return
+        subjects.discard(user)
+        if not subjects:
+            del self._tuples[key]
+            relations = self._objects[(object_type, object_id)]
+            relations.discard(relation)
+            if not relations:
+                del self._objects[(object_type, object_id)]
+
+    async def sync(self, client: OpenFgaClient) -> int:
+        """Read every change since the last sync for each mirrored type; return how many were applied."""
+        applied = 0
+        for object_type in self._rewrites:
+            if not self._rewrites[object_type]:
+                continue  # types without relations (user) never appear as objects
+            while True:
+                options: dict[str, int | str] = {'page_size': _PAGE_SIZE}
+                if object_type in self._tokens:
+                    options['continuation_token'] = self._tokens[object_type]
+                response = await client.read_changes(ClientReadChangesRequest(type=object_type), options)
+                for change in response.changes or []:
+                    key = change.tuple_key
+                    self.apply(key.user, key.relation, key.object, write=change.operation == TupleOperation.WRITE)
+                applied += len(response.changes or [])
+                if response.continuation_token:
+                    self._tokens[object_type] = response.continuation_token
+                if len(response.changes or []) < _PAGE_SIZE:
+                    break
+        self._caught_up_at = time.monotonic()
+        FGA_MIRROR_LAG_SECONDS.set(0)
+        return applied
+
+    def lag(self) -> float:
+        """Seconds since the mirror last caught up with the change feed (infinite before the first sync)."""
+        if self._caught_up_at is None:
+            return float('inf')
+        return time.monotonic() - self._caught_up_at
+
+    # ─── Evaluation ───────────────────────────────────────────────────────
+
+    def check(self, user_id: str, relation: str, object_type: str, object_id: str) -> bool | None:
+        """Return the local decision, or None on a miss (mirror too stale, object unknown or unsupported rewrite)."""
+        lag = self.lag()
+        FGA_MIRROR_LAG_SECONDS.set(min(lag, 1e9))
+        if lag > self.max_lag or (object_type, object_id) not in self._objects:
+            FGA_LOCAL_CHECKS_TOTAL.labels('miss').inc()
+            return None
+        try:
+            allowed = self._allowed(f'user:{user_id}', relation, object_type, object_id)
+        except UnsupportedRewriteError:
+            FGA_LOCAL_CHECKS_TOTAL.labels('miss').inc()
+            return None
+        FGA_LOCAL_CHECKS_TOTAL.labels('hit').inc()
+        return allowed
+
+    def _allowed(self, user: str, relation: str, object_type: str, object_id: str, depth: int = 0) -> bool:
+        if depth > 16:
+            raise UnsupportedRewriteError('rewrite chain too deep')
+        rewrite = self._rewrites.get(object_type, {}).get(relation)
+        if rewrite is None:
+            return False
+        return self._evaluate(rewrite, user, relation, object_type, object_id, depth)
+
+    def _evaluate(self, rewrite: dict, user: str, relation: str, object_type: str, object_id: str, depth: int) -> bool:
+        if 'this' in rewrite:
+            subjects = self._tuples.get((object_type, object_id, relation), ())
+            if user in subjects:
+                return True
+            for subject in subjects:
+                userset, _, via = subject.partition('#')
+                if via and self._allowed(user, via, *userset.split(':', 1), depth + 1):
+                    return True
+            return False
+        if 'computedUserset' in rewrite:
+            return self._allowed(user, rewrite['computedUserset']['relation'], object_type, object_id, depth + 1)
+        if 'tupleToUserset' in rewrite:
+            tupleset = rewrite['tupleToUserset']['tupleset']['relation']
+            computed = rewrite['tupleToUserset']['computedUserset']['relation']
+            return any(
+                self._allowed(user, computed, *parent.split(':', 1), depth + 1)
+                for parent in self._tuples.get((object_type, object_id, tupleset), ())
+            )
+        if 'union' in rewrite:
+            return any(
+                self._evaluate(child, user, relation, object_type, object_id, depth)
+                for child in rewrite['union']['child']
+            )
+        raise UnsupportedRewriteError(next(iter(rewrite), 'empty'))
+
+
+mirror = TupleMirror(CASE_AUTH_MODEL)
+
+
+def local_check(user_id: str, relation: str, object_type: str, object_id: str) -> bool | None:
+    """Answer from the mirror when local evaluation is enabled; None means ask the server."""
+    if not FGA_LOCAL_EVALUATION:
+        return None
+    return mirror.check(user_id, relation, object_type, object_id)
+
+
+def record_writes(tuples: list[tuple[str, str, str]], *, write: bool) -> None:
+    """Apply this worker's own ``(user, relation, object)`` writes or deletes before the feed delivers them."""
+    if FGA_LOCAL_EVALUATION:
+        for user, relation, obj in tuples:
+            mirror.apply(user, relation, obj, write=write)
+
+
+_task: asyncio.Task | None = None
+
+
+async def _follow_changes() -> None:
+    from src.api.v1.auth.fga import get_fga_client  # local import: fga imports this module
+
+    while True:
+        try:
+            await mirror.sync(await get_fga_client())
+        except Exception:
+            logger.exception('FGA mirror sync failed; checks fall back to the server until it recovers')
+        await asyncio.sleep(FGA_MIRROR_POLL_SECONDS)
+
+
+def start_mirror() -> None:
+    """Start following the change feed in the background (no-op unless FGA_LOCAL_EVALUATION=1)."""
+    global _task
+    if FGA_LOCAL_EVALUATION and _task is None:
+        _task = asyncio.get_running_loop().create_task(_follow_changes())
+
+
+async def stop_mirror() -> None:
+    """Cancel the background sync task."""
+    global _task
+    if _task is not None:
+        _task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _task
+        _task = None
@@ -0,0 +1,52 @@
+"""Small per-worker TTL cache for derived read models.
+
+Entries expire after ``ttl`` seconds and the whole cache can be cleared when
+the underlying data changes. A value computed while a ``clear()`` happened is
+returned to its caller but not stored, so an invalidation racing a slow
+recompute cannot leave a stale entry behind.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+T = TypeVar('T')
+
+
+class TTLCache(Generic[T]):
+    """Thread-safe mapping of key → value with expiry and wholesale invalidation."""
+
+    def __init__(self, ttl: float) -> None:
+        """Create an empty cache; ``ttl <= 0`` disables it."""
+        self.ttl = ttl
+        self._entries: dict[Hashable, tuple[float, T]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        if self.ttl <= 0:
+            return compute()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+        if entry and entry[0] > now:
+            return entry[1]
+        value = compute()
+        with self._lock:
+            # The data changed while we were computing; the result may already be stale.
+            if generation == self._generation:
+                self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def clear(self, _payload: object = None) -> None:
+        """Drop every entry; the argument lets it be registered directly as an event listener."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
@@ -0,0 +1,382 @@
+"""Bulk case operations: import from CSV or NDJSON uploads, and batched updates.
+
+Import rows are validated with the same rules as ``POST /case/create`` and ingested in
+batches: one multi-row INSERT for the cases and their ``case_created`` entries
+per batch, followed by chunked OpenFGA writes. Progress and per-row errors are
+streamed back as NDJSON while the import runs.
+
+Bulk updates check ``editor`` access for every target in one FGA batch check,
+apply the change with one UPDATE per distinct assignee (normally exactly one),
+and write all activity entries and assignee tuple changes in batches.
+"""
+
+from __future__ import annotations
+
+import csv
+import http
+import io
+import json
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import or_
+from sqlalchemy.exc import SQLAlchemyError
+from uuid_extensions import uuid7
+
+from src.api.v1.auth.fga import (
+    FGA_WRITE_CHUNK_SIZE,
+    delete_tuples,
+    filter_by_permission,
+    write_tuple_safe,
+    write_tuples,
+)
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.user.models import User, UserDB
+
+from .events import publish_case_events
+from .models import (
+    CaseBulkResult,
+    CaseBulkUpdate,
+    CaseCreate,
+    CaseDB,
+    _apply_case_filters,
+    _visible_cases_query,
+    activity_entries_for_update,
+    case_create_error,
+    case_from_row,
+    db_create_cases_bulk,
+    db_log_activities,
+    db_track_team_cases,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+    from sqlalchemy.engine import Row
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 500
+BULK_UPDATE_LIMIT = 1000
+IMPORT_FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+# (line number, parsed row or None, parse error or None)
+ImportRow = tuple[int, dict[str, Any] | None, str | None]
+
+
+def import_format(filename: str | None, content_type: str | None) -> str | None:
+    """Return 'csv' or 'ndjson' for a supported upload, otherwise None."""
+    fmt = IMPORT_FORMATS.get(Path(filename or '').suffix.lower())
+    if fmt is None and content_type in ('text/csv', 'application/x-ndjson'):
+        fmt = 'csv' if content_type == 'text/csv' else 'ndjson'
+    return fmt
+
+
+def iter_import_rows(stream: BinaryIO, fmt: str) -> Iterator[ImportRow]:
+    """Lazily parse an upload into rows without reading it all into memory.
+
+    Undecodable bytes or broken CSV quoting end the file with one error row: the
+    response is already streaming, so the import reports it and finishes normally.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    line_no = 0
+    try:
+        for line_no, row, error in (_csv_rows(text) if fmt == 'csv' else _ndjson_rows(text)):
+            yield line_no, row, error
+    except UnicodeDecodeError:
+        yield line_no + 1, None, 'File is not valid UTF-8; the rest of the file was skipped.'
+    except csv.Error as e:
+        yield line_no + 1, None, f'Invalid CSV ({e}); the rest of the file was skipped.'
+
+
+def _csv_rows(text: io.TextIOWrapper) -> Iterator[ImportRow]:
+    # Line 1 is the header
+    for line_no, row in enumerate(csv.DictReader(text), start=2):
+        yield line_no, {k: (v or None) for k, v in row.items() if k}, None
+
+
+def _ndjson_rows(text: io.TextIOWrapper) -> Iterator[ImportRow]:
+    for line_no, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_no, None, 'Invalid JSON.'
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, 'Each line must be a JSON object.'
+            continue
+        yield line_no, row, None
+
+
+def validate_import_row(row: dict[str, Any]) -> CaseCreate:
+    """Apply the CaseCreate rules to one row; raise ValueError with a readable message."""
+    try:
+        case = CaseCreate.model_validate(row)
+    except ValidationError as e:
+        first = e.errors()[0]
+        field = '.'.join(str(part) for part in first['loc']) or 'row'
+        raise ValueError(f'{field}: {first["msg"]}') from e
+    error = case_create_error(case)
+    if error:
+        raise ValueError(error)
+    return case
+
+
+def _report(**fields: object) -> str:
+    return json.dumps(fields) + '\n'
+
+
+class _CaseImport:
+    """State for one import run: the caller, the running totals and the companies already linked."""
+
+    def __init__(self, db: Session, current_user: User) -> None:
+        self.db = db
+        self.user = current_user
+        self.imported = 0
+        self.failed = 0
+        self._linked_companies: set[str] = set()
+        parent = None
+        if current_user.parent_id:
+            parent = db.query(UserDB).filter(UserDB.username == current_user.parent_id).first()
+        self._parent_admin = parent.username if parent and parent.is_admin else None
+
+    def _reference_errors(self, batch: list[tuple[int, CaseCreate]]) -> dict[int, str]:
+        """Return per-line errors for unknown companies or responsible users, with one query each."""
+        company_ids = {case.company_id for _, case in batch}
+        user_ids = {case.responsible_user_id for _, case in batch if case.responsible_user_id}
+        known_companies = {cid for (cid,) in self.db.query(CompanyDB.id).filter(CompanyDB.id.in_(company_ids))}
+        known_users = (
+            {uid for (uid,) in self.db.query(UserDB.username).filter(UserDB.username.in_(user_ids))}
+            if user_ids else set()
+        )
+        errors = {}
+        for line_no, case in batch:
+            if case.company_id not in known_companies:
+                errors[line_no] = f'Company "{case.company_id}" does not exist.'
+            elif case.responsible_user_id and case.responsible_user_id not in known_users:
+                errors[line_no] = f'User "{case.responsible_user_id}" does not exist.'
+        return errors
+
+    async def _link_companies(self, company_ids: set[str]) -> None:
+        """Mirror create_case: make the importer a member (and their admin an admin) of each company once."""
+        for company_id in company_ids - self._linked_companies:
+            await write_tuple_safe(self.user.username, 'member', 'company', company_id)
+            if self._parent_admin:
+                await write_tuple_safe(self._parent_admin, 'admin', 'company', company_id)
+            self._linked_companies.add(company_id)
+
+    async def _remove_tuples(self, tuples: list[tuple[str, str, str, str, str]]) -> None:
+        """Delete the chunks already written for a failed batch so no tuple outlives its case."""
+        if not tuples:
+            return
+        try:
+            await delete_tuples(tuples)
+        except Exception:
+            logger.exception('Could not remove %d FGA tuples of a failed import batch', len(tuples))
+
+    async def flush(self, batch: list[tuple[int, CaseCreate]]) -> list[str]:
+        """Ingest one batch and return its report lines."""
+        lines = []
+        errors = self._reference_errors(batch)
+        for line_no, error in errors.items():
+            lines.append(_report(row=line_no, error=error))
+        valid = [(line_no, str(uuid7()), case) for line_no, case in batch if line_no not in errors]
+        self.failed += len(errors)
+        if not valid:
+            return lines
+
+        try:
+            db_create_cases_bulk(self.db, [(case_id, case) for _, case_id, case in valid], self.user.username)
+        except HTTPException:
+            self.failed += len(valid)
+            lines.append(_report(rows=[valid[0][0], valid[-1][0]], error='Database error.'))
+            return lines
+        tuples = []
+        for _, case_id, case in valid:
+            tuples.append((self.user.username, 'creator', 'case', case_id, 'user'))
+            tuples.append((case.company_id, 'company', 'case', case_id, 'company'))
+            if case.responsible_user_id:
+                tuples.append((case.responsible_user_id, 'assignee', 'case', case_id, 'user'))
+        written = 0
+        try:
+            for written in range(0, len(tuples), FGA_WRITE_CHUNK_SIZE):
+                await write_tuples(tuples[written:written + FGA_WRITE_CHUNK_SIZE])
+            written = len(tuples)
+            await self._link_companies({case.company_id for _, _, case in valid})
+        except Exception:
+            # Without their tuples nobody could open these cases, so take the batch back out.
+            logger.exception('FGA write failed during case import; removing %d cases', len(valid))
+            await self._remove_tuples(tuples[:written])
+            self.db.query(CaseDB).filter(CaseDB.id.in_([case_id for _, case_id, _ in valid])).delete(
+                synchronize_session=False,
+            )
+            db_track_team_cases(self.db, [(self.user.username, case.company_id) for _, _, case in valid], -1)
+            publish_case_events(self.db, ((case_id, 'deleted', {'id': case_id}) for _, case_id, _ in valid))
+            self.db.commit()
+            self.failed += len(valid)
+            lines.append(_report(rows=[valid[0][0], valid[-1][0]], error='Authorization service unavailable.'))
+            return lines
+        self.imported += len(valid)
+        return lines
+
+
+async def import_cases_stream(db: Session, rows: Iterator[ImportRow], current_user: User) -> AsyncIterator[str]:
+    """Validate and ingest rows batch by batch, yielding NDJSON error and progress lines."""
+    run = _CaseImport(db, current_user)
+    batch: list[tuple[int, CaseCreate]] = []
+    for line_no, row, parse_error in rows:
+        try:
+            if parse_error:
+                raise ValueError(parse_error)
+            batch.append((line_no, validate_import_row(row)))
+        except ValueError as e:
+            run.failed += 1
+            yield _report(row=line_no, error=str(e))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            for line in await run.flush(batch):
+                yield line
+            batch = []
+            yield _report(imported=run.imported, failed=run.failed)
+    if batch:
+        for line in await run.flush(batch):
+            yield line
+    yield _report(done=True, imported=run.imported, failed=run.failed)
+
+
+# ─── Bulk update ──────────────────────────────────────────────────────────────
+
+_BULK_COLUMNS = (
+    CaseDB.id,
+    CaseDB.user_id,
+    CaseDB.company_id,
+    CaseDB.customer,
+    CaseDB.status,
+    CaseDB.responsible_person,
+    CaseDB.responsible_user_id,
+)
+
+
+def _target_rows(db: Session, body: CaseBulkUpdate, user_id: str) -> tuple[list[Row], list[str]]:
+    """Return the targeted case rows and any requested IDs that do not exist."""
+    if body.case_ids is not None:
+        ids = list(dict.fromkeys(body.case_ids))
+        rows = db.query(*_BULK_COLUMNS).filter(CaseDB.id.in_(ids)).all()
+        found = {r.id for r in rows}
+        return rows, [i for i in ids if i not in found]
+    f = body.filters
+    query = _apply_case_filters(_visible_cases_query(db, user_id), q=f.q, status=f.status, archived=f.archived)
+    rows = query.with_entities(*_BULK_COLUMNS).limit(BULK_UPDATE_LIMIT + 1).all()
+    if len(rows) > BULK_UPDATE_LIMIT:
+        raise HTTPException(
+            status_code=http.HTTPStatus.BAD_REQUEST,
+            detail=f'Filter matches more than {BULK_UPDATE_LIMIT} cases; narrow it down.',
+        )
+    return rows, []
+
+
+def _resolve_responsible(db: Session, rows: list[Row], name: str) -> dict[str, str]:
+    """Map case ID to the username called ``name`` in the case creator's team (as _validate_update_fields does)."""
+    creators = db.query(UserDB.username, UserDB.is_admin, UserDB.parent_id).filter(
+        UserDB.username.in_({r.user_id for r in rows}),
+    )
+    team_of = {u.username: (u.username if u.is_admin else u.parent_id) for u in creators}
+    teams = {t for t in team_of.values() if t}
+    if not teams:
+        return {}
+    matches = db.query(UserDB.username, UserDB.parent_id).filter(
+        or_(UserDB.parent_id.in_(teams), UserDB.username.in_(teams)),
+        or_(UserDB.full_name == name, UserDB.username == name),
+    )
+    member_of: dict[str, str] = {}
+    for m in matches:
+        for team in {m.username, m.parent_id} & teams:
+            member_of.setdefault(team, m.username)
+    return {r.id: member_of[team_of[r.user_id]] for r in rows if team_of.get(r.user_id) in member_of}
+
+
+def _invalid_rows(db: Session, rows: list[Row], changes: dict) -> tuple[dict[str, str], dict[str, str]]:
+    """Validate the change for every row at once; return (invalid reasons, new assignee per case)."""
+    invalid: dict[str, str] = {}
+    if 'customer' in changes:
+        customer = changes['customer']
+        known = {
+            cid for (cid,) in db.query(CaseDB.company_id).filter(
+                CaseDB.company_id.in_({r.company_id for r in rows}), CaseDB.customer == customer,
+            ).distinct()
+        }
+        for r in rows:
+            if r.customer != customer and r.company_id not in known:
+                invalid[r.id] = f'Customer "{customer}" does not exist for this company.'
+    assignees: dict[str, str] = {}
+    if 'responsible_person' in changes:
+        assignees = _resolve_responsible(db, rows, changes['responsible_person'])
+        for r in rows:
+            if r.id not in assignees:
+                invalid.setdefault(r.id, f'User "{changes["responsible_person"]}" not found in this company.')
+    return invalid, assignees
+
+
+def _apply_bulk_update(
+    db: Session,
+    rows: list[Row],
+    changes: dict,
+    assignees: dict[str, str],
+    user_id: str,
+) -> None:
+    """Update the rows, log their activity and publish case events in one transaction."""
+    groups: dict[str | None, list[str]] = {}
+    for r in rows:
+        groups.setdefault(assignees.get(r.id), []).append(r.id)
+    try:
+        for assignee, ids in groups.items():
+            values = {**changes, 'version': CaseDB.version + 1}
+            if assignee:
+                values['responsible_user_id'] = assignee
+            db.query(CaseDB).filter(CaseDB.id.in_(ids)).update(values, synchronize_session=False)
+        db_log_activities(
+            db, [entry for r in rows for entry in activity_entries_for_update(r.id, user_id, r, changes)], commit=False,
+        )
+        publish_case_events(db, (
+            (row.id, 'case', case_from_row(row).model_dump(mode='json'))
+            for row in db.query(CaseDB).filter(CaseDB.id.in_([r.id for r in rows]))
+        ))
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.exception('Database error: %s', e)
+        raise HTTPException(status_code=500, detail='Database error') from e
+
+
+async def bulk_update_cases(db: Session, body: CaseBulkUpdate, current_user: User) -> CaseBulkResult:
+    """Apply one change to many cases; cases that are missing, forbidden or invalid are reported and skipped."""
+    changes = body.changes.model_dump(exclude_unset=True, exclude={'version'})
+    if not changes:
+        raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail='No changes given.')
+    if 'responsible_person' in changes and not current_user.is_admin:
+        raise HTTPException(
+            status_code=http.HTTPStatus.FORBIDDEN,
+            detail='Only admins can change the responsible person.',
+        )
+    rows, not_found = _target_rows(db, body, current_user.username)
+    allowed = {r.id for r in await filter_by_permission(rows, current_user.username, relation='editor')}
+    result = CaseBulkResult(not_found=not_found, forbidden=[r.id for r in rows if r.id not in allowed])
+    rows = [r for r in rows if r.id in allowed]
+    result.invalid, assignees = _invalid_rows(db, rows, changes)
+    rows = [r for r in rows if r.id not in result.invalid]
+    if not rows:
+        return result
+
+    _apply_bulk_update(db, rows, changes, assignees, current_user.username)
+    result.updated = [r.id for r in rows]
+    moved = [r for r in rows if r.id in assignees and assignees[r.id] != r.responsible_user_id]
+    if moved:
+        await delete_tuples((r.responsible_user_id, 'assignee', 'case', r.id, 'user') for r in moved
+                            if r.responsible_user_id)
+        await write_tuples((assignees[r.id], 'assignee', 'case', r.id, 'user') for r in moved)
+    return result
@@ -4,41 +4,68 @@ This module provides routes for retrieving case information,
 including functions to get cases by ID and generate fake case data.
 """
 
+import asyncio
+import functools
 import http
+import json
 import logging
 import os
 import subprocess
 import tempfile
+import time
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime
 from pathlib import Path
-from typing import Annotated, Optional
+from typing import TYPE_CHECKING, Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile  # type: ignore
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, UploadFile  # type: ignore
 from fastapi.responses import StreamingResponse
-from markitdown import MarkItDown
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 from uuid_extensions import uuid7
 
 from src.api.db.database import get_db as get_db_session
+from src.api.db.database import get_read_db
+from src.api.metrics.metrics import DOCUMENT_CONVERSION_SECONDS
 from src.api.v1.auth.auth import get_current_user_from_cookie
-from src.api.v1.auth.fga import delete_tuple, filter_by_permission, require_permission, write_tuple, write_tuple_safe
+from src.api.v1.auth.fga import (
+    check_permission,
+    delete_tuple,
+    filter_by_permission,
+    write_tuple,
+    write_tuple_safe,
+)
+from src.api.v1.etag import etag_for, is_not_modified, matches_if_match, not_modified_response, set_etag
+from src.api.v1.serialization import rows_response, select_fields
 from src.api.v1.user.models import User, UserDB
 
+from .bulk import bulk_update_cases, import_cases_stream, import_format, iter_import_rows
+from .events import broker
 from .models import (
+    ACTIVITY_PAGE_SIZE,
+    CASE_FIELDS_DESCRIPTION,
+    CASE_LIST_FIELDS,
     Case,
     CaseActivity,
+    CaseBulkResult,
+    CaseBulkUpdate,
     CaseCreate,
     CaseDB,
     CaseDocument,
+    CaseUnitOfWork,
     CaseUpdate,
     DocumentInfo,
+    activity_entries_for_update,
+    case_create_error,
+    case_from_row,
+    case_list_projection,
     db_create_case,
     db_create_case_document,
     db_delete_case,
-    db_get_case,
     db_get_case_activities,
+    db_get_case_activities_version,
     db_log_activity,
-    db_search_cases_by_user,
-    db_update_case,
+    db_search_case_rows_by_user,
 )
 from .storage import (
     _sanitize_filename,
@@ -49,9 +76,20 @@ from .storage import (
     upload_case_document,
 )
 
+if TYPE_CHECKING:
+    from markitdown import MarkItDown
+
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
+def _markdown_converter() -> 'MarkItDown':
+    """Import markitdown on first use; it pulls in the whole PDF stack and only uploads need it."""
+    from markitdown import MarkItDown
+
+    return MarkItDown()
+
+
 def _format_markdown(text: str) -> str:
     """Run rumdl fmt on a markdown string and return the formatted result."""
     try:
@@ -72,6 +110,7 @@ router = APIRouter(prefix="/case", tags=["case"])
 
 # Reusable annotated dependencies
 DbSession = Annotated[Session, Depends(get_db_session)]
+ReadDbSession = Annotated[Session, Depends(get_read_db)]
 CurrentUser = Annotated[User, Depends(get_current_user_from_cookie)]
 
 
@@ -83,6 +122,61 @@ def _get_case_db_or_404(db: Session, case_id: str) -> CaseDB:
     return row
 
 
+class CaseRequest:
+    """The case named in the request path, loaded at most once per request.
+
+    FastAPI caches dependencies per request, so the permission check and the handler share one instance.
+    An allowed OpenFGA check does not prove the case exists: ``delete_case`` removes the row before its
+    tuples, and a failed import can leave tuples behind. Handlers that only need existence use a cheap
+    ``EXISTS`` query instead of loading the row.
+    """
+
+    def __init__(self, case_id: str, user: User) -> None:
+        """Bind the case ID and caller; nothing is loaded yet."""
+        self.id = case_id
+        self.user = user
+        self._row: Optional[CaseDB] = None
+        self._exists = False
+
+    def row(self, db: Session) -> CaseDB:
+        """Return the case row, loading it on first use; 404 if it does not exist."""
+        if self._row is None:
+            self._row = _get_case_db_or_404(db, self.id)
+        return self._row
+
+    def require_exists(self, db: Session) -> None:
+        """Raise 404 unless the case exists, with an ``EXISTS`` query unless the row is already loaded."""
+        if self._exists or self._row is not None:
+            return
+        if not db.query(exists().where(CaseDB.id == self.id)).scalar():
+            raise HTTPException(status_code=http.HTTPStatus.NOT_FOUND, detail='Case not found.')
+        self._exists = True
+
+
+def get_case_request(case_id: str, current_user: CurrentUser) -> CaseRequest:
+    """Request-scoped loader for the ``{case_id}`` path parameter."""
+    return CaseRequest(case_id, current_user)
+
+
+def require_case_permission(relation: str) -> Callable:
+    """Dependency factory — 403 unless the caller has ``relation`` on the case; returns the shared loader."""
+
+    async def checker(case: Annotated[CaseRequest, Depends(get_case_request)]) -> CaseRequest:
+        if not await check_permission(case.user.username, relation, 'case', case.id):
+            raise HTTPException(
+                status_code=http.HTTPStatus.FORBIDDEN,
+                detail=f'You do not have {relation} access to this case.',
+            )
+        return case
+
+    return checker
+
+
+def _case_etag(row: CaseDB) -> str:
+    """Derive a validator from every column of the case row."""
+    return etag_for(*(getattr(row, column.key) for column in CaseDB.__table__.columns))
+
+
 @router.get(
     "/",
     response_model=list[Case],
@@ -90,15 +184,19 @@ def _get_case_db_or_404(db: Session, case_id: str) -> CaseDB:
     summary="Get all cases for the current user",
 )
 async def get_my_cases(
-    db: DbSession,
+    db: ReadDbSession,
     current_user: CurrentUser,
     q: Optional[str] = Query(default=None, description='Search customer or responsible person (case-insensitive)'),
     status: Optional[str] = Query(default=None, description='Filter by exact status value'),
     archived: Optional[bool] = Query(default=None, description='Filter by archived state'),
-) -> list[Case]:
+    fields: Optional[str] = Query(default=None, description=CASE_FIELDS_DESCRIPTION),
+) -> Response:
     """Get cases for the current user, with optional DB-level filtering, then FGA viewer check."""
-    cases = db_search_cases_by_user(db=db, user_id=current_user.username, q=q, status=status, archived=archived)
-    return await filter_by_permission(cases, current_user.username)
+    columns, defaults = case_list_projection(select_fields(fields, CASE_LIST_FIELDS, always=('id',)))
+    rows = db_search_case_rows_by_user(
+        db=db, user_id=current_user.username, q=q, status=status, archived=archived, columns=columns,
+    )
+    return rows_response(await filter_by_permission(rows, current_user.username), defaults)
 
 
 @router.get(
@@ -108,15 +206,18 @@ async def get_my_cases(
     summary="Get a case by ID",
 )
 async def get_case(
-    case_id: str,
-    db: DbSession,
-    _auth: Annotated[User, Depends(require_permission('viewer'))],
-) -> Case:
-    """Retrieve a case by its ID."""
-    result = db_get_case(db=db, case_id=case_id)
-    if not result:
-        raise HTTPException(status_code=http.HTTPStatus.NOT_FOUND, detail='Case not found.')
-    return result
+    request: Request,
+    response: Response,
+    db: ReadDbSession,
+    case: Annotated[CaseRequest, Depends(require_case_permission('viewer'))],
+) -> Case | Response:
+    """Retrieve a case by its ID, answering 304 when the client's ETag is still current."""
+    row = case.row(db)
+    etag = _case_etag(row)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    return case_from_row(row)
 
 
 @router.post(
@@ -131,21 +232,9 @@ async def create_case(
     current_user: CurrentUser,
 ) -> Case:
     """Create a new case and register the creator relationship in OpenFGA."""
-    if not case.responsible_person:
-        raise HTTPException(
-            status_code=http.HTTPStatus.BAD_REQUEST,
-            detail="Responsible person is required.",
-        )
-    if not case.status:
-        raise HTTPException(
-            status_code=http.HTTPStatus.BAD_REQUEST,
-            detail="Status is required.",
-        )
-    if not case.customer:
-        raise HTTPException(
-            status_code=http.HTTPStatus.BAD_REQUEST,
-            detail="Customer is required.",
-        )
+    error = case_create_error(case)
+    if error:
+        raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail=error)
     case_id = str(uuid7())
     result = db_create_case(db=db, case=case, user_id=current_user.username, case_id=case_id)
     await write_tuple(current_user.username, 'creator', 'case', case_id)
@@ -164,6 +253,52 @@ async def create_case(
     return result
 
 
+@router.post(
+    '/import',
+    status_code=http.HTTPStatus.OK,
+    summary='Bulk-import cases from a CSV or NDJSON file',
+)
+async def import_cases(
+    file: UploadFile,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> StreamingResponse:
+    """Create cases in batches from an upload, streaming NDJSON progress and per-row errors.
+
+    Columns/keys are the `POST /case/create` fields. Report lines are
+    `{"row": n, "error": ...}` for rejected rows, `{"imported": n, "failed": n}`
+    after each batch, and a final `{"done": true, ...}`.
+    """
+    if not current_user.is_admin:
+        raise HTTPException(status_code=http.HTTPStatus.FORBIDDEN, detail='Only admins can import cases.')
+    fmt = import_format(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail='Upload a .csv or .ndjson file.')
+    return StreamingResponse(
+        import_cases_stream(db, iter_import_rows(file.file, fmt), current_user),
+        media_type='application/x-ndjson',
+    )
+
+
+@router.post(
+    '/bulk-update',
+    response_model=CaseBulkResult,
+    status_code=http.HTTPStatus.OK,
+    summary='Apply the same change to many cases',
+)
+async def bulk_update(
+    body: CaseBulkUpdate,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> CaseBulkResult:
+    """Update cases selected by ID or filter with one permission batch check and one transaction.
+
+    Cases the caller cannot edit, that do not exist, or for which the change is
+    invalid are left untouched and listed in the response.
+    """
+    return await bulk_update_cases(db, body, current_user)
+
+
 @router.delete(
     '/{case_id}',
     status_code=http.HTTPStatus.NO_CONTENT,
@@ -172,19 +307,20 @@ async def create_case(
 async def delete_case(
     case_id: str,
     db: DbSession,
-    _auth: Annotated[User, Depends(require_permission('deleter'))],
+    _case: Annotated[CaseRequest, Depends(require_case_permission('deleter'))],
 ) -> None:
     """Delete a case and clean up its OpenFGA tuples."""
-    row = _get_case_db_or_404(db, case_id)
-    creator_id = row.user_id
-    company_id = row.company_id
-    assignee_id = row.responsible_user_id
-    db_delete_case(db=db, case_id=case_id)
+    deleted = db_delete_case(db=db, case_id=case_id)
+    if not deleted:
+        raise HTTPException(status_code=http.HTTPStatus.NOT_FOUND, detail='Case not found.')
     delete_case_documents(case_id)
-    await delete_tuple(creator_id, 'creator', 'case', case_id)
-    await delete_tuple(company_id, 'company', 'case', case_id, subject_type='company')
-    if assignee_id:
-        await delete_tuple(assignee_id, 'assignee', 'case', case_id)
+    await delete_tuple(deleted.user_id, 'creator', 'case', case_id)
+    await delete_tuple(deleted.company_id, 'company', 'case', case_id, subject_type='company')
+    if deleted.responsible_user_id:
+        await delete_tuple(deleted.responsible_user_id, 'assignee', 'case', case_id)
+
+
+_CONFLICT_DETAIL = 'The case was changed by someone else. Reload it and try again.'
 
 
 def _validate_update_fields(db: Session, update_data: dict, old: CaseDB, current_user: User) -> None:
@@ -233,37 +369,40 @@ async def update_case(
     case_id: str,
     case_update: CaseUpdate,
     db: DbSession,
-    current_user: Annotated[User, Depends(require_permission('editor'))],
+    case: Annotated[CaseRequest, Depends(require_case_permission('editor'))],
+    if_match: Annotated[Optional[str], Header(description='ETag from GET /case/{case_id}')] = None,
 ) -> Case:
-    """Apply a partial update to a case and log field changes."""
-    update_data = case_update.model_dump(exclude_unset=True)
-    old = _get_case_db_or_404(db, case_id)
+    """Apply a partial update to a case and log field changes.
+
+    Clients may send the ETag they read as ``If-Match`` or the case ``version`` in the body; either
+    answers 409 if the case has changed since. The write itself is always conditional on the version
+    read here, so two concurrent PATCHes cannot silently overwrite each other.
+    """
+    current_user = case.user
+    update_data = case_update.model_dump(exclude_unset=True, exclude={'version'})
+    old = case.row(db)
+    if not matches_if_match(if_match, _case_etag(old)) or case_update.version not in (None, old.version):
+        raise HTTPException(status_code=http.HTTPStatus.CONFLICT, detail=_CONFLICT_DETAIL)
     _validate_update_fields(db, update_data, old, current_user)
 
-    # Capture values before db_update_case modifies the same ORM object in-place
-    old_customer = old.customer
-    old_status = old.status
-    old_responsible = old.responsible_person
+    # Capture values before the update modifies the same ORM object in-place
     old_responsible_user_id = old.responsible_user_id
-    result = db_update_case(db=db, case_id=case_id, case_update=case_update)
-    if not result:
-        raise HTTPException(status_code=http.HTTPStatus.NOT_FOUND, detail='Case not found.')
-    if 'customer' in update_data and update_data['customer'] != old_customer:
-        detail = f'{old_customer} → {update_data["customer"]}'
-        db_log_activity(db, case_id, current_user.username, 'customer_changed', detail)
-    if 'status' in update_data and update_data['status'] != old_status:
-        db_log_activity(db, case_id, current_user.username, 'status_changed', f'{old_status} → {update_data["status"]}')
-    if 'responsible_person' in update_data and update_data['responsible_person'] != old_responsible:
-        detail = f'{old_responsible} → {update_data["responsible_person"]}'
-        db_log_activity(db, case_id, current_user.username, 'responsible_changed', detail)
-        new_responsible_user_id = db.query(CaseDB.responsible_user_id).filter(CaseDB.id == case_id).scalar()
+    responsible_changed = (
+        'responsible_person' in update_data and update_data['responsible_person'] != old.responsible_person
+    )
+    entries = activity_entries_for_update(case_id, current_user.username, old, update_data)
+    uow = CaseUnitOfWork(db)
+    if uow.update_case(case_id, case_update, expected_version=old.version) is None:
+        # Changed (or deleted) by someone else between our read and the write
+        raise HTTPException(status_code=http.HTTPStatus.CONFLICT, detail=_CONFLICT_DETAIL)
+    uow.log_many(entries)
+    # The case update and all its activity entries land in a single transaction
+    result = uow.commit()
+    if responsible_changed:
         if old_responsible_user_id:
             await delete_tuple(old_responsible_user_id, 'assignee', 'case', case_id)
-        if new_responsible_user_id:
-            await write_tuple(new_responsible_user_id, 'assignee', 'case', case_id)
-    if 'archived' in update_data:
-        action = 'case_archived' if update_data['archived'] else 'case_unarchived'
-        db_log_activity(db, case_id, current_user.username, action)
+        if result.responsible_user_id:
+            await write_tuple(result.responsible_user_id, 'assignee', 'case', case_id)
     return result
 
 
@@ -275,12 +414,67 @@ async def update_case(
 )
 async def get_case_activity(
     case_id: str,
-    db: DbSession,
-    _auth: Annotated[User, Depends(require_permission('viewer'))],
-) -> list[CaseActivity]:
-    """Return all activity entries for a case, oldest first."""
-    _get_case_db_or_404(db, case_id)
-    return db_get_case_activities(db, case_id)
+    request: Request,
+    response: Response,
+    db: ReadDbSession,
+    case: Annotated[CaseRequest, Depends(require_case_permission('viewer'))],
+    since: Annotated[Optional[datetime], Query(description='Only entries created after this timestamp')] = None,
+    after_id: Annotated[Optional[str], Query(description='Only entries after this activity ID')] = None,
+    limit: Annotated[int, Query(ge=1, le=1000, description='Maximum number of entries to return')] = ACTIVITY_PAGE_SIZE,
+) -> list[CaseActivity] | Response:
+    """Return a page of activity entries for a case, oldest first; 304 if this page has not changed.
+
+    Page through the log with ``after_id`` set to the last entry of the previous page.
+    """
+    case.require_exists(db)
+    # The query parameters select the page, so they are part of its validator.
+    etag = etag_for(case_id, *db_get_case_activities_version(db, case_id), since, after_id, limit)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
+    return db_get_case_activities(db, case_id, since=since, after_id=after_id, limit=limit)
+
+
+_SSE_KEEPALIVE_SECONDS = 15
+
+
+async def _case_event_stream(case_id: str, request: Request) -> AsyncIterator[str]:
+    """Yield SSE frames for a case until the client disconnects or the case is deleted."""
+    async with broker.subscribe(case_id) as queue:
+        yield 'retry: 3000\n\n'
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=_SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield f"event: {event['kind']}\ndata: {json.dumps(event['data'])}\n\n"
+            if event['kind'] == 'deleted':
+                return
+
+
+@router.get(
+    '/{case_id}/events',
+    summary='Stream new activity and field changes for a case (server-sent events)',
+)
+async def stream_case_events(
+    case_id: str,
+    request: Request,
+    db: ReadDbSession,
+    case: Annotated[CaseRequest, Depends(require_case_permission('viewer'))],
+) -> StreamingResponse:
+    """Push `activity`, `case` and `deleted` events as they are committed. FGA is checked once, on subscribe.
+
+    An event too large to carry its data arrives as `stale` (`{"id", "kind"}`); refetch the case and its activity.
+    """
+    case.require_exists(db)
+    # Release the pooled connection now; the stream may stay open for hours.
+    db.close()
+    return StreamingResponse(
+        _case_event_stream(case_id, request),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
 
 @router.get(
@@ -291,11 +485,11 @@ async def get_case_activity(
 )
 async def get_case_documents(
     case_id: str,
-    db: DbSession,
-    _auth: Annotated[User, Depends(require_permission('viewer'))],
+    db: ReadDbSession,
+    case: Annotated[CaseRequest, Depends(require_case_permission('viewer'))],
 ) -> list[DocumentInfo]:
     """Return metadata for all documents stored in MinIO under cases/{case_id}/."""
-    _get_case_db_or_404(db, case_id)
+    case.require_exists(db)
     return list_case_documents(case_id)
 
 
@@ -309,12 +503,12 @@ async def upload_case_document_endpoint(
     case_id: str,
     file: UploadFile,
     db: DbSession,
-    current_user: Annotated[User, Depends(require_permission('editor'))],
+    case: Annotated[CaseRequest, Depends(require_case_permission('editor'))],
 ) -> CaseDocument:
     """Upload a PDF to MinIO, convert it to Markdown via markitdown, and record both in the DB."""
     if file.content_type != 'application/pdf':
         raise HTTPException(status_code=http.HTTPStatus.UNPROCESSABLE_ENTITY, detail='Only PDF files are accepted.')
-    _get_case_db_or_404(db, case_id)
+    case.require_exists(db)
     data = await file.read()
     try:
         safe_name = _sanitize_filename(file.filename or 'upload.pdf')
@@ -326,11 +520,12 @@ async def upload_case_document_endpoint(
     md_key = None
     conversion_status = 'failed'
     tmp_path = None
+    started = time.perf_counter()
     try:
         with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
             tmp.write(data)
             tmp_path = tmp.name
-        result = MarkItDown().convert(tmp_path)
+        result = _markdown_converter().convert(tmp_path)
         md_content = _format_markdown(result.text_content).encode('utf-8')
         stem = Path(safe_name).stem
         md_key = upload_case_document(case_id, f'{stem}.md', md_content, 'text/markdown')
@@ -338,11 +533,12 @@ async def upload_case_document_endpoint(
     except Exception:
         logger.exception('markitdown conversion failed for %s / %s', case_id, safe_name)
     finally:
+        DOCUMENT_CONVERSION_SECONDS.labels(conversion_status).observe(time.perf_counter() - started)
         if tmp_path:
             os.unlink(tmp_path)
 
-    doc = db_create_case_document(db, case_id, current_user.username, safe_name, pdf_key, md_key, conversion_status)
-    db_log_activity(db, case_id, current_user.username, 'document_uploaded', safe_name)
+    doc = db_create_case_document(db, case_id, case.user.username, safe_name, pdf_key, md_key, conversion_status)
+    db_log_activity(db, case_id, case.user.username, 'document_uploaded', safe_name)
     return doc
 
 
@@ -355,15 +551,15 @@ async def delete_case_document_endpoint(
     case_id: str,
     filename: str,
     db: DbSession,
-    current_user: Annotated[User, Depends(require_permission('editor'))],
+    case: Annotated[CaseRequest, Depends(require_case_permission('editor'))],
 ) -> None:
     """Delete a single document from MinIO and log the action."""
-    _get_case_db_or_404(db, case_id)
+    case.require_exists(db)
     try:
         delete_case_document(case_id, filename)
     except ValueError as e:
         raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail=str(e)) from e
-    db_log_activity(db, case_id, current_user.username, 'document_deleted', filename)
+    db_log_activity(db, case_id, case.user.username, 'document_deleted', filename)
 
 
 @router.get(
@@ -373,11 +569,11 @@ async def delete_case_document_endpoint(
 async def download_case_document(
     case_id: str,
     filename: str,
-    db: DbSession,
-    _auth: Annotated[User, Depends(require_permission('viewer'))],
+    db: ReadDbSession,
+    case: Annotated[CaseRequest, Depends(require_case_permission('viewer'))],
 ) -> StreamingResponse:
     """Stream a document from MinIO to the client."""
-    _get_case_db_or_404(db, case_id)
+    case.require_exists(db)
     try:
         stream, content_type = stream_case_document(case_id, filename)
     except ValueError as e:
@@ -0,0 +1,230 @@
+"""Case event fan-out for the server-sent events stream.
+
+Writers call ``publish_case_event`` inside their transaction. On Postgres this
+issues ``pg_notify`` so the event is delivered only once the transaction
+commits, and reaches every uvicorn worker through the per-worker LISTEN
+thread started by ``start_listener``. Each worker then hands the event to its
+local subscribers via ``broker``. On other databases (the SQLite test engine)
+events are queued on the session and dispatched in-process after commit.
+
+The same transport carries other cross-worker notifications: a module calls
+``add_channel`` with its own channel and handler, then ``notify`` inside its
+transaction (e.g. the company directory cache invalidation).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import select
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any
+
+import psycopg2  # type: ignore
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT  # type: ignore
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from src.api.db.config import load_config
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'kanapi_case_events'
+_QUEUE_SIZE = 100
+# Postgres rejects NOTIFY payloads of 8000 bytes or more (and fails the whole transaction).
+NOTIFY_MAX_BYTES = 8000
+
+
+class CaseEventBroker:
+    """In-process pub/sub keyed by case ID; safe to dispatch into from any thread."""
+
+    def __init__(self) -> None:
+        """Start with no subscribers."""
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[dict[str, Any]], None]) -> None:
+        """Call ``callback`` with every event this worker receives, whatever its case (e.g. cache invalidation)."""
+        self._listeners.append(callback)
+
+    @asynccontextmanager
+    async def subscribe(self, case_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Yield a queue that receives every event published for ``case_id``."""
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=_QUEUE_SIZE))
+        with self._lock:
+            self._subscribers.setdefault(case_id, set()).add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                subs = self._subscribers.get(case_id, set())
+                subs.discard(entry)
+                if not subs:
+                    self._subscribers.pop(case_id, None)
+
+    def dispatch(self, payload: dict[str, Any]) -> None:
+        """Deliver an event to this worker's subscribers of its case; slow consumers drop events."""
+        for callback in self._listeners:
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception('Case event listener failed')
+        with self._lock:
+            targets = list(self._subscribers.get(payload.get('case_id', ''), ()))
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(_offer, queue, payload)
+
+
+def _offer(queue: asyncio.Queue, payload: dict[str, Any]) -> None:
+    with contextlib.suppress(asyncio.QueueFull):
+        queue.put_nowait(payload)
+
+
+broker = CaseEventBroker()
+
+# channel → handler run in every worker once a notification on that channel commits
+_handlers: dict[str, Callable[[dict[str, Any]], None]] = {CHANNEL: broker.dispatch}
+
+
+def add_channel(channel: str, handler: Callable[[dict[str, Any]], None]) -> None:
+    """Deliver notifications on ``channel`` to ``handler``; register before ``start_listener``."""
+    _handlers[channel] = handler
+
+
+def notify(db: Session, channel: str, payload: dict[str, Any]) -> None:
+    """Send ``payload`` on ``channel`` to every worker once the session's current transaction commits.
+
+    Raises ValueError if the encoded payload is too large for ``pg_notify``, on every database.
+    """
+    notify_many(db, channel, [payload])
+
+
+def notify_many(db: Session, channel: str, payloads: list[dict[str, Any]]) -> None:
+    """Like ``notify`` for several payloads, with one ``pg_notify`` statement for all of them."""
+    encoded = [json.dumps(payload) for payload in payloads]
+    for item in encoded:
+        if len(item.encode()) >= NOTIFY_MAX_BYTES:
+            raise ValueError(f'{channel} payload is {len(item.encode())} bytes; the limit is {NOTIFY_MAX_BYTES}')
+    if not encoded:
+        return
+    if db.get_bind().dialect.name == 'postgresql':
+        db.execute(
+            text('SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload'),
+            {'channel': channel, 'payloads': encoded},
+        )
+    else:
+        db.info.setdefault(_PENDING_KEY, []).extend((channel, payload) for payload in payloads)
+
+
+def _case_payload(case_id: str, kind: str, data: dict[str, Any]) -> dict[str, Any]:
+    payload = {'case_id': case_id, 'kind': kind, 'data': data}
+    if len(json.dumps(payload).encode()) >= NOTIFY_MAX_BYTES:
+        payload = {'case_id': case_id, 'kind': 'stale', 'data': {'id': case_id, 'kind': kind}}
+    return payload
+
+
+def publish_case_event(db: Session, case_id: str, kind: str, data: dict[str, Any]) -> None:
+    """Publish an event for a case as part of the session's current transaction.
+
+    An event too large for a notification (e.g. an activity with a very long
+    ``detail``) is sent as a ``stale`` event naming the original kind, so the
+    write still commits; the case page refetches the case and the new activity.
+    """
+    publish_case_events(db, [(case_id, kind, data)])
+
+
+def publish_case_events(db: Session, events: Iterable[tuple[str, str, dict[str, Any]]]) -> None:
+    """Publish many ``(case_id, kind, data)`` events with a single statement (bulk writes)."""
+    notify_many(db, CHANNEL, [_case_payload(case_id, kind, data) for case_id, kind, data in events])
+
+
+def _deliver(channel: str, payload: dict[str, Any]) -> None:
+    handler = _handlers.get(channel)
+    if handler is not None:
+        handler(payload)
+
+
+_PENDING_KEY = 'case_events'
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch_pending(session: Session) -> None:
+    for channel, payload in session.info.pop(_PENDING_KEY, []):
+        _deliver(channel, payload)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class _Listener(threading.Thread):
+    """Background thread holding a LISTEN connection and feeding the broker."""
+
+    def __init__(self) -> None:
+        super().__init__(name='kanapi-case-events', daemon=True)
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.join(timeout=5)
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                # Whatever went wrong (connection, config, a bug), keep the worker receiving events.
+                logger.exception('Case event listener failed, reconnecting')
+                self._stop.wait(2)
+
+    def _listen(self) -> None:
+        conn = psycopg2.connect(**load_config())
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                for channel in _handlers:
+                    cur.execute(f'LISTEN {channel};')
+            while not self._stop.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        payload = json.loads(notify.payload)
+                    except ValueError:
+                        logger.warning('Ignoring malformed %s payload', notify.channel)
+                        continue
+                    try:
+                        _deliver(notify.channel, payload)
+                    except Exception:
+                        logger.exception('Handler for %s failed', notify.channel)
+        finally:
+            conn.close()
+
+
+_listener: _Listener | None = None
+
+
+def start_listener() -> None:
+    """Start this worker's LISTEN thread (Postgres only; idempotent)."""
+    global _listener
+    if _listener is None:
+        _listener = _Listener()
+        _listener.start()
+
+
+def stop_listener() -> None:
+    """Stop the LISTEN thread on shutdown."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
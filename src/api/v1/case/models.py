@@ -2,18 +2,37 @@
 
 import logging
 import re
+from collections import Counter
+from collections.abc import Callable, Iterable
 from datetime import datetime, timezone
 from typing import List, Literal, Optional
 
 import pydantic
 from fastapi import HTTPException
-from pydantic import ConfigDict, Field, field_validator
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, or_
+from pydantic import ConfigDict, Field, field_validator, model_validator
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    and_,
+    delete,
+    func,
+    insert,
+    or_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Query, Session
+from sqlalchemy.orm import InstrumentedAttribute, Query, Session
 
 from src.api.db.database import Base
+from src.api.v1.case.events import publish_case_event, publish_case_events
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +51,26 @@ class CaseDB(Base):
     created_at = Column(DateTime(timezone=True), nullable=False)
     updated_at = Column(DateTime(timezone=True), nullable=True)
     user_id = Column(String, ForeignKey("users.username", onupdate='CASCADE'), nullable=False)
-    company_id = Column(UUID(as_uuid=False), ForeignKey("companies.id"), nullable=False)
+    company_id = Column(UUID(as_uuid=False), ForeignKey("companies.id"), nullable=False, index=True)
+    # Bumped by every update; PATCH only writes when it still holds the version the client read.
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+
+
+class TeamCompanyDB(Base):
+    """Materialized team → company membership used for sub-user case visibility.
+
+    A team is a company admin's sub-users, keyed by the admin's username (their ``parent_id``). A row says the
+    team has ``case_count`` cases in the company; it is kept up to date by ``db_track_team_cases`` in every path
+    that creates or deletes cases, and by ``db_move_team_cases`` when a user changes parent.
+    """
+
+    __tablename__ = "team_companies"
+
+    team_id = Column(
+        String, ForeignKey("users.username", ondelete="CASCADE", onupdate="CASCADE"), primary_key=True,
+    )
+    company_id = Column(UUID(as_uuid=False), ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    case_count = Column(Integer, nullable=False)
 
 
 class DocumentInfo(pydantic.BaseModel):
@@ -68,6 +106,17 @@ class CaseCreate(pydantic.BaseModel):
         return _strip_html(v)
 
 
+def case_create_error(case: CaseCreate) -> Optional[str]:
+    """Return the message for the first empty required field of a new case, or None."""
+    if not case.responsible_person:
+        return "Responsible person is required."
+    if not case.status:
+        return "Status is required."
+    if not case.customer:
+        return "Customer is required."
+    return None
+
+
 class CaseUpdate(pydantic.BaseModel):
     """Model for updating an existing case."""
 
@@ -76,6 +125,9 @@ class CaseUpdate(pydantic.BaseModel):
     customer: Optional[str] = Field(default=None, max_length=255)
     archived: Optional[bool] = None
     updated_at: Optional[datetime] = None
+    version: Optional[int] = Field(
+        default=None, ge=1, description='Version the change is based on; 409 if the case has changed since',
+    )
 
     @field_validator('responsible_person', 'customer', mode='after')
     @classmethod
@@ -91,6 +143,38 @@ class CaseDelete(pydantic.BaseModel):
     deleted: bool = True
 
 
+class CaseBulkFilter(pydantic.BaseModel):
+    """Search criteria selecting the caller's cases for a bulk update (same as GET /case/)."""
+
+    q: Optional[str] = None
+    status: Optional[str] = None
+    archived: Optional[bool] = None
+
+
+class CaseBulkUpdate(pydantic.BaseModel):
+    """Request body for a bulk update: target cases by ID or by filter, and the changes to apply."""
+
+    case_ids: Optional[list[str]] = Field(default=None, min_length=1, max_length=1000)
+    filters: Optional[CaseBulkFilter] = None
+    changes: CaseUpdate
+
+    @model_validator(mode='after')
+    def one_target(self) -> 'CaseBulkUpdate':
+        """Require exactly one of case_ids and filters."""
+        if (self.case_ids is None) == (self.filters is None):
+            raise ValueError('Provide either case_ids or filters.')
+        return self
+
+
+class CaseBulkResult(pydantic.BaseModel):
+    """Outcome of a bulk update, per case ID."""
+
+    updated: list[str] = []
+    not_found: list[str] = []
+    forbidden: list[str] = []
+    invalid: dict[str, str] = {}
+
+
 class Case(pydantic.BaseModel):
     """Represents a case in the system.
 
@@ -123,6 +207,39 @@ class Case(pydantic.BaseModel):
     company_id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: int = 1
+
+
+# Fields list endpoints can return (``fields=``), in Case order; CASE_LIST_DEFAULTS fills the non-column ones.
+CASE_LIST_FIELDS = tuple(Case.model_fields)
+CASE_LIST_DEFAULTS = {'deleted': False}
+CASE_FIELDS_DESCRIPTION = 'Comma-separated Case fields to return, e.g. id,status,customer (id is always included)'
+
+
+def case_list_projection(fields: Iterable[str]) -> tuple[tuple[InstrumentedAttribute, ...], dict[str, object]]:
+    """Split Case field names into the CaseDB columns to select and the constant fields to fill in."""
+    fields = tuple(fields)
+    columns = tuple(getattr(CaseDB, f) for f in fields if f not in CASE_LIST_DEFAULTS)
+    return columns, {f: v for f, v in CASE_LIST_DEFAULTS.items() if f in fields}
+
+
+CASE_LIST_COLUMNS, _ = case_list_projection(CASE_LIST_FIELDS)
+
+
+def case_from_row(row: CaseDB) -> Case:
+    """Build the API model from a CaseDB row."""
+    return Case(
+        id=row.id,
+        responsible_person=row.responsible_person,
+        responsible_user_id=row.responsible_user_id,
+        status=row.status,
+        customer=row.customer,
+        archived=row.archived,
+        company_id=row.company_id,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        version=row.version,
+    )
 
 
 def db_create_case(db: Session, case: CaseCreate, user_id: str, case_id: str) -> Case:
@@ -151,6 +268,7 @@ def db_create_case(db: Session, case: CaseCreate, user_id: str, case_id: str) ->
             user_id=user_id,
         )
         db.add(db_case)
+        db_track_team_cases(db, [(user_id, case.company_id)], 1)
         db.commit()
         db.refresh(db_case)
         return Case(
@@ -170,6 +288,39 @@ def db_create_case(db: Session, case: CaseCreate, user_id: str, case_id: str) ->
         raise HTTPException(status_code=500, detail="Database error") from e
 
 
+def db_create_cases_bulk(db: Session, cases: list[tuple[str, CaseCreate]], user_id: str) -> None:
+    """Insert many ``(case_id, CaseCreate)`` pairs and their ``case_created`` entries in one transaction.
+
+    Uses a single multi-row INSERT per table instead of one ORM flush per case.
+    """
+    if not cases:
+        return
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            'id': case_id,
+            'responsible_person': case.responsible_person,
+            'responsible_user_id': case.responsible_user_id,
+            'status': case.status,
+            'customer': case.customer,
+            'archived': False,
+            'company_id': case.company_id,
+            'created_at': now,
+            'user_id': user_id,
+        }
+        for case_id, case in cases
+    ]
+    try:
+        db.execute(insert(CaseDB), rows)
+        db_track_team_cases(db, [(user_id, case.company_id) for _, case in cases], 1)
+        db_log_activities(db, [(case_id, user_id, 'case_created', None) for case_id, _ in cases], commit=False)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.exception("Database error: %s", e)
+        raise HTTPException(status_code=500, detail="Database error") from e
+
+
 def db_get_case(db: Session, case_id: str) -> Optional[Case]:
     """Get a case by ID.
 
@@ -183,17 +334,7 @@ def db_get_case(db: Session, case_id: str) -> Optional[Case]:
     """
     db_case = db.query(CaseDB).filter(CaseDB.id == case_id).first()
     if db_case:
-        return Case(
-            id=db_case.id,
-            responsible_person=db_case.responsible_person,
-            responsible_user_id=db_case.responsible_user_id,
-            status=db_case.status,
-            customer=db_case.customer,
-            archived=db_case.archived,
-            company_id=db_case.company_id,
-            created_at=db_case.created_at,
-            updated_at=db_case.updated_at,
-        )
+        return case_from_row(db_case)
     return None
 
 
@@ -221,6 +362,7 @@ def db_get_cases(db: Session, skip: int = 0, limit: int = 100) -> List[Case]:
             company_id=c.company_id,
             created_at=c.created_at,
             updated_at=c.updated_at,
+            version=c.version,
         )
         for c in db_cases
     ]
@@ -242,29 +384,10 @@ def db_update_case(
         The updated case if found, None otherwise
 
     """
-    try:
-        db_case = db.query(CaseDB).filter(CaseDB.id == case_id).first()
-        if db_case:
-            update_data = case_update.model_dump(exclude_unset=True)
-            for key, value in update_data.items():
-                setattr(db_case, key, value)
-            db.commit()
-            db.refresh(db_case)
-            return Case(
-                id=db_case.id,
-                responsible_person=db_case.responsible_person,
-                status=db_case.status,
-                customer=db_case.customer,
-                archived=db_case.archived,
-                company_id=db_case.company_id,
-                created_at=db_case.created_at,
-                updated_at=db_case.updated_at,
-            )
+    uow = CaseUnitOfWork(db)
+    if uow.update_case(case_id, case_update) is None:
         return None
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.exception("Database error: %s", e)
-        raise HTTPException(status_code=500, detail="Database error") from e
+    return uow.commit()
 
 
 def db_get_cases_by_user(db: Session, user_id: str) -> List[Case]:
@@ -290,6 +413,7 @@ def db_get_cases_by_user(db: Session, user_id: str) -> List[Case]:
             company_id=c.company_id,
             created_at=c.created_at,
             updated_at=c.updated_at,
+            version=c.version,
         )
         for c in db_cases
     ]
@@ -316,6 +440,113 @@ def _apply_case_filters(
     return query
 
 
+def _visible_cases_query(db: Session, user_id: str) -> 'Query[CaseDB]':
+    """Return the query for cases a user can see before the FGA check (see db_search_cases_by_user)."""
+    from src.api.v1.user.models import UserDB
+
+    user = db.query(UserDB).filter(UserDB.username == user_id).first()
+    if user and user.parent_id:
+        # Sub-user: get all cases from companies their team works in
+        return db.query(CaseDB).join(
+            TeamCompanyDB,
+            and_(TeamCompanyDB.company_id == CaseDB.company_id, TeamCompanyDB.team_id == user.parent_id),
+        )
+    return db.query(CaseDB).filter(CaseDB.user_id == user_id)
+
+
+def db_team_company_ids(db: Session, team_id: str) -> list[str]:
+    """Return the IDs of companies the team (a company admin's sub-users) has cases in."""
+    return [r.company_id for r in db.query(TeamCompanyDB.company_id).filter(TeamCompanyDB.team_id == team_id)]
+
+
+def _upsert(db: Session) -> Callable:
+    """Return the dialect's ``insert`` that supports ``on_conflict_do_update``."""
+    return postgresql.insert if db.get_bind().dialect.name == 'postgresql' else sqlite.insert
+
+
+def _adjust_team_companies(db: Session, counts: Counter, sign: int) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) per-(team, company) case counts, dropping rows that reach 0."""
+    counts = {key: n for key, n in counts.items() if key[0] is not None and n}
+    if not counts:
+        return
+    if sign > 0:
+        stmt = _upsert(db)(TeamCompanyDB).values(
+            [{'team_id': team, 'company_id': company, 'case_count': n} for (team, company), n in counts.items()],
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[TeamCompanyDB.team_id, TeamCompanyDB.company_id],
+            set_={'case_count': TeamCompanyDB.case_count + stmt.excluded.case_count},
+        ))
+        return
+    keys = []
+    for (team, company), n in counts.items():
+        db.query(TeamCompanyDB).filter(TeamCompanyDB.team_id == team, TeamCompanyDB.company_id == company).update(
+            {TeamCompanyDB.case_count: TeamCompanyDB.case_count - n}, synchronize_session=False,
+        )
+        keys.append(and_(TeamCompanyDB.team_id == team, TeamCompanyDB.company_id == company))
+    db.query(TeamCompanyDB).filter(or_(*keys), TeamCompanyDB.case_count <= 0).delete(synchronize_session=False)
+
+
+def db_track_team_cases(db: Session, cases: Iterable[tuple[str, str]], delta: int) -> None:
+    """Record created (``delta=1``) or deleted (``delta=-1``) ``(creator user_id, company_id)`` cases.
+
+    Runs in the caller's transaction; cases created by users without a parent belong to no team.
+    """
+    from src.api.v1.user.models import UserDB
+
+    cases = list(cases)
+    user_ids = {user_id for user_id, _ in cases}
+    if not user_ids:
+        return
+    teams = dict(db.query(UserDB.username, UserDB.parent_id).filter(UserDB.username.in_(user_ids)).all())
+    _adjust_team_companies(db, Counter((teams.get(user_id), company_id) for user_id, company_id in cases), delta)
+
+
+def db_move_team_cases(db: Session, user_id: str, old_team: Optional[str], new_team: Optional[str]) -> None:
+    """Move a user's cases from ``old_team`` to ``new_team`` when their ``parent_id`` changes."""
+    if old_team == new_team:
+        return
+    per_company = db.query(CaseDB.company_id, func.count(CaseDB.id)).filter(CaseDB.user_id == user_id).group_by(
+        CaseDB.company_id,
+    ).all()
+    _adjust_team_companies(db, Counter({(old_team, company): n for company, n in per_company}), -1)
+    _adjust_team_companies(db, Counter({(new_team, company): n for company, n in per_company}), 1)
+
+
+def db_backfill_team_companies(db: Session) -> None:
+    """Build ``team_companies`` on first start after it was added, when it is empty but cases exist."""
+    if db.query(TeamCompanyDB.team_id).first() is None and db.query(CaseDB.id).first() is not None:
+        try:
+            db_rebuild_team_companies(db)
+        except HTTPException:
+            logger.warning("team_companies backfill failed; another worker may have run it")
+
+
+def db_rebuild_team_companies(db: Session) -> int:
+    """Recompute ``team_companies`` from cases and users in one transaction; return the row count."""
+    from src.api.v1.user.models import UserDB
+
+    try:
+        db.query(TeamCompanyDB).delete(synchronize_session=False)
+        rows = (
+            db.query(UserDB.parent_id, CaseDB.company_id, func.count(CaseDB.id))
+            .join(UserDB, UserDB.username == CaseDB.user_id)
+            .filter(UserDB.parent_id.isnot(None))
+            .group_by(UserDB.parent_id, CaseDB.company_id)
+            .all()
+        )
+        if rows:
+            db.execute(insert(TeamCompanyDB), [
+                {'team_id': team, 'company_id': company, 'case_count': n} for team, company, n in rows
+            ])
+        db.commit()
+        return len(rows)
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.exception("Database error: %s", e)
+        raise HTTPException(status_code=500, detail="Database error") from e
+
+
 def db_search_cases_by_user(
     db: Session,
     user_id: str,
@@ -330,34 +561,20 @@ def db_search_cases_by_user(
     FGA viewer permission is applied after this query.
 
     """
-    from src.api.v1.user.models import UserDB
+    return [Case.model_validate(row._mapping) for row in db_search_case_rows_by_user(db, user_id, q, status, archived)]
 
-    user = db.query(UserDB).filter(UserDB.username == user_id).first()
-    if user and user.parent_id:
-        # Sub-user: get all cases from companies their team works in
-        sibling_ids = db.query(UserDB.username).filter(UserDB.parent_id == user.parent_id).subquery()
-        company_ids = (
-            db.query(CaseDB.company_id).filter(CaseDB.user_id.in_(sibling_ids)).distinct().subquery()
-        )
-        query = db.query(CaseDB).filter(CaseDB.company_id.in_(company_ids))
-    else:
-        query = db.query(CaseDB).filter(CaseDB.user_id == user_id)
-    query = _apply_case_filters(query, q=q, status=status, archived=archived)
-    db_cases = query.all()
-    return [
-        Case(
-            id=c.id,
-            responsible_person=c.responsible_person,
-            responsible_user_id=c.responsible_user_id,
-            status=c.status,
-            customer=c.customer,
-            archived=c.archived,
-            company_id=c.company_id,
-            created_at=c.created_at,
-            updated_at=c.updated_at,
-        )
-        for c in db_cases
-    ]
+
+def db_search_case_rows_by_user(
+    db: Session,
+    user_id: str,
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    archived: Optional[bool] = None,
+    columns: Iterable[InstrumentedAttribute] = CASE_LIST_COLUMNS,
+) -> list[Row]:
+    """Like db_search_cases_by_user, but return row tuples of ``columns`` for the fast list path."""
+    query = _apply_case_filters(_visible_cases_query(db, user_id), q=q, status=status, archived=archived)
+    return query.with_entities(*columns).all()
 
 
 def db_get_cases_by_responsible_user(db: Session, user_id: str) -> List[Case]:
@@ -374,20 +591,30 @@ def db_get_cases_by_responsible_user(db: Session, user_id: str) -> List[Case]:
             company_id=c.company_id,
             created_at=c.created_at,
             updated_at=c.updated_at,
+            version=c.version,
         )
         for c in db_cases
     ]
 
 
-def db_delete_case(db: Session, case_id: str) -> bool:
-    """Delete a case by ID. Returns True if deleted, False if not found."""
+def db_delete_case(db: Session, case_id: str) -> Optional[Row]:
+    """Delete a case by ID with one ``DELETE … RETURNING``.
+
+    Returns the deleted case's ``user_id``, ``company_id`` and ``responsible_user_id`` (what the
+    caller needs to clean up OpenFGA tuples), or None if no such case exists.
+    """
     try:
-        db_case = db.query(CaseDB).filter(CaseDB.id == case_id).first()
-        if not db_case:
-            return False
-        db.delete(db_case)
+        deleted = db.execute(
+            delete(CaseDB)
+            .where(CaseDB.id == case_id)
+            .returning(CaseDB.user_id, CaseDB.company_id, CaseDB.responsible_user_id),
+        ).first()
+        if not deleted:
+            return None
+        db_track_team_cases(db, [(deleted.user_id, deleted.company_id)], -1)
+        publish_case_event(db, case_id, 'deleted', {'id': case_id})
         db.commit()
-        return True
+        return deleted
     except SQLAlchemyError as e:
         db.rollback()
         logger.exception("Database error: %s", e)
@@ -401,6 +628,7 @@ class CaseActivityDB(Base):
     """SQLAlchemy ORM model for case activity log."""
 
     __tablename__ = 'case_activities'
+    __table_args__ = (Index('ix_case_activities_case_id_created_at', 'case_id', 'created_at'),)
 
     id = Column(UUID(as_uuid=False), primary_key=True, index=True)
     case_id = Column(UUID(as_uuid=False), ForeignKey('cases.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -423,6 +651,38 @@ class CaseActivity(pydantic.BaseModel):
     created_at: datetime
 
 
+# (case_id, user_id, action, detail) — the arguments of db_log_activity as a tuple
+ActivityEntry = tuple[str, Optional[str], str, Optional[str]]
+
+
+def db_log_activities(db: Session, entries: Iterable[ActivityEntry], *, commit: bool = True) -> list[CaseActivity]:
+    """Append many activity entries with a single multi-row INSERT.
+
+    With ``commit=False`` the rows are only flushed into the caller's transaction,
+    so they can be committed together with other staged changes.
+    """
+    from uuid_extensions import uuid7
+    now = datetime.now(timezone.utc)
+    rows = [
+        {'id': str(uuid7()), 'case_id': case_id, 'user_id': user_id, 'action': action, 'detail': detail,
+         'created_at': now}
+        for case_id, user_id, action, detail in entries
+    ]
+    if not rows:
+        return []
+    try:
+        db.execute(insert(CaseActivityDB), rows)
+        activities = [CaseActivity(**row) for row in rows]
+        publish_case_events(db, ((a.case_id, 'activity', a.model_dump(mode='json')) for a in activities))
+        if commit:
+            db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.exception("Database error: %s", e)
+        raise HTTPException(status_code=500, detail="Database error") from e
+    return activities
+
+
 def db_log_activity(
     db: Session,
     case_id: str,
@@ -431,32 +691,150 @@ def db_log_activity(
     detail: Optional[str] = None,
 ) -> None:
     """Append an activity entry for a case."""
-    from uuid_extensions import uuid7
-    try:
-        db.add(CaseActivityDB(
-            id=str(uuid7()),
-            case_id=case_id,
-            user_id=user_id,
-            action=action,
-            detail=detail,
-            created_at=datetime.now(timezone.utc),
-        ))
-        db.commit()
-    except SQLAlchemyError as e:
-        db.rollback()
-        logger.exception("Database error: %s", e)
-        raise HTTPException(status_code=500, detail="Database error") from e
+    db_log_activities(db, [(case_id, user_id, action, detail)])
+
+
+def activity_entries_for_update(
+    case_id: str,
+    user_id: Optional[str],
+    old: CaseDB,
+    update_data: dict,
+) -> list[ActivityEntry]:
+    """Return the activity entries describing ``update_data`` applied to a case with ``old`` values.
 
+    ``old`` only needs ``customer``, ``status`` and ``responsible_person`` attributes,
+    so a row tuple works as well as an ORM object.
+    """
+    entries: list[ActivityEntry] = []
+    if 'customer' in update_data and update_data['customer'] != old.customer:
+        entries.append((case_id, user_id, 'customer_changed', f'{old.customer} → {update_data["customer"]}'))
+    if 'status' in update_data and update_data['status'] != old.status:
+        entries.append((case_id, user_id, 'status_changed', f'{old.status} → {update_data["status"]}'))
+    if 'responsible_person' in update_data and update_data['responsible_person'] != old.responsible_person:
+        detail = f'{old.responsible_person} → {update_data["responsible_person"]}'
+        entries.append((case_id, user_id, 'responsible_changed', detail))
+    if 'archived' in update_data:
+        entries.append((case_id, user_id, 'case_archived' if update_data['archived'] else 'case_unarchived', None))
+    return entries
+
+
+class CaseUnitOfWork:
+    """Stage a case update and its activity entries, then commit them in one transaction.
+
+    Example:
+        uow = CaseUnitOfWork(db)
+        row = uow.update_case(case_id, case_update)
+        uow.log(case_id, username, 'status_changed', 'open → closed')
+        case = uow.commit()
+
+    """
 
-def db_get_case_activities(db: Session, case_id: str) -> list[CaseActivity]:
-    """Return all activity entries for a case, oldest first."""
-    rows = (
-        db.query(CaseActivityDB)
+    def __init__(self, db: Session) -> None:
+        """Start with nothing staged."""
+        self.db = db
+        self._case: Optional[CaseDB] = None
+        self._activities: list[ActivityEntry] = []
+
+    def update_case(
+        self, case_id: str, case_update: CaseUpdate, *, expected_version: Optional[int] = None,
+    ) -> Optional[CaseDB]:
+        """Apply the update with one ``UPDATE … RETURNING`` without committing, bumping the case version.
+
+        With ``expected_version`` the statement only matches while the row still has that version, so a
+        concurrent edit is detected without holding a row lock. Returns the row, or None if it is missing
+        or was changed since.
+        """
+        stmt = update(CaseDB).where(CaseDB.id == case_id)
+        if expected_version is not None:
+            stmt = stmt.where(CaseDB.version == expected_version)
+        values = case_update.model_dump(exclude_unset=True, exclude={'version'})
+        row = self.db.execute(
+            stmt.values(**values, version=CaseDB.version + 1).returning(CaseDB),
+            execution_options={'populate_existing': True},
+        ).scalar_one_or_none()
+        if row is not None:
+            self._case = row
+        return row
+
+    def log(self, case_id: str, user_id: Optional[str], action: str, detail: Optional[str] = None) -> None:
+        """Stage an activity entry."""
+        self._activities.append((case_id, user_id, action, detail))
+
+    def log_many(self, entries: Iterable[ActivityEntry]) -> None:
+        """Stage a batch of activity entries, e.g. from an import."""
+        self._activities.extend(entries)
+
+    def commit(self) -> Optional[Case]:
+        """Write everything staged in one transaction; return the updated case if one was staged."""
+        try:
+            if self._case is not None:
+                publish_case_event(self.db, self._case.id, 'case', case_from_row(self._case).model_dump(mode='json'))
+            db_log_activities(self.db, self._activities, commit=False)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.exception("Database error: %s", e)
+            raise HTTPException(status_code=500, detail="Database error") from e
+        finally:
+            self._activities = []
+        if self._case is None:
+            return None
+        self.db.refresh(self._case)
+        return case_from_row(self._case)
+
+
+# Page size of GET /case/{id}/activity when the client gives no limit
+ACTIVITY_PAGE_SIZE = 200
+
+
+def db_get_case_activities_version(db: Session, case_id: str) -> tuple[int, Optional[datetime]]:
+    """Return (entry count, newest created_at) — changes whenever an entry is appended or removed."""
+    count, newest = (
+        db.query(func.count(CaseActivityDB.id), func.max(CaseActivityDB.created_at))
         .filter(CaseActivityDB.case_id == case_id)
-        .order_by(CaseActivityDB.created_at.asc())
-        .all()
+        .one()
     )
-    return [CaseActivity.model_validate(r) for r in rows]
+    return count, newest
+
+
+def db_get_case_activities(
+    db: Session,
+    case_id: str,
+    *,
+    since: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[CaseActivity]:
+    """Return activity entries for a case, oldest first.
+
+    ``since`` keeps entries created strictly after a timestamp; ``after_id`` keeps
+    entries that come after a previously seen entry (IDs are uuid7, so they break
+    ties between equal timestamps in insertion order). Both walk the
+    ``(case_id, created_at)`` index, so polling for new entries stays cheap on
+    long-lived cases. An ``after_id`` that is not an entry of this case raises 400
+    rather than silently restarting from the oldest entry.
+    """
+    query = db.query(CaseActivityDB).filter(CaseActivityDB.case_id == case_id)
+    if since is not None:
+        query = query.filter(CaseActivityDB.created_at > since)
+    if after_id is not None:
+        cursor = (
+            db.query(CaseActivityDB.created_at)
+            .filter(CaseActivityDB.case_id == case_id, CaseActivityDB.id == after_id)
+            .scalar()
+        )
+        if cursor is None:
+            raise HTTPException(status_code=400, detail='Unknown after_id for this case.')
+        query = query.filter(
+            or_(
+                CaseActivityDB.created_at > cursor,
+                and_(CaseActivityDB.created_at == cursor, CaseActivityDB.id > after_id),
+            ),
+        )
+    query = query.order_by(CaseActivityDB.created_at.asc(), CaseActivityDB.id.asc())
+    if limit is not None:
+        query = query.limit(limit)
+    return [CaseActivity.model_validate(r) for r in query.all()]
 
 
 # ─── Case documents ─────────────────────────────────────────────────────────────
@@ -3,16 +3,37 @@
 import io
 import os
 
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 
+from src.api.metrics.metrics import MINIO_ERRORS_TOTAL, MINIO_OPERATION_SECONDS, observe
+
 BUCKET = 'kanapi'
 
-_client = Minio(
-    os.environ.get('MINIO_ENDPOINT', 'localhost:9000'),
-    access_key=os.environ.get('MINIO_ACCESS_KEY', 'minioadmin'),
-    secret_key=os.environ.get('MINIO_SECRET_KEY', 'minioadmin'),
-    secure=os.environ.get('MINIO_SECURE', 'false').lower() in ('true', '1', 'yes'),
+MINIO_PROBE_TIMEOUT_SECONDS = float(os.getenv('MINIO_PROBE_TIMEOUT_SECONDS', '2'))
+
+_MINIO_SETTINGS = {
+    'endpoint': os.environ.get('MINIO_ENDPOINT', 'localhost:9000'),
+    'access_key': os.environ.get('MINIO_ACCESS_KEY', 'minioadmin'),
+    'secret_key': os.environ.get('MINIO_SECRET_KEY', 'minioadmin'),
+    'secure': os.environ.get('MINIO_SECURE', 'false').lower() in ('true', '1', 'yes'),
+}
+
+_client = Minio(**_MINIO_SETTINGS)
+
+# Readiness probes get their own client: the default one waits up to 5 minutes and retries 5 times,
+# which would leave the probe's worker thread stuck long after the probe itself timed out.
+_probe_client = Minio(
+    **_MINIO_SETTINGS,
+    http_client=urllib3.PoolManager(
+        timeout=urllib3.Timeout(connect=MINIO_PROBE_TIMEOUT_SECONDS, read=MINIO_PROBE_TIMEOUT_SECONDS),
+        maxsize=1,
+        cert_reqs='CERT_REQUIRED',
+        ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where(),
+        retries=False,
+    ),
 )
 
 
@@ -27,14 +48,23 @@ def _sanitize_filename(filename: str) -> str:
 
 def ensure_bucket() -> None:
     """Create the kanapi bucket if it does not already exist."""
-    if not _client.bucket_exists(BUCKET):
-        _client.make_bucket(BUCKET)
+    with observe(MINIO_OPERATION_SECONDS, 'ensure_bucket', MINIO_ERRORS_TOTAL):
+        if not _client.bucket_exists(BUCKET):
+            _client.make_bucket(BUCKET)
+
+
+def check_bucket() -> None:
+    """Raise unless MinIO answers within ``MINIO_PROBE_TIMEOUT_SECONDS`` and the kanapi bucket exists."""
+    with observe(MINIO_OPERATION_SECONDS, 'bucket_exists', MINIO_ERRORS_TOTAL):
+        if not _probe_client.bucket_exists(BUCKET):
+            raise RuntimeError(f'MinIO bucket {BUCKET!r} does not exist')
 
 
 def list_case_documents(case_id: str) -> list[dict]:
     """Return metadata for non-markdown objects under cases/{case_id}/, with has_markdown flag."""
     try:
-        objs = list(_client.list_objects(BUCKET, prefix=f'cases/{case_id}/', recursive=True))
+        with observe(MINIO_OPERATION_SECONDS, 'list', MINIO_ERRORS_TOTAL):
+            objs = list(_client.list_objects(BUCKET, prefix=f'cases/{case_id}/', recursive=True))
         names = {o.object_name.split('/')[-1] for o in objs if not o.object_name.endswith('/')}
         return [
             {
@@ -53,9 +83,10 @@ def list_case_documents(case_id: str) -> list[dict]:
 def delete_case_documents(case_id: str) -> None:
     """Delete all objects stored under cases/{case_id}/."""
     try:
-        objs = _client.list_objects(BUCKET, prefix=f'cases/{case_id}/', recursive=True)
-        for o in objs:
-            _client.remove_object(BUCKET, o.object_name)
+        with observe(MINIO_OPERATION_SECONDS, 'delete_prefix', MINIO_ERRORS_TOTAL):
+            objs = _client.list_objects(BUCKET, prefix=f'cases/{case_id}/', recursive=True)
+            for o in objs:
+                _client.remove_object(BUCKET, o.object_name)
     except S3Error:
         pass
 
@@ -63,20 +94,23 @@ def delete_case_documents(case_id: str) -> None:
 def delete_case_document(case_id: str, filename: str) -> None:
     """Delete a single document from MinIO."""
     safe_name = _sanitize_filename(filename)
-    _client.remove_object(BUCKET, f'cases/{case_id}/{safe_name}')
+    with observe(MINIO_OPERATION_SECONDS, 'delete', MINIO_ERRORS_TOTAL):
+        _client.remove_object(BUCKET, f'cases/{case_id}/{safe_name}')
 
 
 def upload_case_document(case_id: str, filename: str, data: bytes, content_type: str) -> str:
     """Upload bytes to MinIO at cases/{case_id}/{filename}. Returns the object key."""
     safe_name = _sanitize_filename(filename)
     object_key = f'cases/{case_id}/{safe_name}'
-    _client.put_object(BUCKET, object_key, io.BytesIO(data), length=len(data), content_type=content_type)
+    with observe(MINIO_OPERATION_SECONDS, 'put', MINIO_ERRORS_TOTAL):
+        _client.put_object(BUCKET, object_key, io.BytesIO(data), length=len(data), content_type=content_type)
     return object_key
 
 
 def stream_case_document(case_id: str, filename: str) -> tuple:
     """Return (HTTPResponse, content_type) for the requested document."""
     safe_name = _sanitize_filename(filename)
-    obj = _client.get_object(BUCKET, f'cases/{case_id}/{safe_name}')
+    with observe(MINIO_OPERATION_SECONDS, 'get', MINIO_ERRORS_TOTAL):
+        obj = _client.get_object(BUCKET, f'cases/{case_id}/{safe_name}')
     content_type = obj.headers.get('content-type', 'application/octet-stream')
     return obj, content_type
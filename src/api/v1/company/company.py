@@ -1,35 +1,57 @@
 """Company endpoints — accessible by super admin only."""
 
+import csv
 import http
-from typing import Annotated, Optional
+import io
+from collections.abc import AsyncIterator
+from itertools import islice
+from typing import Annotated, Literal, Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_
+from sqlalchemy.orm import Query as SqlQuery
 from sqlalchemy.orm import Session
 
 from src.api.db.database import get_db as get_db_session
-from src.api.v1.auth.auth import get_current_user_from_cookie
-from src.api.v1.auth.fga import filter_by_permission
-from src.api.v1.case.models import Case, CaseDB, _apply_case_filters
+from src.api.db.database import get_read_db
+from src.api.v1.auth.auth import get_current_user_from_cookie, is_super_admin
+from src.api.v1.auth.fga import check_permission, filter_by_permission
+from src.api.v1.case.models import (
+    CASE_FIELDS_DESCRIPTION,
+    CASE_LIST_FIELDS,
+    Case,
+    CaseDB,
+    TeamCompanyDB,
+    _apply_case_filters,
+    case_list_projection,
+)
 from src.api.v1.company.models import (
     Company,
     CompanyCreate,
     CompanyDB,
     db_create_company,
     db_delete_company,
-    db_get_client_companies,
-    db_get_companies,
-    db_get_company,
+    db_get_company_directory,
+    db_get_company_subtree_ids,
+    db_get_descendant_companies,
 )
+from src.api.v1.company.stats import CompanyStats, db_get_company_stats, stats_cache
+from src.api.v1.etag import etag_for, is_not_modified, not_modified_response, set_etag
+from src.api.v1.serialization import rows_response, select_fields
 from src.api.v1.user.models import User, UserDB, UserPublic
 
 router = APIRouter(prefix='/company', tags=['company'])
 
 DbSession = Annotated[Session, Depends(get_db_session)]
+ReadDbSession = Annotated[Session, Depends(get_read_db)]
 CurrentUser = Annotated[User, Depends(get_current_user_from_cookie)]
 
 
 def _require_super_admin(user: User) -> None:
-    if not user.is_admin or user.parent_id is not None:
+    if not is_super_admin(user):
         raise HTTPException(
             status_code=http.HTTPStatus.FORBIDDEN,
             detail='Super admin access required.',
@@ -45,9 +67,22 @@ def _require_company_admin(user: User) -> None:
 
 
 @router.get('/', response_model=list[Company], status_code=http.HTTPStatus.OK)
-async def get_companies(_current_user: CurrentUser, db: DbSession) -> list[Company]:
-    """Return all companies. Any authenticated user can list companies (needed for case creation)."""
-    return db_get_companies(db)
+async def get_companies(
+    request: Request,
+    _current_user: CurrentUser,
+    db: DbSession,
+) -> Response:
+    """Return all companies. Any authenticated user can list companies (needed for case creation).
+
+    Served from the per-worker company directory, which is loaded from the primary (a stale replica
+    read must not be cached) and rebuilt only after a company is created or deleted.
+    """
+    directory = db_get_company_directory(db)
+    if is_not_modified(request, directory.etag):
+        return not_modified_response(directory.etag)
+    response = Response(content=directory.body, media_type='application/json')
+    set_etag(response, directory.etag)
+    return response
 
 
 @router.post('/', response_model=Company, status_code=http.HTTPStatus.CREATED)
@@ -70,122 +105,198 @@ async def delete_company(company_id: str, current_user: CurrentUser, db: DbSessi
 
 
 @router.get('/my-users', response_model=list[UserPublic], status_code=http.HTTPStatus.OK)
-async def get_my_users(current_user: CurrentUser, db: DbSession) -> list[User]:
+async def get_my_users(
+    request: Request,
+    response: Response,
+    current_user: CurrentUser,
+    db: ReadDbSession,
+) -> list[User] | Response:
     """Return all sub-users belonging to the current company admin."""
     _require_company_admin(current_user)
     rows = db.query(UserDB).filter(UserDB.parent_id == current_user.username).all()
+    etag = etag_for(*(tuple(getattr(r, f) for f in UserPublic.model_fields) for r in rows))
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
     return [User.model_validate(r) for r in rows]
 
 
 @router.get('/mine', response_model=list[Company], status_code=http.HTTPStatus.OK)
-async def get_my_companies(current_user: CurrentUser, db: DbSession) -> list[Company]:
+async def get_my_companies(current_user: CurrentUser, db: ReadDbSession) -> list[Company]:
     """Return the distinct companies associated with the current company admin.
 
     Derived from the company_ids on cases owned by their sub-users.
     """
     _require_company_admin(current_user)
-    sub_user_ids = [u.username for u in db.query(UserDB).filter(UserDB.parent_id == current_user.username).all()]
-    if not sub_user_ids:
-        return []
-    company_ids = [
-        r[0] for r in db.query(CaseDB.company_id).filter(CaseDB.user_id.in_(sub_user_ids)).distinct().all()
-    ]
-    if not company_ids:
-        return []
-    rows = db.query(CompanyDB).filter(CompanyDB.id.in_(company_ids)).all()
+    rows = (
+        db.query(CompanyDB)
+        .join(TeamCompanyDB, TeamCompanyDB.company_id == CompanyDB.id)
+        .filter(TeamCompanyDB.team_id == current_user.username)
+        .all()
+    )
     return [Company.model_validate(r) for r in rows]
 
 
 @router.get('/my-cases', response_model=list[Case], status_code=http.HTTPStatus.OK)
 async def get_my_company_cases(
     current_user: CurrentUser,
-    db: DbSession,
+    db: ReadDbSession,
     q: Optional[str] = Query(default=None, description='Search customer or responsible person (case-insensitive)'),
     status: Optional[str] = Query(default=None, description='Filter by exact status value'),
     archived: Optional[bool] = Query(default=None, description='Filter by archived state'),
-) -> list[Case]:
+    fields: Optional[str] = Query(default=None, description=CASE_FIELDS_DESCRIPTION),
+) -> Response:
     """Return all cases across sub-users of the current company admin."""
     _require_company_admin(current_user)
-    sub_user_ids = [
-        u.username for u in db.query(UserDB).filter(UserDB.parent_id == current_user.username).all()
-    ]
-    all_user_ids = [current_user.username, *sub_user_ids]
-    query = db.query(CaseDB).filter(CaseDB.user_id.in_(all_user_ids))
+    columns, defaults = case_list_projection(select_fields(fields, CASE_LIST_FIELDS, always=('id',)))
+    query = db.query(CaseDB).join(UserDB, UserDB.username == CaseDB.user_id).filter(
+        or_(UserDB.username == current_user.username, UserDB.parent_id == current_user.username),
+    )
     query = _apply_case_filters(query, q=q, status=status, archived=archived)
-    db_cases = query.all()
-    return [
-        Case(
-            id=c.id,
-            responsible_person=c.responsible_person,
-            status=c.status,
-            customer=c.customer,
-            company_id=c.company_id,
-            created_at=c.created_at,
-            updated_at=c.updated_at,
-        )
-        for c in db_cases
-    ]
+    return rows_response(query.with_entities(*columns).all(), defaults)
 
 
 @router.get('/{company_id}', response_model=Company, status_code=http.HTTPStatus.OK)
-async def get_company(company_id: str, _current_user: CurrentUser, db: DbSession) -> Company:
+async def get_company(
+    company_id: str,
+    request: Request,
+    response: Response,
+    _current_user: CurrentUser,
+    db: DbSession,
+) -> Company | Response:
     """Return a single company by ID. Any authenticated user can view."""
-    company = db_get_company(db=db, company_id=company_id)
+    company = db_get_company_directory(db).by_id.get(company_id)
     if not company:
         raise HTTPException(status_code=http.HTTPStatus.NOT_FOUND, detail='Company not found.')
+    etag = etag_for(company.model_dump_json())
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    set_etag(response, etag)
     return company
 
 
 @router.get('/{company_id}/clients', response_model=list[Company], status_code=http.HTTPStatus.OK)
-async def get_client_companies(company_id: str, current_user: CurrentUser, db: DbSession) -> list[Company]:
-    """Return all client companies owned by this company."""
+async def get_client_companies(company_id: str, current_user: CurrentUser, db: ReadDbSession) -> list[Company]:
+    """Return all client companies below this company, including clients of clients."""
     _require_super_admin(current_user)
-    return db_get_client_companies(db=db, owner_id=company_id)
+    return db_get_descendant_companies(db=db, company_id=company_id)
 
 
 @router.get('/{company_id}/users', response_model=list[UserPublic], status_code=http.HTTPStatus.OK)
-async def get_company_users(company_id: str, current_user: CurrentUser, db: DbSession) -> list[User]:
+async def get_company_users(company_id: str, current_user: CurrentUser, db: ReadDbSession) -> list[User]:
     """Return all sub-users belonging to a company (user-based admin accounts)."""
     _require_super_admin(current_user)
-    client_ids = [r.id for r in db.query(CompanyDB).filter(CompanyDB.owner_id == company_id).all()]
-    all_ids = [company_id, *client_ids]
+    all_ids = _case_company_ids(db, company_id, is_super=True)
     user_ids = db.query(CaseDB.user_id).filter(CaseDB.company_id.in_(all_ids)).distinct().subquery()
     rows = db.query(UserDB).filter(UserDB.username.in_(user_ids)).all()
     return [User.model_validate(r) for r in rows]
 
 
+def _case_company_ids(db: Session, company_id: str, *, is_super: bool) -> list[str]:
+    """Return the company IDs whose cases are in scope: client companies at any depth are included for super admins."""
+    if not is_super:
+        return [company_id]
+    return db_get_company_subtree_ids(db, company_id) or [company_id]
+
+
 @router.get('/{company_id}/cases', response_model=list[Case], status_code=http.HTTPStatus.OK)
 async def get_company_cases(
     company_id: str,
     current_user: CurrentUser,
-    db: DbSession,
+    db: ReadDbSession,
     q: Optional[str] = Query(default=None, description='Search customer or responsible person (case-insensitive)'),
     status: Optional[str] = Query(default=None, description='Filter by exact status value'),
     archived: Optional[bool] = Query(default=None, description='Filter by archived state'),
-) -> list[Case]:
+    fields: Optional[str] = Query(default=None, description=CASE_FIELDS_DESCRIPTION),
+) -> Response:
     """Return cases for this company. Super admins see client-company cases too; others are FGA-filtered."""
-    is_super = current_user.is_admin and not current_user.parent_id
-    if is_super:
-        client_ids = [r.id for r in db.query(CompanyDB).filter(CompanyDB.owner_id == company_id).all()]
-        all_ids = [company_id, *client_ids]
-        query = db.query(CaseDB).filter(CaseDB.company_id.in_(all_ids))
-    else:
-        query = db.query(CaseDB).filter(CaseDB.company_id == company_id)
-    query = _apply_case_filters(query, q=q, status=status, archived=archived)
-    db_cases = query.all()
-    cases = [
-        Case(
-            id=c.id,
-            responsible_person=c.responsible_person,
-            responsible_user_id=c.responsible_user_id,
-            status=c.status,
-            customer=c.customer,
-            company_id=c.company_id,
-            created_at=c.created_at,
-            updated_at=c.updated_at,
-        )
-        for c in db_cases
-    ]
+    columns, defaults = case_list_projection(select_fields(fields, CASE_LIST_FIELDS, always=('id',)))
+    is_super = is_super_admin(current_user)
+    query = _apply_case_filters(
+        db.query(CaseDB).filter(CaseDB.company_id.in_(_case_company_ids(db, company_id, is_super=is_super))),
+        q=q, status=status, archived=archived,
+    )
+    rows = query.with_entities(*columns).all()
     if not is_super:
-        cases = await filter_by_permission(cases, current_user.username)
-    return cases
+        rows = await filter_by_permission(rows, current_user.username)
+    return rows_response(rows, defaults)
+
+
+@router.get('/{company_id}/stats', response_model=CompanyStats, status_code=http.HTTPStatus.OK)
+async def get_company_stats(company_id: str, current_user: CurrentUser, db: ReadDbSession) -> CompanyStats:
+    """Return dashboard case counts for this company, including client companies for super admins.
+
+    Other users need the company's ``admin`` or ``member`` relation, which already grants viewer on all of
+    its cases, so the counts need no per-case FGA filtering.
+    """
+    is_super = is_super_admin(current_user)
+    if not is_super and not (
+        await check_permission(current_user.username, 'admin', 'company', company_id)
+        or await check_permission(current_user.username, 'member', 'company', company_id)
+    ):
+        raise HTTPException(status_code=http.HTTPStatus.FORBIDDEN, detail='You do not have access to this company.')
+    return stats_cache.get_or_compute(
+        (company_id, is_super),
+        lambda: db_get_company_stats(db, _case_company_ids(db, company_id, is_super=is_super)),
+    )
+
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FIELDS = tuple(f for f in Case.model_fields if f != 'deleted')
+
+
+def _export_csv_chunk(cases: list[Case], *, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for case in cases:
+        row = case.model_dump(mode='json', include=set(EXPORT_FIELDS))
+        writer.writerow(row[f] for f in EXPORT_FIELDS)
+    return buffer.getvalue()
+
+
+async def _export_cases(query: SqlQuery, user_id: Optional[str], fmt: str) -> AsyncIterator[str]:
+    """Yield export chunks straight off a server-side cursor, FGA-filtering each chunk unless user_id is None."""
+    rows = iter(query.yield_per(EXPORT_CHUNK_SIZE))
+    header = True
+    while True:
+        chunk = await run_in_threadpool(lambda: list(islice(rows, EXPORT_CHUNK_SIZE)))
+        if not chunk and not header:
+            return
+        cases = [Case.model_validate(row._mapping) for row in chunk]
+        if user_id is not None:
+            cases = await filter_by_permission(cases, user_id)
+        if fmt == 'csv':
+            yield _export_csv_chunk(cases, header=header)
+        elif cases:
+            yield ''.join(c.model_dump_json(include=set(EXPORT_FIELDS)) + '\n' for c in cases)
+        header = False
+        if len(chunk) < EXPORT_CHUNK_SIZE:
+            return
+
+
+@router.get('/{company_id}/cases/export', status_code=http.HTTPStatus.OK)
+async def export_company_cases(
+    company_id: str,
+    current_user: CurrentUser,
+    db: ReadDbSession,
+    fmt: Annotated[Literal['ndjson', 'csv'], Query(alias='format', description='Output format')] = 'ndjson',
+    q: Annotated[Optional[str], Query(description='Search customer or responsible person (case-insensitive)')] = None,
+    status: Annotated[Optional[str], Query(description='Filter by exact status value')] = None,
+    archived: Annotated[Optional[bool], Query(description='Filter by archived state')] = None,
+) -> StreamingResponse:
+    """Stream the same cases as `GET /{company_id}/cases` as NDJSON or CSV, holding one chunk in memory at a time."""
+    is_super = is_super_admin(current_user)
+    columns = [getattr(CaseDB, f) for f in EXPORT_FIELDS]
+    query = _apply_case_filters(
+        db.query(*columns).filter(CaseDB.company_id.in_(_case_company_ids(db, company_id, is_super=is_super))),
+        q=q, status=status, archived=archived,
+    ).order_by(CaseDB.created_at, CaseDB.id)
+    media_type = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return StreamingResponse(
+        _export_cases(query, None if is_super else current_user.username, fmt),
+        media_type=media_type,
+        # company_id comes from the path: percent-encode it (RFC 6266 filename*) so it cannot break the header.
+        headers={'Content-Disposition': f"attachment; filename*=UTF-8''{quote(f'cases-{company_id}.{fmt}', safe='')}"},
+    )
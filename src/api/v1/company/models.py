@@ -2,19 +2,24 @@
 
 import http
 import logging
+import os
 from datetime import datetime, timezone
 from typing import Optional
 
+import orjson
 import pydantic
 from fastapi import HTTPException
 from pydantic import ConfigDict, EmailStr, Field
-from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, ForeignKey, String, exists, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from uuid_extensions import uuid7
 
 from src.api.db.database import Base
+from src.api.v1.cache import TTLCache
+from src.api.v1.case.events import add_channel, notify
+from src.api.v1.etag import etag_for
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +37,9 @@ class CompanyDB(Base):
     ceo = Column(String, nullable=True)
     business_number = Column(String, nullable=True)
     hq_origin = Column(String, nullable=True)
-    owner_id = Column(UUID(as_uuid=False), ForeignKey('companies.id', ondelete='SET NULL'), nullable=True)
+    owner_id = Column(
+        UUID(as_uuid=False), ForeignKey('companies.id', ondelete='SET NULL'), nullable=True, index=True,
+    )
     created_at = Column(DateTime(timezone=True), nullable=False)
 
 
@@ -82,7 +89,10 @@ def db_create_company(db: Session, company_create: CompanyCreate) -> Company:
             created_at=datetime.now(timezone.utc),
         )
         db.add(db_company)
+        notify(db, COMPANY_CHANNEL, {'kind': 'created', 'id': db_company.id})
         db.commit()
+        # Don't wait for our own NOTIFY to come back through the listener.
+        _on_company_event({})
         db.refresh(db_company)
         return Company.model_validate(db_company)
     except SQLAlchemyError as e:
@@ -97,6 +107,12 @@ def db_get_companies(db: Session) -> list[Company]:
     return [Company.model_validate(r) for r in rows]
 
 
+def db_get_companies_version(db: Session) -> tuple[int, Optional[datetime]]:
+    """Return (company count, newest created_at) — companies are only ever created or deleted."""
+    count, newest = db.query(func.count(CompanyDB.id), func.max(CompanyDB.created_at)).one()
+    return count, newest
+
+
 def db_get_company(db: Session, company_id: str) -> Optional[Company]:
     """Return a single company by ID."""
     row = db.query(CompanyDB).filter(CompanyDB.id == company_id).first()
@@ -109,21 +125,84 @@ def db_get_client_companies(db: Session, owner_id: str) -> list[Company]:
     return [Company.model_validate(r) for r in rows]
 
 
+# ─── Per-worker company caches ────────────────────────────────────────────────
+#
+# Companies only change through db_create_company / db_delete_company. Both send a notification on
+# COMPANY_CHANNEL inside their transaction; after commit every worker (via the LISTEN thread on Postgres,
+# in-process elsewhere) clears the caches below. The TTLs only bound staleness if a notification is lost.
+
+COMPANY_CHANNEL = 'kanapi_company_events'
+COMPANY_CACHE_SECONDS = float(os.getenv('COMPANY_CACHE_SECONDS', '300'))
+COMPANY_TREE_CACHE_SECONDS = float(os.getenv('COMPANY_TREE_CACHE_SECONDS', '300'))
+
+
+class CompanyDirectory:
+    """Immutable snapshot of every company: models by ID, the pre-encoded list body and its ETag."""
+
+    __slots__ = ('body', 'by_id', 'companies', 'etag')
+
+    def __init__(self, companies: list[Company]) -> None:
+        """Index the companies and encode the list response once."""
+        self.companies = tuple(companies)
+        self.by_id = {c.id: c for c in companies}
+        self.body = orjson.dumps([c.model_dump(mode='json') for c in companies], option=orjson.OPT_UTC_Z)
+        # Same validator as db_get_companies_version, so every worker hands out the same ETag.
+        self.etag = etag_for(len(companies), max((c.created_at for c in companies), default=None))
+
+
+company_directory_cache: TTLCache[CompanyDirectory] = TTLCache(COMPANY_CACHE_SECONDS)
+company_tree_cache: TTLCache[tuple[str, ...]] = TTLCache(COMPANY_TREE_CACHE_SECONDS)
+
+
+def _on_company_event(_payload: dict) -> None:
+    company_directory_cache.clear()
+    company_tree_cache.clear()
+
+
+add_channel(COMPANY_CHANNEL, _on_company_event)
+
+
+def db_get_company_directory(db: Session) -> CompanyDirectory:
+    """Return the cached company directory, loading it with one query on a miss."""
+    return company_directory_cache.get_or_compute('all', lambda: CompanyDirectory(db_get_companies(db)))
+
+
+def _query_company_subtree_ids(db: Session, company_id: str) -> tuple[str, ...]:
+    tree = db.query(CompanyDB.id).filter(CompanyDB.id == company_id).cte('company_tree', recursive=True)
+    # UNION (not UNION ALL) stops on an owner_id cycle instead of recursing forever.
+    tree = tree.union(db.query(CompanyDB.id).filter(CompanyDB.owner_id == tree.c.id))
+    return tuple(r.id for r in db.query(tree.c.id))
+
+
+def db_get_company_subtree_ids(db: Session, company_id: str) -> list[str]:
+    """Return the company and all its client companies at any depth, via one recursive CTE (cached)."""
+    return list(company_tree_cache.get_or_compute(company_id, lambda: _query_company_subtree_ids(db, company_id)))
+
+
+def db_get_descendant_companies(db: Session, company_id: str) -> list[Company]:
+    """Return every client company below the given company, however deep the owner chain."""
+    ids = [i for i in db_get_company_subtree_ids(db, company_id) if i != company_id]
+    if not ids:
+        return []
+    rows = db.query(CompanyDB).filter(CompanyDB.id.in_(ids)).all()
+    return [Company.model_validate(r) for r in rows]
+
+
 def db_delete_company(db: Session, company_id: str) -> bool:
     """Delete a company by ID. Returns False if not found. Raises 409 if the company has cases."""
     from src.api.v1.case.models import CaseDB
     try:
-        row = db.query(CompanyDB).filter(CompanyDB.id == company_id).first()
-        if not row:
-            return False
-        case_count = db.query(CaseDB).filter(CaseDB.company_id == company_id).count()
-        if case_count > 0:
+        # EXISTS stops at the first case instead of counting them all.
+        if db.query(exists().where(CaseDB.company_id == company_id)).scalar():
             raise HTTPException(
                 status_code=http.HTTPStatus.CONFLICT,
-                detail=f'Cannot delete company: {case_count} case(s) are attached to it.',
+                detail='Cannot delete company: cases are attached to it.',
             )
-        db.delete(row)
+        if not db.query(CompanyDB).filter(CompanyDB.id == company_id).delete(synchronize_session=False):
+            return False
+        notify(db, COMPANY_CHANNEL, {'kind': 'deleted', 'id': company_id})
         db.commit()
+        _on_company_event({})
         return True
     except HTTPException:
         raise
@@ -0,0 +1,75 @@
+"""Case counts for company dashboards.
+
+``db_get_company_stats`` computes the breakdowns with one ``GROUP BY`` per
+dimension over the company's cases (``cases.company_id`` is indexed), so the
+dashboards no longer download every case to count them.
+
+Results are kept in a small per-worker cache. Every case write publishes a
+case event (see ``src.api.v1.case.events``), and each worker's broker clears
+the cache when one arrives — on Postgres via LISTEN, so writes made by other
+workers invalidate it too. A TTL (``COMPANY_STATS_CACHE_SECONDS``, default 60;
+0 disables caching) covers changes that bypass case events, such as a
+username rename cascading into ``responsible_user_id``.
+"""
+
+import os
+from typing import Any, Optional
+
+import pydantic
+from sqlalchemy import func
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from src.api.v1.cache import TTLCache
+from src.api.v1.case.events import broker
+from src.api.v1.case.models import CaseDB
+
+STATS_CACHE_SECONDS = float(os.getenv('COMPANY_STATS_CACHE_SECONDS', '60'))
+
+
+class StatCount(pydantic.BaseModel):
+    """Number of cases sharing one value of a dimension."""
+
+    value: Optional[str] = None
+    count: int
+
+
+class CompanyStats(pydantic.BaseModel):
+    """Case counts for a company, grouped for dashboard widgets."""
+
+    total: int
+    active: int
+    archived: int
+    by_status: list[StatCount]
+    by_responsible_user: list[StatCount]
+    by_customer: list[StatCount]
+
+
+def _grouped(db: Session, column: InstrumentedAttribute, company_ids: list[str]) -> list[tuple[Any, int]]:
+    count = func.count(CaseDB.id)
+    return (
+        db.query(column, count)
+        .filter(CaseDB.company_id.in_(company_ids))
+        .group_by(column)
+        .order_by(count.desc(), column)
+        .all()
+    )
+
+
+def db_get_company_stats(db: Session, company_ids: list[str]) -> CompanyStats:
+    """Return case counts across the given companies, largest groups first."""
+    archived = dict(_grouped(db, CaseDB.archived, company_ids))
+    by_status = [StatCount(value=v, count=n) for v, n in _grouped(db, CaseDB.status, company_ids)]
+    return CompanyStats(
+        total=sum(s.count for s in by_status),
+        active=archived.get(False, 0),
+        archived=archived.get(True, 0),
+        by_status=by_status,
+        by_responsible_user=[
+            StatCount(value=v, count=n) for v, n in _grouped(db, CaseDB.responsible_user_id, company_ids)
+        ],
+        by_customer=[StatCount(value=v, count=n) for v, n in _grouped(db, CaseDB.customer, company_ids)],
+    )
+
+
+stats_cache: TTLCache[CompanyStats] = TTLCache(STATS_CACHE_SECONDS)
+broker.add_listener(stats_cache.clear)
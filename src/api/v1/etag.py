@@ -0,0 +1,65 @@
+"""Conditional GET helpers — weak ETags and If-None-Match handling.
+
+Handlers compute an ETag from a cheap version fingerprint (row values, row
+count + newest timestamp, …) *before* building response models. When the
+client already holds that version they return ``not_modified_response()``
+and skip serialization entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http
+from typing import TYPE_CHECKING
+
+from fastapi import Response
+
+if TYPE_CHECKING:
+    from fastapi import Request
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def etag_for(*parts: object) -> str:
+    """Return a weak ETag derived from the given version parts."""
+    digest = hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    """Strip the weak prefix — If-None-Match uses weak comparison."""
+    return tag.strip().removeprefix('W/')
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Return True when the client's If-None-Match already matches ``etag``."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    candidates = {_opaque(t) for t in header.split(',')}
+    return '*' in candidates or _opaque(etag) in candidates
+
+
+def matches_if_match(header: str | None, etag: str) -> bool:
+    """Return False when an If-Match header is present and names neither ``etag`` nor ``*``.
+
+    Comparison is weak like If-None-Match: every validator this API hands out is weak.
+    """
+    if not header:
+        return True
+    candidates = {_opaque(t) for t in header.split(',')}
+    return '*' in candidates or _opaque(etag) in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    """Return an empty 304 carrying the current validator."""
+    return Response(
+        status_code=http.HTTPStatus.NOT_MODIFIED,
+        headers={'ETag': etag, 'Cache-Control': CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach the validator so the client revalidates on its next poll."""
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = CACHE_CONTROL
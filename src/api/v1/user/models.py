@@ -213,6 +213,10 @@ def db_update_user(db: Session, username: str, user_update: UserUpdate) -> Optio
         updates = user_update.model_dump(exclude_none=True)
         if "password" in updates:
             updates["password"] = User.hash_password(User, updates["password"])
+        if "parent_id" in updates:
+            from src.api.v1.case.models import db_move_team_cases
+
+            db_move_team_cases(db, username, user_db.parent_id, updates["parent_id"])
 
         for field, value in updates.items():
             setattr(user_db, field, value)
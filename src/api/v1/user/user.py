@@ -2,10 +2,12 @@
 
 from typing import Annotated, List
 
-from fastapi import APIRouter, Cookie, Depends, HTTPException
+from fastapi import APIRouter, Cookie, Depends, HTTPException, Query, Response
+from sqlalchemy import delete, exists
 from sqlalchemy.orm import Session
 
-from src.api.db.database import get_db
+from src.api.db.database import get_db, get_read_db
+from src.api.v1.serialization import rows_response, select_fields
 
 from .models import (
     User,
@@ -117,27 +119,36 @@ async def update_user(
     return result
 
 
+USER_LIST_FIELDS = tuple(UserPublic.model_fields)
+
+
 @router.get("/all", response_model=List[UserPublic])
 async def get_all_users(
     _current_user: Annotated[User, Depends(get_user_from_cookie)],
-    db: Session = Depends(get_db),  # noqa: B008
-) -> List[User]:
+    db: Session = Depends(get_read_db),  # noqa: B008
+    fields: Annotated[
+        str | None,
+        Query(description="Comma-separated user fields to return (username is always included)"),
+    ] = None,
+) -> Response:
     """Get all users. Scoped by role: super admin sees all, others see own company."""
+    columns = [getattr(UserDB, f) for f in select_fields(fields, USER_LIST_FIELDS, always=("username",))]
     try:
+        query = db.query(*columns)
         is_super_admin = _current_user.is_admin and not _current_user.parent_id
         if is_super_admin:
-            users = db.query(UserDB).all()
+            rows = query.all()
         elif _current_user.is_admin:
             # Company admin: see self + own sub-users
-            users = db.query(UserDB).filter(
+            rows = query.filter(
                 (UserDB.username == _current_user.username) | (UserDB.parent_id == _current_user.username),
             ).all()
         else:
             # Regular user: see users in same company (same parent)
-            users = db.query(UserDB).filter(
+            rows = query.filter(
                 (UserDB.username == _current_user.parent_id) | (UserDB.parent_id == _current_user.parent_id),
             ).all()
-        return [User.model_validate(user) for user in users]
+        return rows_response(rows)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -156,31 +167,36 @@ async def delete_user_by_id(
         raise HTTPException(status_code=403, detail="Only admins can delete users.")
     if current_user.username == user_id:
         raise HTTPException(status_code=400, detail="You cannot delete your own account.")
-    user_db = db.query(UserDB).filter(UserDB.username == user_id).first()
+    from src.api.v1.case.models import CaseDB  # local import to avoid circular dependency
+
+    # One statement: delete only if the caller manages the user (company admins) and no case references them.
+    stmt = delete(UserDB).where(UserDB.username == user_id, ~exists().where(CaseDB.user_id == user_id))
+    is_super_admin = current_user.is_admin and not current_user.parent_id
+    if not is_super_admin:
+        stmt = stmt.where(UserDB.parent_id == current_user.username)
+    if db.execute(stmt.returning(UserDB.username)).first():
+        db.commit()
+        return
+
+    # Nothing was deleted — work out why; this path is rare so the extra query is fine.
+    user_db = db.query(UserDB.parent_id).filter(UserDB.username == user_id).first()
     if not user_db:
         raise HTTPException(status_code=404, detail="User not found.")
     # Company admins can only delete their own sub-users
-    is_super_admin = current_user.is_admin and not current_user.parent_id
     if not is_super_admin and user_db.parent_id != current_user.username:
         raise HTTPException(status_code=403, detail="You can only delete users you manage.")
-    from src.api.v1.case.models import CaseDB  # local import to avoid circular dependency
-
-    has_cases = db.query(CaseDB).filter(CaseDB.user_id == user_id).first() is not None
-    if has_cases:
-        raise HTTPException(
-            status_code=409,
-            detail="Cannot delete user: \
-                            they have associated cases. Delete their cases first.",
-        )
-    db.delete(user_db)
-    db.commit()
+    raise HTTPException(
+        status_code=409,
+        detail="Cannot delete user: \
+                        they have associated cases. Delete their cases first.",
+    )
 
 
 @router.get("/{user_id}/cases", response_model=list)
 async def get_user_cases(
     user_id: str,
     current_user: Annotated[User, Depends(get_user_from_cookie)],
-    db: Session = Depends(get_db),  # noqa: B008
+    db: Session = Depends(get_read_db),  # noqa: B008
 ) -> list:
     """Get all cases for a user. Admins can view managed users; users can view their own."""
     if current_user.username != user_id:
@@ -201,7 +217,7 @@ async def get_user_cases(
 async def get_user_changelog(
     user_id: str,
     current_user: Annotated[User, Depends(get_user_from_cookie)],
-    db: Session = Depends(get_db),  # noqa: B008
+    db: Session = Depends(get_read_db),  # noqa: B008
 ) -> list[UserChangelog]:
     """Return field-level changelog for a user. Super admin only."""
     is_super_admin = current_user.is_admin and not current_user.parent_id
@@ -214,7 +230,7 @@ async def get_user_changelog(
 async def get_user(
     user_id: str,
     current_user: Annotated[User, Depends(get_user_from_cookie)],
-    db: Session = Depends(get_db),  # noqa: B008
+    db: Session = Depends(get_read_db),  # noqa: B008
 ) -> User:
     """Get a user by ID. Requires admin."""
     if not current_user.is_admin:
@@ -15,7 +15,7 @@ from sqlalchemy.orm import sessionmaker  # noqa: E402
 
 from src.api.db.database import Base  # noqa: E402
 from src.api.v1.case.models import CaseActivityDB, CaseDB  # noqa: E402, F401
-from src.api.v1.company.models import CompanyDB  # noqa: E402, F401
+from src.api.v1.company.models import CompanyDB, company_directory_cache, company_tree_cache  # noqa: E402, F401
 from src.api.v1.user.models import UserDB  # noqa: E402, F401
 
 SQLITE_URL = "sqlite:///:memory:"
@@ -42,3 +42,6 @@ def db(test_engine):  # noqa ANN001
     session.close()
     transaction.rollback()
     connection.close()
+    # Per-worker company caches may hold rows that were just rolled back.
+    company_directory_cache.clear()
+    company_tree_cache.clear()
@@ -1,12 +1,28 @@
 """Tests for case activity log — db_log_activity and db_get_case_activities."""
 
+import http
 import time
 import uuid
 from datetime import datetime, timezone
 
-from src.api.v1.case.models import CaseActivityDB, CaseDB, db_get_case_activities, db_log_activity
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import event
+from starlette.requests import Request
+
+from src.api.v1.case.case import CaseRequest, get_case_activity, update_case
+from src.api.v1.case.models import (
+    ACTIVITY_PAGE_SIZE,
+    CaseActivityDB,
+    CaseDB,
+    CaseUnitOfWork,
+    CaseUpdate,
+    db_get_case_activities,
+    db_log_activities,
+    db_log_activity,
+)
 from src.api.v1.company.models import CompanyDB
-from src.api.v1.user.models import UserDB
+from src.api.v1.user.models import User, UserDB
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -39,6 +55,13 @@ def _make_case(db, company_id, user_id):  # noqa ANN001
     return case_id
 
 
+def _count_commits(db):  # noqa ANN001
+    """Return a list that grows by one entry per commit on the session."""
+    commits = []
+    event.listen(db, 'after_commit', lambda _session: commits.append(1))
+    return commits
+
+
 # ─── db_log_activity ──────────────────────────────────────────────────────────
 
 
@@ -127,6 +150,76 @@ def test_get_activities_scoped_to_case(db):  # noqa ANN001
     assert db_get_case_activities(db, case_b) == []
 
 
+def test_get_activities_after_id_with_limit(db):  # noqa ANN001
+    """after_id returns only newer entries, limit caps the page size and an unknown after_id is a 400."""
+    user_id = _make_user(db)
+    company_id = _make_company(db)
+    case_id = _make_case(db, company_id, user_id)
+    for i in range(5):
+        db_log_activity(db, case_id, user_id, 'commented', str(i))
+
+    first_page = db_get_case_activities(db, case_id, limit=2)
+    assert [e.detail for e in first_page] == ['0', '1']
+    second_page = db_get_case_activities(db, case_id, after_id=first_page[-1].id, limit=2)
+    assert [e.detail for e in second_page] == ['2', '3']
+    with pytest.raises(HTTPException) as exc:
+        db_get_case_activities(db, case_id, after_id=str(uuid.uuid4()))
+    assert exc.value.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+async def test_activity_endpoint_pages_through_a_long_log(db):  # noqa ANN001
+    """Without a limit one page comes back; following after_id until a short page returns every entry."""
+    user_id = _make_user(db)
+    case_id = _make_case(db, _make_company(db), user_id)
+    db_log_activities(db, [(case_id, user_id, 'commented', str(i)) for i in range(ACTIVITY_PAGE_SIZE + 5)])
+    caller = User(username=user_id, email=f"{user_id}@test.dev", is_admin=False)
+
+    async def page(after_id=None):  # noqa ANN202
+        request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+        return await get_case_activity(case_id, request, Response(), db, CaseRequest(case_id, caller),
+                                       after_id=after_id)
+
+    seen = await page()
+    assert len(seen) == ACTIVITY_PAGE_SIZE
+    while True:
+        following = await page(seen[-1].id)
+        seen += following
+        if len(following) < ACTIVITY_PAGE_SIZE:
+            break
+    assert [e.detail for e in seen] == [str(i) for i in range(ACTIVITY_PAGE_SIZE + 5)]
+
+
+def test_get_activities_since_timestamp(db):  # noqa ANN001
+    """The since filter returns only entries created strictly after the given timestamp."""
+    user_id = _make_user(db)
+    company_id = _make_company(db)
+    case_id = _make_case(db, company_id, user_id)
+
+    db_log_activity(db, case_id, user_id, 'case_created')
+    seen = db_get_case_activities(db, case_id)[-1].created_at
+    time.sleep(0.01)
+    db_log_activity(db, case_id, user_id, 'status_changed', 'open → closed')
+
+    entries = db_get_case_activities(db, case_id, since=seen)
+    assert [e.action for e in entries] == ['status_changed']
+
+
+def test_get_activities_after_id_breaks_timestamp_ties(db):  # noqa ANN001
+    """Entries sharing a created_at are paged in uuid7 order without skipping any."""
+    from uuid_extensions import uuid7
+
+    user_id = _make_user(db)
+    company_id = _make_company(db)
+    case_id = _make_case(db, company_id, user_id)
+    stamp = datetime.now(timezone.utc)
+    ids = [str(uuid7()) for _ in range(3)]
+    for activity_id in ids:
+        db.add(CaseActivityDB(id=activity_id, case_id=case_id, user_id=user_id, action='imported', created_at=stamp))
+    db.flush()
+
+    assert [e.id for e in db_get_case_activities(db, case_id, after_id=ids[0])] == ids[1:]
+
+
 def test_activity_cascade_deleted_with_case(db):  # noqa ANN001
     """Deleting a case removes its activity rows (CASCADE)."""
     user_id = _make_user(db)
@@ -143,3 +236,53 @@ def test_activity_cascade_deleted_with_case(db):  # noqa ANN001
 
     remaining = db.query(CaseActivityDB).filter(CaseActivityDB.case_id == case_id).all()
     assert remaining == []
+
+
+# ─── Batched writes ───────────────────────────────────────────────────────────
+
+
+def test_log_activities_bulk_insert_single_commit(db):  # noqa ANN001
+    """db_log_activities writes a whole batch in one transaction."""
+    user_id = _make_user(db)
+    company_id = _make_company(db)
+    case_id = _make_case(db, company_id, user_id)
+    commits = _count_commits(db)
+
+    written = db_log_activities(db, [(case_id, user_id, 'imported', str(i)) for i in range(50)])
+
+    assert len(commits) == 1
+    assert len(written) == 50
+    assert [e.detail for e in db_get_case_activities(db, case_id)] == [str(i) for i in range(50)]
+
+
+def test_unit_of_work_commits_update_and_activities_together(db):  # noqa ANN001
+    """CaseUnitOfWork stages the case update and its entries and commits them once."""
+    user_id = _make_user(db)
+    company_id = _make_company(db)
+    case_id = _make_case(db, company_id, user_id)
+    commits = _count_commits(db)
+
+    uow = CaseUnitOfWork(db)
+    uow.update_case(case_id, CaseUpdate(status='closed'))
+    uow.log(case_id, user_id, 'status_changed', 'open → closed')
+    uow.log_many([(case_id, user_id, 'case_archived', None)])
+    assert commits == []
+    result = uow.commit()
+
+    assert len(commits) == 1
+    assert result.status == 'closed'
+    assert [e.action for e in db_get_case_activities(db, case_id)] == ['status_changed', 'case_archived']
+
+
+async def test_update_case_endpoint_uses_one_transaction(db):  # noqa ANN001
+    """A PATCH changing several fields commits the case and all activity entries once."""
+    user_id = _make_user(db)
+    company_id = _make_company(db)
+    case_id = _make_case(db, company_id, user_id)
+    commits = _count_commits(db)
+    caller = User(username=user_id, email=f"{user_id}@test.dev", is_admin=False)
+
+    await update_case(case_id, CaseUpdate(status='closed', archived=True), db, CaseRequest(case_id, caller))
+
+    assert len(commits) == 1
+    assert [e.action for e in db_get_case_activities(db, case_id)] == ['status_changed', 'case_archived']
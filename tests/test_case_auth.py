@@ -10,6 +10,7 @@ Hierarchy used across all tests:
 
 Authorization is delegated to OpenFGA. These tests verify:
   - _get_case_db_or_404 (still a local helper)
+  - CaseRequest is shared by the permission check and the handler, and loads the row at most once
   - require_permission dependency raises 403 when OpenFGA denies access
   - require_permission dependency passes when OpenFGA grants access
 """
@@ -17,12 +18,23 @@ Authorization is delegated to OpenFGA. These tests verify:
 import http
 import uuid
 from datetime import datetime, timezone
+from typing import Annotated
 from unittest.mock import AsyncMock, patch
 
 import pytest
-from fastapi import HTTPException
-
-from src.api.v1.case.case import _get_case_db_or_404
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.api.db.query_stats import assert_max_queries
+from src.api.v1.auth.auth import get_current_user_from_cookie
+from src.api.v1.case.case import (
+    CaseRequest,
+    _get_case_db_or_404,
+    delete_case,
+    get_case_documents,
+    get_case_request,
+    require_case_permission,
+)
 from src.api.v1.case.models import CaseDB
 from src.api.v1.company.models import CompanyDB
 from src.api.v1.user.models import User, UserDB
@@ -130,6 +142,84 @@ def test_get_case_db_raises_404_when_not_found(scenario):  # noqa ANN001
     assert exc.value.status_code == http.HTTPStatus.NOT_FOUND
 
 
+# ─── delete_case ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_delete_case_cleans_up_tuples_from_returned_row(scenario):  # noqa ANN001
+    """One DELETE … RETURNING supplies creator, company and assignee for the OpenFGA cleanup."""
+    s = scenario
+    case = s["case_a1"]
+    case.responsible_user_id = s["user_a2"].username
+    s["db"].flush()
+    removed = AsyncMock()
+
+    with assert_max_queries(4) as stats, \
+            patch("src.api.v1.case.case.delete_tuple", new=removed), \
+            patch("src.api.v1.case.case.delete_case_documents"):
+        await delete_case(case.id, s["db"], CaseRequest(case.id, _as_user(s["user_a1"])))
+
+    assert not [q for q in stats.statements if q.startswith("SELECT") and "FROM cases" in q]  # no row load
+    assert {c.args[:2] for c in removed.await_args_list} == {
+        ("user_a1", "creator"), (case.company_id, "company"), ("user_a2", "assignee"),
+    }
+    assert s["db"].query(CaseDB).filter(CaseDB.id == case.id).first() is None
+
+
+@pytest.mark.asyncio
+async def test_delete_case_raises_404_when_not_found(scenario):  # noqa ANN001
+    """Deleting an unknown case returns 404 without touching OpenFGA."""
+    s = scenario
+    missing = str(uuid.uuid4())
+    with patch("src.api.v1.case.case.delete_tuple", new=AsyncMock()) as removed, \
+            pytest.raises(HTTPException) as exc:
+        await delete_case(missing, s["db"], CaseRequest(missing, _as_user(s["user_a1"])))
+    assert exc.value.status_code == http.HTTPStatus.NOT_FOUND
+    removed.assert_not_awaited()
+
+
+# ─── CaseRequest loader ───────────────────────────────────────────────────────
+
+
+def test_case_request_is_shared_by_permission_check_and_handler():  # noqa ANN001
+    """Within one request the permission dependency and the handler receive the same loader."""
+    app = FastAPI()
+    user = User(username="user_a1", email="user_a1@test.dev", is_admin=False)
+    app.dependency_overrides[get_current_user_from_cookie] = lambda: user
+
+    @app.get("/case/{case_id}")
+    def probe(
+        checked: Annotated[CaseRequest, Depends(require_case_permission("viewer"))],
+        loader: Annotated[CaseRequest, Depends(get_case_request)],
+    ) -> dict:
+        return {"same": checked is loader}
+
+    with patch("src.api.v1.case.case.check_permission", new=AsyncMock(return_value=True)):
+        assert TestClient(app).get("/case/abc").json() == {"same": True}
+    with patch("src.api.v1.case.case.check_permission", new=AsyncMock(return_value=False)):
+        assert TestClient(app).get("/case/abc").status_code == http.HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_case_request_loads_the_row_at_most_once(scenario):  # noqa ANN001
+    """row() queries once and memoizes; existence is a single EXISTS after the permission check."""
+    s = scenario
+    case = CaseRequest(s["case_a1"].id, _as_user(s["user_a1"]))
+    with assert_max_queries(1):
+        assert case.row(s["db"]) is case.row(s["db"])
+
+    checked = CaseRequest(s["case_a1"].id, _as_user(s["user_a1"]))
+    with assert_max_queries(1), patch("src.api.v1.case.case.list_case_documents", return_value=[]):
+        assert await get_case_documents(s["case_a1"].id, s["db"], checked) == []
+        checked.require_exists(s["db"])  # memoized
+
+    # Tuples can outlive the row (deleted case, failed import): OpenFGA allowing access is not enough
+    orphan = CaseRequest(str(uuid.uuid4()), _as_user(s["user_a1"]))
+    with pytest.raises(HTTPException) as exc:
+        orphan.require_exists(s["db"])
+    assert exc.value.status_code == http.HTTPStatus.NOT_FOUND
+
+
 # ─── require_permission dependency ────────────────────────────────────────────
 
 
@@ -0,0 +1,145 @@
+"""Tests for the bulk case update endpoint (POST /case/bulk-update).
+
+Hierarchy:
+  cadmin  (is_admin=True, parent_id=root)
+  ├── alice  (is_admin=False, full_name="Alice A")  ← creates every case
+  └── bob    (is_admin=False, full_name="Bob B")
+"""
+
+import http
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import event
+
+from src.api.v1.case.case import bulk_update
+from src.api.v1.case.models import CaseActivityDB, CaseBulkUpdate, CaseDB, CaseUpdate, db_rebuild_team_companies
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.user.models import User, UserDB
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _allow_all_but(*denied):  # noqa ANN001
+    """Patch filter_by_permission to grant editor on every case except ``denied``."""
+    mock = AsyncMock(side_effect=lambda rows, _user, **_kw: [r for r in rows if r.id not in denied])
+    return patch("src.api.v1.case.bulk.filter_by_permission", new=mock)
+
+
+@pytest.fixture
+def scenario(db):  # noqa ANN001
+    """Create the team, a company and three cases created by alice."""
+    db.add(UserDB(username="root", email="root@test.dev", password="x", is_admin=True))
+    db.flush()
+    db.add(UserDB(username="cadmin", email="cadmin@test.dev", password="x", is_admin=True, parent_id="root"))
+    db.flush()
+    for name in ("alice", "bob"):
+        db.add(UserDB(username=name, email=f"{name}@test.dev", full_name=f"{name.title()} {name[0].upper()}",
+                      password="x", is_admin=False, parent_id="cadmin"))
+    company_id = str(uuid.uuid4())
+    db.add(CompanyDB(id=company_id, name="Co", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    cases = []
+    for customer, status in (("Acme", "open"), ("Acme", "open"), ("Globex", "pending")):
+        cid = str(uuid.uuid4())
+        db.add(CaseDB(id=cid, responsible_person="Alice A", responsible_user_id="alice", status=status,
+                      customer=customer, company_id=company_id, created_at=datetime.now(timezone.utc),
+                      user_id="alice"))
+        cases.append(cid)
+    db.flush()
+    db_rebuild_team_companies(db)
+    return {
+        "db": db,
+        "cases": cases,
+        "admin": User(username="cadmin", email="cadmin@test.dev", is_admin=True, parent_id="root"),
+        "alice": User(username="alice", email="alice@test.dev", is_admin=False, parent_id="cadmin"),
+    }
+
+
+# ─── CaseBulkUpdate ───────────────────────────────────────────────────────────
+
+
+def test_bulk_body_requires_exactly_one_target():  # noqa ANN001
+    """Either case_ids or filters must be given, not both and not neither."""
+    with pytest.raises(ValidationError):
+        CaseBulkUpdate(changes=CaseUpdate(archived=True))
+    with pytest.raises(ValidationError):
+        CaseBulkUpdate(case_ids=["a"], filters={"status": "open"}, changes=CaseUpdate(archived=True))
+
+
+# ─── bulk_update ──────────────────────────────────────────────────────────────
+
+
+async def test_bulk_archive_by_ids_single_transaction(scenario):  # noqa ANN001
+    """Allowed cases are archived in one commit; missing and forbidden IDs are reported."""
+    s = scenario
+    c1, c2, c3 = s["cases"]
+    missing = str(uuid.uuid4())
+    commits = []
+    event.listen(s["db"], "after_commit", lambda _session: commits.append(1))
+    body = CaseBulkUpdate(case_ids=[c1, c2, c3, missing], changes=CaseUpdate(archived=True))
+
+    with _allow_all_but(c3):
+        result = await bulk_update(body, s["db"], s["alice"])
+
+    assert sorted(result.updated) == sorted([c1, c2])
+    assert result.forbidden == [c3]
+    assert result.not_found == [missing]
+    assert len(commits) == 1
+    archived = {r.id for r in s["db"].query(CaseDB).filter(CaseDB.archived.is_(True))}
+    assert archived == {c1, c2}
+    assert s["db"].query(CaseActivityDB).filter(CaseActivityDB.action == "case_archived").count() == 2
+
+
+async def test_bulk_update_by_filter(scenario):  # noqa ANN001
+    """Filters select from the caller's visible cases, like GET /case/."""
+    s = scenario
+    body = CaseBulkUpdate(filters={"status": "pending"}, changes=CaseUpdate(status="closed"))
+
+    with _allow_all_but():
+        result = await bulk_update(body, s["db"], s["alice"])
+
+    assert result.updated == [s["cases"][2]]
+    row = s["db"].query(CaseActivityDB).filter(CaseActivityDB.case_id == s["cases"][2]).one()
+    assert row.detail == "pending → closed"
+
+
+async def test_bulk_reassign_batches_assignee_tuples(scenario):  # noqa ANN001
+    """Reassigning updates responsible_user_id and swaps assignee tuples in two batched calls."""
+    s = scenario
+    body = CaseBulkUpdate(case_ids=s["cases"], changes=CaseUpdate(responsible_person="Bob B"))
+
+    with _allow_all_but(), \
+            patch("src.api.v1.case.bulk.delete_tuples", new=AsyncMock()) as deletes, \
+            patch("src.api.v1.case.bulk.write_tuples", new=AsyncMock()) as writes:
+        result = await bulk_update(body, s["db"], s["admin"])
+
+    assert sorted(result.updated) == sorted(s["cases"])
+    assert {r.responsible_user_id for r in s["db"].query(CaseDB)} == {"bob"}
+    assert sorted(t[3] for t in deletes.await_args.args[0]) == sorted(s["cases"])
+    assert {t[0] for t in writes.await_args.args[0]} == {"bob"}
+
+
+async def test_bulk_update_rejects_invalid_changes(scenario):  # noqa ANN001
+    """Unknown customers are reported per case; non-admins cannot reassign at all."""
+    s = scenario
+    c1, _, c3 = s["cases"]
+    body = CaseBulkUpdate(case_ids=[c1, c3], changes=CaseUpdate(customer="Globex"))
+    with _allow_all_but():
+        result = await bulk_update(body, s["db"], s["alice"])
+    assert sorted(result.updated) == sorted([c1, c3])
+
+    body = CaseBulkUpdate(case_ids=[c1], changes=CaseUpdate(customer="Nobody Inc"))
+    with _allow_all_but():
+        result = await bulk_update(body, s["db"], s["alice"])
+    assert result.updated == []
+    assert "does not exist" in result.invalid[c1]
+
+    body = CaseBulkUpdate(case_ids=[c1], changes=CaseUpdate(responsible_person="Bob B"))
+    with pytest.raises(HTTPException) as exc:
+        await bulk_update(body, s["db"], s["alice"])
+    assert exc.value.status_code == http.HTTPStatus.FORBIDDEN
@@ -0,0 +1,164 @@
+"""Tests for the case server-sent events stream and its in-process broker."""
+
+import asyncio
+import http
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.api.v1.case.case import CaseRequest, _case_event_stream, stream_case_events
+from src.api.v1.case.events import (
+    NOTIFY_MAX_BYTES,
+    CaseEventBroker,
+    _Listener,
+    broker,
+    notify,
+    publish_case_event,
+    publish_case_events,
+)
+from src.api.v1.case.models import CaseDB, CaseUpdate, db_log_activities, db_log_activity, db_update_case
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.user.models import User, UserDB
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+class _ConnectedRequest:
+    """Stand-in for a Starlette request whose client never disconnects."""
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+@pytest.fixture
+def case_id(db):  # noqa ANN001
+    """Insert a user, company and case; return the case ID."""
+    db.add(UserDB(username="owner", email="owner@test.dev", password="x", is_admin=False))
+    company_id = str(uuid.uuid4())
+    db.add(CompanyDB(id=company_id, name="Co", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    cid = str(uuid.uuid4())
+    db.add(CaseDB(
+        id=cid, responsible_person="T", status="open", customer="C",
+        company_id=company_id, created_at=datetime.now(timezone.utc), user_id="owner",
+    ))
+    db.flush()
+    return cid
+
+
+# ─── CaseEventBroker ──────────────────────────────────────────────────────────
+
+
+async def test_broker_delivers_only_to_subscribers_of_the_case():  # noqa ANN001
+    """A dispatched event reaches subscribers of its case and nobody else."""
+    local = CaseEventBroker()
+    async with local.subscribe("a") as queue_a, local.subscribe("b") as queue_b:
+        local.dispatch({"case_id": "a", "kind": "activity", "data": {}})
+        event = await asyncio.wait_for(queue_a.get(), timeout=1)
+        await asyncio.sleep(0)
+        assert event["kind"] == "activity"
+        assert queue_b.empty()
+    assert local._subscribers == {}
+
+
+# ─── publish_case_event ───────────────────────────────────────────────────────
+
+
+async def test_activity_is_published_after_commit(db, case_id):  # noqa ANN001
+    """db_log_activity and db_update_case push events once their transaction commits."""
+    async with broker.subscribe(case_id) as queue:
+        db_log_activity(db, case_id, "owner", "commented", "hello")
+        db_update_case(db, case_id, CaseUpdate(status="closed"))
+        activity = await asyncio.wait_for(queue.get(), timeout=1)
+        case = await asyncio.wait_for(queue.get(), timeout=1)
+    assert activity["data"]["detail"] == "hello"
+    assert case["kind"] == "case"
+    assert case["data"]["status"] == "closed"
+
+
+async def test_rolled_back_events_are_discarded(test_engine):  # noqa ANN001
+    """Events published in a transaction that rolls back are never delivered."""
+    case_id = str(uuid.uuid4())
+    async with broker.subscribe(case_id) as queue:
+        with Session(test_engine) as session:
+            session.execute(text("SELECT 1"))
+            publish_case_event(session, case_id, "activity", {"id": "x"})
+            session.rollback()
+            session.commit()
+        await asyncio.sleep(0)
+        assert queue.empty()
+
+
+async def test_oversized_payloads_never_reach_pg_notify(db, case_id):  # noqa ANN001
+    """Case events too large for a notification go out as ``stale``; other oversized payloads are refused."""
+    async with broker.subscribe(case_id) as queue:
+        publish_case_event(db, case_id, "case", {"description": "x" * NOTIFY_MAX_BYTES})
+        db.commit()
+        event = await asyncio.wait_for(queue.get(), timeout=1)
+    assert event["kind"] == "stale"
+    assert event["data"] == {"id": case_id, "kind": "case"}
+
+    with pytest.raises(ValueError, match="limit"):
+        notify(db, "kanapi_other", {"blob": "x" * NOTIFY_MAX_BYTES})
+
+
+def test_bulk_events_use_one_pg_notify_statement(db, case_id):  # noqa ANN001
+    """Many events go out in one statement on Postgres; db_log_activities publishes a batch in one call."""
+    pg = MagicMock()
+    pg.get_bind.return_value.dialect.name = "postgresql"
+    publish_case_events(pg, [(case_id, "activity", {"n": i}) for i in range(3)])
+    assert pg.execute.call_count == 1
+    params = pg.execute.call_args.args[1]
+    assert [json.loads(p)["data"] for p in params["payloads"]] == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    with patch("src.api.v1.case.models.publish_case_events") as publish:
+        db_log_activities(db, [(case_id, "owner", "commented", str(i)) for i in range(5)])
+    assert publish.call_count == 1
+    assert len(list(publish.call_args.args[1])) == 5
+
+
+def test_listener_reconnects_after_any_error():  # noqa ANN001
+    """An unexpected exception in the LISTEN loop is logged and the listener connects again."""
+    listener = _Listener()
+    attempts = []
+
+    def listen():  # noqa ANN202
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("bug")
+        listener._stop.set()
+
+    with patch.object(listener, "_listen", side_effect=listen), patch.object(listener._stop, "wait"):
+        listener.run()
+    assert len(attempts) == 2
+
+
+# ─── stream_case_events ───────────────────────────────────────────────────────
+
+
+async def test_stream_formats_events_and_stops_after_delete(case_id):  # noqa ANN001
+    """The stream sends a retry hint, SSE-framed events, and ends after a delete."""
+    stream = _case_event_stream(case_id, _ConnectedRequest())
+    assert (await stream.__anext__()).startswith("retry:")
+    pending = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    broker.dispatch({"case_id": case_id, "kind": "deleted", "data": {"id": case_id}})
+    frame = await asyncio.wait_for(pending, timeout=1)
+    assert frame == f"event: deleted\ndata: {json.dumps({'id': case_id})}\n\n"
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+
+async def test_stream_endpoint_404_for_missing_case(db):  # noqa ANN001
+    """Subscribing to a case that does not exist returns 404 before streaming starts."""
+    user = User(username="owner", email="owner@test.dev", is_admin=False)
+    case_id = str(uuid.uuid4())
+    with pytest.raises(HTTPException) as exc:
+        await stream_case_events(case_id, _ConnectedRequest(), db, CaseRequest(case_id, user))
+    assert exc.value.status_code == http.HTTPStatus.NOT_FOUND
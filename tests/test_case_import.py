@@ -0,0 +1,164 @@
+"""Tests for bulk case import — parsing, validation, batched ingestion and the endpoint guards."""
+
+import http
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from src.api.v1.case import bulk
+from src.api.v1.case.bulk import import_cases_stream, iter_import_rows, validate_import_row
+from src.api.v1.case.case import import_cases
+from src.api.v1.case.models import CaseActivityDB, CaseDB
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.user.models import User, UserDB
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _row(company_id, **overrides):  # noqa ANN001
+    """Return a valid import row for the company."""
+    return {"responsible_person": "Alice", "status": "open", "customer": "Acme", "company_id": company_id,
+            **overrides}
+
+
+def _ndjson(*rows):  # noqa ANN001
+    """Encode rows as an NDJSON byte stream."""
+    return io.BytesIO("".join(json.dumps(r) + "\n" for r in rows).encode())
+
+
+async def _collect(db, rows, user):  # noqa ANN001
+    """Run an import and return the decoded report lines."""
+    return [json.loads(line) async for line in import_cases_stream(db, rows, user)]
+
+
+@pytest.fixture
+def scenario(db):  # noqa ANN001
+    """Insert an admin importer and one existing company."""
+    db.add(UserDB(username="importer", email="importer@test.dev", password="x", is_admin=True))
+    company_id = str(uuid.uuid4())
+    db.add(CompanyDB(id=company_id, name="Client Co", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    return {"db": db, "company_id": company_id, "user": User(username="importer", email="i@test.dev", is_admin=True)}
+
+
+# ─── Parsing and validation ───────────────────────────────────────────────────
+
+
+def test_iter_import_rows_parses_csv_and_ndjson():  # noqa ANN001
+    """CSV rows are keyed by header (empty cells become None); bad NDJSON lines are reported, not raised."""
+    csv_rows = list(iter_import_rows(io.BytesIO(b"customer,status,responsible_user_id\nAcme,open,\n"), "csv"))
+    assert csv_rows == [(2, {"customer": "Acme", "status": "open", "responsible_user_id": None}, None)]
+
+    ndjson_rows = list(iter_import_rows(io.BytesIO(b'{"customer": "Acme"}\n\nnot json\n[1]\n'), "ndjson"))
+    assert ndjson_rows[0] == (1, {"customer": "Acme"}, None)
+    assert ndjson_rows[1][0] == 3
+    assert ndjson_rows[1][2] == "Invalid JSON."
+    assert ndjson_rows[2][2] == "Each line must be a JSON object."
+
+
+def test_validate_import_row_applies_case_create_rules():  # noqa ANN001
+    """Rows go through CaseCreate validation plus the create endpoint's required-field checks."""
+    assert validate_import_row(_row("c1", customer="<b>Acme</b>")).customer == "Acme"
+    with pytest.raises(ValueError, match="status"):
+        validate_import_row(_row("c1", status="bogus"))
+    with pytest.raises(ValueError, match="Customer is required"):
+        validate_import_row(_row("c1", customer=""))
+
+
+# ─── import_cases_stream ──────────────────────────────────────────────────────
+
+
+async def test_import_inserts_valid_rows_in_batches(scenario, monkeypatch):  # noqa ANN001
+    """Valid rows are inserted with activities and tuples per batch; invalid rows are reported."""
+    s = scenario
+    monkeypatch.setattr(bulk, "IMPORT_BATCH_SIZE", 2)
+    rows = iter_import_rows(_ndjson(
+        _row(s["company_id"]),
+        _row(s["company_id"], status="bogus"),
+        _row(s["company_id"], customer="Globex"),
+        _row(str(uuid.uuid4())),
+        _row(s["company_id"], customer="Initech"),
+    ), "ndjson")
+
+    with patch("src.api.v1.case.bulk.write_tuples", new=AsyncMock()) as writes, \
+            patch("src.api.v1.case.bulk.write_tuple_safe", new=AsyncMock()) as safe:
+        report = await _collect(s["db"], rows, s["user"])
+
+    assert report[-1] == {"done": True, "imported": 3, "failed": 2}
+    assert {r["row"] for r in report if "error" in r} == {2, 4}
+    assert {"imported": 2, "failed": 1} in report
+    cases = s["db"].query(CaseDB).filter(CaseDB.company_id == s["company_id"]).all()
+    assert sorted(c.customer for c in cases) == ["Acme", "Globex", "Initech"]
+    assert s["db"].query(CaseActivityDB).filter(CaseActivityDB.action == "case_created").count() == 3
+    assert writes.await_count == 2
+    assert sum(len(call.args[0]) for call in writes.await_args_list) == 6
+    safe.assert_awaited_once_with("importer", "member", "company", s["company_id"])
+
+
+async def test_import_removes_batch_when_fga_write_fails(scenario):  # noqa ANN001
+    """Cases whose tuples could not be written are deleted again and counted as failed."""
+    s = scenario
+    rows = iter_import_rows(_ndjson(_row(s["company_id"]), _row(s["company_id"])), "ndjson")
+
+    with patch("src.api.v1.case.bulk.write_tuples", new=AsyncMock(side_effect=RuntimeError("down"))):
+        report = await _collect(s["db"], rows, s["user"])
+
+    assert report[-1] == {"done": True, "imported": 0, "failed": 2}
+    assert s["db"].query(CaseDB).filter(CaseDB.company_id == s["company_id"]).count() == 0
+
+
+async def test_failed_import_removes_the_tuples_already_written(scenario, monkeypatch):  # noqa ANN001
+    """When a later chunk fails, the chunks written before it are deleted again; unwritten ones are not."""
+    s = scenario
+    monkeypatch.setattr(bulk, "FGA_WRITE_CHUNK_SIZE", 2)
+    rows = iter_import_rows(_ndjson(_row(s["company_id"]), _row(s["company_id"])), "ndjson")
+
+    writes = AsyncMock(side_effect=[None, RuntimeError("down")])
+    with patch("src.api.v1.case.bulk.write_tuples", new=writes), \
+            patch("src.api.v1.case.bulk.delete_tuples", new=AsyncMock()) as deletes:
+        report = await _collect(s["db"], rows, s["user"])
+
+    assert report[-1] == {"done": True, "imported": 0, "failed": 2}
+    deletes.assert_awaited_once_with(writes.await_args_list[0].args[0])
+    assert s["db"].query(CaseDB).filter(CaseDB.company_id == s["company_id"]).count() == 0
+
+
+async def test_non_utf8_upload_is_reported_and_the_import_finishes(scenario, monkeypatch):  # noqa ANN001
+    """Undecodable bytes end the file with an error row; earlier batches stay imported and ``done`` is still sent."""
+    s = scenario
+    monkeypatch.setattr(bulk, "IMPORT_BATCH_SIZE", 1)
+    good = json.dumps(_row(s["company_id"])).encode() + b"\n"
+    upload = io.BytesIO(good * 400 + '{"customer": "Caf\u00e9"}\n'.encode("latin-1"))  # past the first read chunk
+    rows = iter_import_rows(io.BufferedReader(upload, buffer_size=1024), "ndjson")
+
+    with patch("src.api.v1.case.bulk.write_tuples", new=AsyncMock()), \
+            patch("src.api.v1.case.bulk.write_tuple_safe", new=AsyncMock()):
+        report = await _collect(s["db"], rows, s["user"])
+
+    errors = [r for r in report if "error" in r]
+    assert len(errors) == 1
+    assert "UTF-8" in errors[0]["error"]
+    assert report[-1]["done"] is True
+    assert report[-1]["imported"] == s["db"].query(CaseDB).filter(CaseDB.company_id == s["company_id"]).count() > 0
+
+
+# ─── import_cases endpoint ────────────────────────────────────────────────────
+
+
+async def test_import_endpoint_guards(scenario):  # noqa ANN001
+    """Non-admins get 403 and unsupported file types get 400."""
+    s = scenario
+    regular = User(username="regular", email="r@test.dev", is_admin=False)
+    upload = UploadFile(io.BytesIO(b""), filename="cases.csv")
+    with pytest.raises(HTTPException) as exc:
+        await import_cases(upload, s["db"], regular)
+    assert exc.value.status_code == http.HTTPStatus.FORBIDDEN
+
+    with pytest.raises(HTTPException) as exc:
+        await import_cases(UploadFile(io.BytesIO(b""), filename="cases.xlsx"), s["db"], s["user"])
+    assert exc.value.status_code == http.HTTPStatus.BAD_REQUEST
@@ -0,0 +1,127 @@
+"""Tests for the orjson case list path — row encoding, sparse fieldsets and the list endpoints that use them."""
+
+import http
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import NamedTuple
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event
+
+from src.api.v1.case.models import CASE_LIST_COLUMNS, CASE_LIST_DEFAULTS, CASE_LIST_FIELDS, Case, CaseDB, case_from_row
+from src.api.v1.company.company import get_company_cases, get_my_company_cases
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.serialization import dumps_rows, select_fields
+from src.api.v1.user.models import User, UserDB
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+_NO_FILTERS = {"q": None, "status": None, "archived": None, "fields": None}
+
+
+class _Stamp(NamedTuple):
+    """Row stand-in: dumps_rows only needs ``_asdict``."""
+
+    created_at: datetime
+
+
+@pytest.fixture
+def scenario(db):  # noqa ANN001
+    """Create a company admin, one sub-user and two cases (one archived) in one company."""
+    db.add(UserDB(username="root", email="root@test.dev", password="x", is_admin=True))
+    db.flush()
+    db.add(UserDB(username="cadmin", email="cadmin@test.dev", password="x", is_admin=True, parent_id="root"))
+    db.flush()
+    db.add(UserDB(username="sub", email="sub@test.dev", password="x", is_admin=False, parent_id="cadmin"))
+    company_id = str(uuid.uuid4())
+    db.add(CompanyDB(id=company_id, name="Co", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    for customer, archived in (("Acme", False), ("Globex", True)):
+        db.add(CaseDB(id=str(uuid.uuid4()), responsible_person="Sub", responsible_user_id="sub", status="open",
+                      customer=customer, archived=archived, company_id=company_id,
+                      created_at=datetime.now(timezone.utc), user_id="sub"))
+    db.flush()
+    return {"db": db, "company_id": company_id}
+
+
+# ─── dumps_rows ───────────────────────────────────────────────────────────────
+
+
+def test_dumps_rows_matches_pydantic_output(scenario):  # noqa ANN001
+    """Column rows encode to the same JSON as the Case models, including defaults and UTC 'Z' datetimes."""
+    db = scenario["db"]
+    rows = db.query(CaseDB).with_entities(*CASE_LIST_COLUMNS).order_by(CaseDB.customer).all()
+    expected = TypeAdapter(list[Case]).dump_python(
+        [case_from_row(c) for c in db.query(CaseDB).order_by(CaseDB.customer).all()], mode="json",
+    )
+    assert json.loads(dumps_rows(rows, CASE_LIST_DEFAULTS)) == expected
+
+    aware = _Stamp(created_at=datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+    assert json.loads(dumps_rows([aware])) == [{"created_at": "2026-01-02T03:04:05Z"}]
+
+
+# ─── select_fields ────────────────────────────────────────────────────────────
+
+
+def test_select_fields_orders_and_validates():  # noqa ANN001
+    """Selections follow the allowed order, always include the identifier and reject unknown names."""
+    assert select_fields(None, CASE_LIST_FIELDS) == CASE_LIST_FIELDS
+    assert select_fields("customer, status", CASE_LIST_FIELDS, always=("id",)) == ("id", "status", "customer")
+    with pytest.raises(HTTPException) as exc:
+        select_fields("status,owner", CASE_LIST_FIELDS)
+    assert exc.value.status_code == http.HTTPStatus.BAD_REQUEST
+    assert "owner" in exc.value.detail
+
+
+# ─── List endpoints ───────────────────────────────────────────────────────────
+
+
+async def test_my_company_cases_returns_raw_json_response(scenario):  # noqa ANN001
+    """The company admin list is a pre-encoded Response carrying every Case field."""
+    admin = User(username="cadmin", email="cadmin@test.dev", is_admin=True, parent_id="root")
+    response = await get_my_company_cases(admin, scenario["db"], **_NO_FILTERS)
+
+    assert isinstance(response, Response)
+    assert response.media_type == "application/json"
+    records = json.loads(response.body)
+    assert {r["customer"]: r["archived"] for r in records} == {"Acme": False, "Globex": True}
+    assert all(r["responsible_user_id"] == "sub" and r["deleted"] is False for r in records)
+
+
+async def test_company_cases_filters_rows_by_permission(scenario):  # noqa ANN001
+    """Non-super-admins get only the rows FGA allows; filtering runs on the column rows."""
+    s = scenario
+    user = User(username="sub", email="sub@test.dev", is_admin=False, parent_id="cadmin")
+    deny_globex = AsyncMock(side_effect=lambda rows, _user: [r for r in rows if r.customer != "Globex"])
+
+    with patch("src.api.v1.company.company.filter_by_permission", new=deny_globex):
+        response = await get_company_cases(s["company_id"], user, s["db"], **_NO_FILTERS)
+
+    assert [r["customer"] for r in json.loads(response.body)] == ["Acme"]
+
+
+async def test_sparse_fieldset_narrows_the_select(scenario):  # noqa ANN001
+    """``fields`` is applied in SQL: only the requested columns are selected and returned."""
+    admin = User(username="cadmin", email="cadmin@test.dev", is_admin=True, parent_id="root")
+    statements = []
+    engine = scenario["db"].get_bind().engine
+
+    def listener(_conn, _cursor, statement, *_args):  # noqa ANN001
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = await get_my_company_cases(admin, scenario["db"], **{**_NO_FILTERS, "fields": "status,deleted"})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    records = json.loads(response.body)
+    assert all(r.keys() == {"id", "status", "deleted"} for r in records)
+    case_select = next(s for s in statements if "FROM cases" in s)
+    assert "cases.customer" not in case_select
+    assert "cases.status" in case_select
@@ -0,0 +1,118 @@
+"""Tests for optimistic concurrency on case updates — the version column, If-Match and the conditional UPDATE."""
+
+import http
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, inspect, text
+
+from src.api.db.database import Base, _add_missing_columns
+from src.api.v1.case.bulk import _apply_bulk_update
+from src.api.v1.case.case import CaseRequest, _case_etag, update_case
+from src.api.v1.case.models import CaseDB, CaseUnitOfWork, CaseUpdate
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.user.models import User, UserDB
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _version(db, case_id):  # noqa ANN001
+    """Read the stored version straight from the table."""
+    return db.query(CaseDB.version).filter(CaseDB.id == case_id).scalar()
+
+
+@pytest.fixture
+def scenario(db):  # noqa ANN001
+    """Create one user, one company and one open case at version 1."""
+    db.add(UserDB(username="editor", email="editor@test.dev", password="x", is_admin=False))
+    company_id = str(uuid.uuid4())
+    db.add(CompanyDB(id=company_id, name="Co", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    case_id = str(uuid.uuid4())
+    db.add(CaseDB(id=case_id, responsible_person="T", status="open", customer="Acme", company_id=company_id,
+                  created_at=datetime.now(timezone.utc), user_id="editor"))
+    db.flush()
+    editor = User(username="editor", email="editor@test.dev", is_admin=False)
+    return {"db": db, "case_id": case_id, "case": CaseRequest(case_id, editor)}
+
+
+# ─── PATCH /case/{id} ─────────────────────────────────────────────────────────
+
+
+async def test_update_bumps_version_and_rejects_stale_body_version(scenario):  # noqa ANN001
+    """Each update increments the version; a body version that is no longer current gets 409."""
+    s = scenario
+    result = await update_case(s["case_id"], CaseUpdate(status="pending", version=1), s["db"], s["case"])
+    assert result.version == 2
+
+    with pytest.raises(HTTPException) as exc:
+        await update_case(s["case_id"], CaseUpdate(status="closed", version=1), s["db"], s["case"])
+    assert exc.value.status_code == http.HTTPStatus.CONFLICT
+    assert s["db"].query(CaseDB.status).filter(CaseDB.id == s["case_id"]).scalar() == "pending"
+
+
+async def test_if_match_accepts_current_etag_only(scenario):  # noqa ANN001
+    """If-Match with the ETag from GET succeeds once; replaying it after the change gets 409."""
+    s = scenario
+    etag = _case_etag(s["db"].query(CaseDB).filter(CaseDB.id == s["case_id"]).one())
+
+    await update_case(s["case_id"], CaseUpdate(status="closed"), s["db"], s["case"], if_match=etag)
+    with pytest.raises(HTTPException) as exc:
+        await update_case(s["case_id"], CaseUpdate(status="open"), s["db"], s["case"], if_match=etag)
+    assert exc.value.status_code == http.HTTPStatus.CONFLICT
+
+    await update_case(s["case_id"], CaseUpdate(status="open"), s["db"], s["case"], if_match="*")
+    assert _version(s["db"], s["case_id"]) == 3
+
+
+async def test_concurrent_write_between_read_and_update_gets_409(scenario):  # noqa ANN001
+    """A write landing after the handler read the case is detected by the conditional UPDATE, not overwritten."""
+    s = scenario
+
+    def concurrent_edit(db, *_args):  # noqa ANN001
+        # Another worker's write: it does not touch the objects in this session
+        db.query(CaseDB).filter(CaseDB.id == s["case_id"]).update(
+            {"status": "closed", "version": CaseDB.version + 1}, synchronize_session=False,
+        )
+
+    with patch("src.api.v1.case.case._validate_update_fields", side_effect=concurrent_edit), \
+            pytest.raises(HTTPException) as exc:
+        await update_case(s["case_id"], CaseUpdate(status="pending"), s["db"], s["case"])
+
+    assert exc.value.status_code == http.HTTPStatus.CONFLICT
+    assert s["db"].query(CaseDB.status).filter(CaseDB.id == s["case_id"]).scalar() == "closed"
+
+
+# ─── Other write paths ────────────────────────────────────────────────────────
+
+
+def test_unit_of_work_and_bulk_update_bump_version(scenario):  # noqa ANN001
+    """Unconditional unit-of-work updates and bulk updates also advance the version."""
+    s = scenario
+    uow = CaseUnitOfWork(s["db"])
+    assert uow.update_case(s["case_id"], CaseUpdate(status="pending"), expected_version=2) is None
+    uow.update_case(s["case_id"], CaseUpdate(status="pending"))
+    assert uow.commit().version == 2
+
+    rows = s["db"].query(CaseDB.id, CaseDB.customer, CaseDB.status, CaseDB.responsible_person).all()
+    _apply_bulk_update(s["db"], rows, {"archived": True}, {}, "editor")
+    assert _version(s["db"], s["case_id"]) == 3
+
+
+def test_create_tables_adds_version_to_existing_cases():  # noqa ANN001
+    """Upgrading a database without the column adds it with existing cases at version 1."""
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE cases DROP COLUMN version"))
+        conn.execute(text("INSERT INTO cases (id, responsible_person, status, customer, archived, created_at, "
+                          "user_id, company_id) VALUES ('c1', 'T', 'open', 'Acme', 0, '2026-01-01', 'u', 'co')"))
+
+    _add_missing_columns(engine)
+
+    assert "version" in {c["name"] for c in inspect(engine).get_columns("cases")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version FROM cases")).scalar() == 1
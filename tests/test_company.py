@@ -11,22 +11,32 @@ Hierarchy used across all tests:
 """
 
 import http
+import json
 import uuid
 from datetime import datetime, timezone
+from unittest.mock import patch
 
 import pytest
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
+from starlette.requests import Request
 
+from src.api.db.query_stats import assert_max_queries
+from src.api.v1.case.events import _deliver
 from src.api.v1.case.models import CaseDB
-from src.api.v1.company.company import _require_company_admin, _require_super_admin
+from src.api.v1.company.company import _require_company_admin, _require_super_admin, get_companies, get_company
 from src.api.v1.company.models import (
+    COMPANY_CHANNEL,
     CompanyCreate,
     CompanyDB,
+    company_tree_cache,
     db_create_company,
     db_delete_company,
     db_get_client_companies,
     db_get_companies,
     db_get_company,
+    db_get_company_directory,
+    db_get_company_subtree_ids,
+    db_get_descendant_companies,
 )
 from src.api.v1.user.models import User, UserDB
 
@@ -214,6 +224,107 @@ def test_get_client_companies_empty_for_leaf(scenario):  # noqa ANN001
     assert clients == []
 
 
+# ─── db_get_company_subtree_ids ───────────────────────────────────────────────
+
+
+def test_subtree_follows_deep_client_chains_in_one_query(scenario):  # noqa ANN001
+    """Clients of clients are included at any depth, with one recursive query and none once cached."""
+    s = scenario
+    grandchild = _make_company(s["db"], name="Grandchild", owner_id=s["client_a_id"])
+    great_grandchild = _make_company(s["db"], name="Great Grandchild", owner_id=grandchild)
+    company_tree_cache.clear()
+
+    with assert_max_queries(1):
+        subtree = db_get_company_subtree_ids(s["db"], s["owner_co_id"])
+    with assert_max_queries(0):
+        assert db_get_company_subtree_ids(s["db"], s["owner_co_id"]) == subtree
+
+    assert set(subtree) == {s["owner_co_id"], s["client_a_id"], s["client_b_id"], grandchild, great_grandchild}
+    assert {c.id for c in db_get_descendant_companies(s["db"], s["client_a_id"])} == {grandchild, great_grandchild}
+
+
+def test_subtree_cache_cleared_by_company_create(scenario):  # noqa ANN001
+    """Creating a company clears the cached subtrees so the new client shows up."""
+    s = scenario
+    company_tree_cache.clear()
+    assert db_get_company_subtree_ids(s["db"], s["client_b_id"]) == [s["client_b_id"]]
+
+    new = db_create_company(s["db"], CompanyCreate(name="New Client", owner_id=s["client_b_id"]))
+
+    assert set(db_get_company_subtree_ids(s["db"], s["client_b_id"])) == {s["client_b_id"], new.id}
+
+
+def test_subtree_terminates_on_owner_cycle(scenario):  # noqa ANN001
+    """An owner_id cycle does not make the recursive query loop forever."""
+    s = scenario
+    s["db"].query(CompanyDB).filter(CompanyDB.id == s["owner_co_id"]).update({"owner_id": s["client_a_id"]})
+    company_tree_cache.clear()
+
+    assert set(db_get_company_subtree_ids(s["db"], s["client_a_id"])) == {
+        s["owner_co_id"], s["client_a_id"], s["client_b_id"],
+    }
+
+
+# ─── Company directory cache ──────────────────────────────────────────────────
+
+
+def _request(etag=None):  # noqa ANN001
+    """Build a bare GET request, optionally carrying If-None-Match."""
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+async def test_company_routes_are_served_from_memory(scenario):  # noqa ANN001
+    """After the first load, GET /company/ and GET /company/{id} run no queries and honour If-None-Match."""
+    s = scenario
+    user = _as_user(s["db"], s["regular_user_id"])
+    first = await get_companies(_request(), user, s["db"])
+    assert len(json.loads(first.body)) == 4
+
+    with assert_max_queries(0):
+        unchanged = await get_companies(_request(first.headers["etag"]), user, s["db"])
+        assert unchanged.status_code == http.HTTPStatus.NOT_MODIFIED
+        company = await get_company(s["solo_co_id"], _request(), Response(), user, s["db"])
+        assert company.name == "Solo Co"
+        with pytest.raises(HTTPException) as exc:
+            await get_company(str(uuid.uuid4()), _request(), Response(), user, s["db"])
+    assert exc.value.status_code == http.HTTPStatus.NOT_FOUND
+
+
+async def test_company_events_invalidate_every_cache(scenario):  # noqa ANN001
+    """Create/delete notify COMPANY_CHANNEL; a delivered notification clears the directory and the subtrees."""
+    s = scenario
+    user = _as_user(s["db"], s["regular_user_id"])
+    await get_companies(_request(), user, s["db"])
+    _make_company(s["db"], name="Written Elsewhere")  # bypasses the write path, so no event
+    assert len(json.loads((await get_companies(_request(), user, s["db"])).body)) == 4
+
+    _deliver(COMPANY_CHANNEL, {"kind": "created", "id": "from-another-worker"})
+    assert len(json.loads((await get_companies(_request(), user, s["db"])).body)) == 5
+
+    db_delete_company(s["db"], s["solo_co_id"])
+    assert s["solo_co_id"] not in {c["id"] for c in json.loads((await get_companies(_request(), user, s["db"])).body)}
+    assert db_get_company_directory(s["db"]).by_id.get(s["solo_co_id"]) is None
+
+
+async def test_writes_clear_the_local_caches_without_the_listener(scenario):  # noqa ANN001
+    """The writing worker sees its own create/delete at once, even before its NOTIFY comes back."""
+    s = scenario
+    user = _as_user(s["db"], s["regular_user_id"])
+    await get_companies(_request(), user, s["db"])
+    company_tree_cache.clear()
+    assert db_get_company_subtree_ids(s["db"], s["solo_co_id"]) == [s["solo_co_id"]]
+
+    with patch("src.api.v1.company.models.notify"):  # as on Postgres: delivery only via the listener
+        new = db_create_company(s["db"], CompanyCreate(name="Fresh", owner_id=s["solo_co_id"]))
+        assert new.id in {c["id"] for c in json.loads((await get_companies(_request(), user, s["db"])).body)}
+        assert set(db_get_company_subtree_ids(s["db"], s["solo_co_id"])) == {s["solo_co_id"], new.id}
+
+        db_delete_company(s["db"], new.id)
+        assert new.id not in {c["id"] for c in json.loads((await get_companies(_request(), user, s["db"])).body)}
+        assert db_get_company_subtree_ids(s["db"], s["solo_co_id"]) == [s["solo_co_id"]]
+
+
 # ─── _require_super_admin ─────────────────────────────────────────────────────
 
 
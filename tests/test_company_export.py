@@ -0,0 +1,105 @@
+"""Tests for the streaming company case export (GET /company/{id}/cases/export)."""
+
+import csv
+import io
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.api.v1.case.models import CaseDB
+from src.api.v1.company import company as company_module
+from src.api.v1.company.company import export_company_cases
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.user.models import User, UserDB
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _make_case(db, company_id, customer, archived=False):  # noqa ANN001
+    """Insert a case owned by 'owner' and return its ID."""
+    cid = str(uuid.uuid4())
+    db.add(CaseDB(
+        id=cid, responsible_person="T", status="open", customer=customer, archived=archived,
+        company_id=company_id, created_at=datetime.now(timezone.utc), user_id="owner",
+    ))
+    db.flush()
+    return cid
+
+
+async def _body(response):  # noqa ANN001
+    """Drain a StreamingResponse and return its chunks."""
+    return [chunk async for chunk in response.body_iterator]
+
+
+@pytest.fixture
+def scenario(db):  # noqa ANN001
+    """Create an owner company with one client company and cases in both."""
+    db.add(UserDB(username="owner", email="owner@test.dev", password="x", is_admin=False))
+    owner_co = str(uuid.uuid4())
+    client_co = str(uuid.uuid4())
+    db.add(CompanyDB(id=owner_co, name="Owner", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    db.add(CompanyDB(id=client_co, name="Client", owner_id=owner_co, created_at=datetime.now(timezone.utc)))
+    db.flush()
+    cases = [
+        _make_case(db, owner_co, "Acme"),
+        _make_case(db, owner_co, "Globex", archived=True),
+        _make_case(db, client_co, "Initech"),
+    ]
+    return {"db": db, "owner_co": owner_co, "cases": cases}
+
+
+# ─── export_company_cases ─────────────────────────────────────────────────────
+
+
+async def test_export_ndjson_includes_client_companies_for_super_admin(scenario):  # noqa ANN001
+    """A super admin's NDJSON export covers client-company cases, one JSON object per line."""
+    s = scenario
+    super_admin = User(username="root", email="root@test.dev", is_admin=True)
+    response = await export_company_cases(s["owner_co"], super_admin, s["db"])
+
+    lines = "".join(await _body(response)).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert response.media_type == "application/x-ndjson"
+    assert sorted(r["customer"] for r in records) == ["Acme", "Globex", "Initech"]
+    assert next(r for r in records if r["customer"] == "Globex")["archived"] is True
+
+
+async def test_export_csv_has_header_and_applies_filters(scenario):  # noqa ANN001
+    """CSV export starts with a header row and honours the case filters."""
+    s = scenario
+    super_admin = User(username="root", email="root@test.dev", is_admin=True)
+    response = await export_company_cases(s["owner_co"], super_admin, s["db"], fmt="csv", archived=False)
+
+    rows = list(csv.DictReader(io.StringIO("".join(await _body(response)))))
+    assert response.media_type == "text/csv"
+    assert sorted(r["customer"] for r in rows) == ["Acme", "Initech"]
+    assert rows[0].keys() == set(company_module.EXPORT_FIELDS)
+
+
+async def test_export_filters_each_chunk_by_permission(scenario, monkeypatch):  # noqa ANN001
+    """Non-super-admins only get their own company's cases, FGA-checked one chunk at a time."""
+    s = scenario
+    monkeypatch.setattr(company_module, "EXPORT_CHUNK_SIZE", 1)
+    user = User(username="owner", email="owner@test.dev", is_admin=False)
+    deny_globex = AsyncMock(side_effect=lambda cases, _user: [c for c in cases if c.customer != "Globex"])
+
+    with patch("src.api.v1.company.company.filter_by_permission", new=deny_globex):
+        response = await export_company_cases(s["owner_co"], user, s["db"])
+        records = [json.loads(line) for line in "".join(await _body(response)).splitlines()]
+
+    assert [r["customer"] for r in records] == ["Acme"]
+    assert deny_globex.await_count == 2  # one call per single-row chunk
+
+
+async def test_export_filename_cannot_inject_header_parameters(scenario):  # noqa ANN001
+    """The path company_id is percent-encoded into filename*, so quotes and semicolons stay inside the value."""
+    s = scenario
+    super_admin = User(username="root", email="root@test.dev", is_admin=True)
+    response = await export_company_cases('x"; filename="evil.exe', super_admin, s["db"])
+    assert response.headers["content-disposition"] == (
+        "attachment; filename*=UTF-8''cases-x%22%3B%20filename%3D%22evil.exe.ndjson"
+    )
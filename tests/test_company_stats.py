@@ -0,0 +1,112 @@
+"""Tests for the company dashboard aggregates (GET /company/{id}/stats) and their cache."""
+
+import http
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.v1.cache import TTLCache
+from src.api.v1.case.events import broker
+from src.api.v1.case.models import CaseDB, db_delete_case
+from src.api.v1.company.company import get_company_stats
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.company.stats import StatCount, db_get_company_stats, stats_cache
+from src.api.v1.user.models import User, UserDB
+
+SUPER_ADMIN = User(username="root", email="root@test.dev", is_admin=True)
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _make_case(db, company_id, *, status="open", customer="Acme", archived=False, responsible=None):  # noqa ANN001
+    """Insert a case owned by 'owner' and return its ID."""
+    cid = str(uuid.uuid4())
+    db.add(CaseDB(
+        id=cid, responsible_person="T", responsible_user_id=responsible, status=status, customer=customer,
+        archived=archived, company_id=company_id, created_at=datetime.now(timezone.utc), user_id="owner",
+    ))
+    db.flush()
+    return cid
+
+
+@pytest.fixture
+def scenario(db):  # noqa ANN001
+    """Create an owner company with one client company, four cases and an empty stats cache."""
+    stats_cache.clear()
+    db.add(UserDB(username="owner", email="owner@test.dev", password="x", is_admin=False))
+    owner_co = str(uuid.uuid4())
+    client_co = str(uuid.uuid4())
+    db.add(CompanyDB(id=owner_co, name="Owner", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    db.add(CompanyDB(id=client_co, name="Client", owner_id=owner_co, created_at=datetime.now(timezone.utc)))
+    db.flush()
+    cases = [
+        _make_case(db, owner_co, responsible="owner"),
+        _make_case(db, owner_co, status="closed", archived=True, responsible="owner"),
+        _make_case(db, owner_co, customer="Globex"),
+        _make_case(db, client_co, status="pending", customer="Initech"),
+    ]
+    return {"db": db, "owner_co": owner_co, "client_co": client_co, "cases": cases}
+
+
+# ─── db_get_company_stats ─────────────────────────────────────────────────────
+
+
+def test_stats_group_by_each_dimension(scenario):  # noqa ANN001
+    """Counts are grouped per dimension, largest group first, with None for unassigned cases."""
+    stats = db_get_company_stats(scenario["db"], [scenario["owner_co"]])
+
+    assert (stats.total, stats.active, stats.archived) == (3, 2, 1)
+    assert stats.by_status == [StatCount(value="open", count=2), StatCount(value="closed", count=1)]
+    assert stats.by_customer == [StatCount(value="Acme", count=2), StatCount(value="Globex", count=1)]
+    assert {s.value: s.count for s in stats.by_responsible_user} == {"owner": 2, None: 1}
+
+
+# ─── get_company_stats ────────────────────────────────────────────────────────
+
+
+async def test_stats_scope_and_access(scenario):  # noqa ANN001
+    """Super admins include client companies; other users need a company relation or get 403."""
+    s = scenario
+    stats = await get_company_stats(s["owner_co"], SUPER_ADMIN, s["db"])
+    assert stats.total == 4
+
+    member = User(username="owner", email="owner@test.dev", is_admin=False)
+    with patch("src.api.v1.company.company.check_permission", new=AsyncMock(side_effect=[False, True])):
+        assert (await get_company_stats(s["owner_co"], member, s["db"])).total == 3
+    with patch("src.api.v1.company.company.check_permission", new=AsyncMock(return_value=False)), \
+            pytest.raises(HTTPException) as exc:
+        await get_company_stats(s["owner_co"], member, s["db"])
+    assert exc.value.status_code == http.HTTPStatus.FORBIDDEN
+
+
+async def test_stats_cache_is_cleared_by_case_events(scenario):  # noqa ANN001
+    """Repeated requests hit the cache until a committed case change publishes an event."""
+    s = scenario
+    assert (await get_company_stats(s["owner_co"], SUPER_ADMIN, s["db"])).total == 4
+
+    _make_case(s["db"], s["owner_co"])
+    assert (await get_company_stats(s["owner_co"], SUPER_ADMIN, s["db"])).total == 4  # cached
+
+    broker.dispatch({"case_id": "any", "kind": "case", "data": {}})
+    assert (await get_company_stats(s["owner_co"], SUPER_ADMIN, s["db"])).total == 5
+
+    db_delete_case(s["db"], s["cases"][0])
+    assert (await get_company_stats(s["owner_co"], SUPER_ADMIN, s["db"])).total == 4
+
+
+def test_stats_cache_drops_results_computed_across_a_clear():  # noqa ANN001
+    """A result computed while a case event arrived is returned but not stored."""
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def compute_during_event():  # noqa ANN202
+        calls.append(1)
+        cache.clear()
+        return len(calls)
+
+    assert cache.get_or_compute(("c", True), compute_during_event) == 1
+    assert cache.get_or_compute(("c", True), compute_during_event) == 2
@@ -0,0 +1,163 @@
+"""Tests for conditional GET (ETag / If-None-Match) on case and company read endpoints."""
+
+import http
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import Response
+from starlette.requests import Request
+
+from src.api.v1.case.case import CaseRequest, get_case, get_case_activity
+from src.api.v1.case.models import CaseDB, db_log_activity
+from src.api.v1.company.company import get_companies, get_my_users
+from src.api.v1.company.models import CompanyCreate, CompanyDB, db_create_company
+from src.api.v1.etag import etag_for, is_not_modified
+from src.api.v1.user.models import User, UserDB
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _request(etag=None):  # noqa ANN001
+    """Build a bare GET request, optionally carrying If-None-Match."""
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def scenario(db):  # noqa ANN001
+    """One company admin with a sub-user, a company and a case."""
+    db.add(UserDB(username="cadmin", email="cadmin@test.dev", password="x", is_admin=True, parent_id=None))
+    db.add(UserDB(username="sub", email="sub@test.dev", password="x", is_admin=False, parent_id="cadmin"))
+    company_id = str(uuid.uuid4())
+    db.add(CompanyDB(id=company_id, name="Co", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    case_id = str(uuid.uuid4())
+    db.add(CaseDB(
+        id=case_id, responsible_person="T", status="open", customer="C",
+        company_id=company_id, created_at=datetime.now(timezone.utc), user_id="sub",
+    ))
+    db.flush()
+    admin = User(username="cadmin", email="cadmin@test.dev", is_admin=True, parent_id="super")
+    return {"db": db, "case_id": case_id, "admin": admin}
+
+
+# ─── Helpers in etag.py ───────────────────────────────────────────────────────
+
+
+def test_etag_is_weak_and_stable():  # noqa ANN001
+    """Same parts give the same weak validator; different parts differ."""
+    assert etag_for(1, "a") == etag_for(1, "a")
+    assert etag_for(1, "a") != etag_for(2, "a")
+    assert etag_for(1).startswith('W/"')
+
+
+def test_if_none_match_uses_weak_comparison():  # noqa ANN001
+    """Strong and weak forms of the same tag match, as does a list or '*'."""
+    etag = etag_for("x")
+    assert is_not_modified(_request(etag.removeprefix("W/")), etag)
+    assert is_not_modified(_request(f'"other", {etag}'), etag)
+    assert is_not_modified(_request("*"), etag)
+    assert not is_not_modified(_request('"other"'), etag)
+    assert not is_not_modified(_request(), etag)
+
+
+# ─── Endpoints ────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_get_case_returns_304_for_current_etag(scenario):  # noqa ANN001
+    """A repeated GET with the returned ETag yields an empty 304."""
+    s = scenario
+    first = Response()
+    case = await get_case(_request(), first, s["db"], CaseRequest(s["case_id"], s["admin"]))
+    assert case.id == s["case_id"]
+    etag = first.headers["etag"]
+
+    second = await get_case(_request(etag), Response(), s["db"], CaseRequest(s["case_id"], s["admin"]))
+    assert second.status_code == http.HTTPStatus.NOT_MODIFIED
+    assert second.body == b""
+
+
+@pytest.mark.asyncio
+async def test_get_case_etag_changes_when_row_changes(scenario):  # noqa ANN001
+    """Updating the case invalidates the previous ETag."""
+    s = scenario
+    first = Response()
+    await get_case(_request(), first, s["db"], CaseRequest(s["case_id"], s["admin"]))
+    s["db"].query(CaseDB).filter(CaseDB.id == s["case_id"]).update({"status": "closed"})
+
+    result = await get_case(
+        _request(first.headers["etag"]), Response(), s["db"], CaseRequest(s["case_id"], s["admin"]),
+    )
+    assert result.status == "closed"
+
+
+@pytest.mark.asyncio
+async def test_get_case_activity_etag_tracks_appends(scenario):  # noqa ANN001
+    """Appending an activity entry changes the activity ETag."""
+    s = scenario
+    first = Response()
+    await get_case_activity(s["case_id"], _request(), first, s["db"], CaseRequest(s["case_id"], s["admin"]))
+    etag = first.headers["etag"]
+
+    unchanged = await get_case_activity(
+        s["case_id"], _request(etag), Response(), s["db"], CaseRequest(s["case_id"], s["admin"]),
+    )
+    assert unchanged.status_code == http.HTTPStatus.NOT_MODIFIED
+
+    db_log_activity(s["db"], s["case_id"], "sub", "status_changed", "open → closed")
+    changed = await get_case_activity(
+        s["case_id"], _request(etag), Response(), s["db"], CaseRequest(s["case_id"], s["admin"]),
+    )
+    assert [a.action for a in changed] == ["status_changed"]
+
+
+@pytest.mark.asyncio
+async def test_get_case_activity_etag_is_per_page(scenario):  # noqa ANN001
+    """Each page has its own ETag, so a client reusing it for the next page is not told 304."""
+    s = scenario
+    for i in range(3):
+        db_log_activity(s["db"], s["case_id"], "sub", "commented", str(i))
+    first = Response()
+    page = await get_case_activity(
+        s["case_id"], _request(), first, s["db"], CaseRequest(s["case_id"], s["admin"]), limit=2,
+    )
+    assert [a.detail for a in page] == ["0", "1"]
+
+    following = await get_case_activity(
+        s["case_id"], _request(first.headers["etag"]), Response(), s["db"], CaseRequest(s["case_id"], s["admin"]),
+        after_id=page[-1].id, limit=2,
+    )
+    assert [a.detail for a in following] == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_get_companies_etag_tracks_new_companies(scenario):  # noqa ANN001
+    """Creating a company invalidates the company list ETag."""
+    s = scenario
+    first = await get_companies(_request(), s["admin"], s["db"])
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    unchanged = await get_companies(_request(etag), s["admin"], s["db"])
+    assert unchanged.status_code == http.HTTPStatus.NOT_MODIFIED
+
+    db_create_company(s["db"], CompanyCreate(name="New"))
+    changed = await get_companies(_request(etag), s["admin"], s["db"])
+    assert changed.status_code == http.HTTPStatus.OK
+    assert len(json.loads(changed.body)) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_my_users_etag_tracks_profile_edits(scenario):  # noqa ANN001
+    """Editing a sub-user's public fields invalidates the my-users ETag."""
+    s = scenario
+    first = Response()
+    await get_my_users(_request(), first, s["admin"], s["db"])
+    etag = first.headers["etag"]
+
+    s["db"].query(UserDB).filter(UserDB.username == "sub").update({"full_name": "Renamed"})
+    changed = await get_my_users(_request(etag), Response(), s["admin"], s["db"])
+    assert changed[0].full_name == "Renamed"
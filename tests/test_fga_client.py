@@ -0,0 +1,247 @@
+"""Tests for the OpenFGA client settings, batch_check chunking and the circuit breaker."""
+
+import asyncio
+import http
+import ssl
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiohttp
+import pytest
+from fastapi import HTTPException
+from openfga_sdk.client import ClientConfiguration, OpenFgaClient
+from openfga_sdk.exceptions import ValidationException
+
+from src.api.v1.auth import fga
+from src.api.v1.auth.fga import CheckCoalescer, CircuitBreaker, check_permission, filter_by_permission
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture
+def breaker():  # noqa ANN001
+    """Install a fresh breaker that opens after two failures and stays open for a minute."""
+    fresh = CircuitBreaker(threshold=2, reset_after=60)
+    with patch.object(fga, "breaker", fresh):
+        yield fresh
+
+
+@pytest.fixture
+def coalescer():  # noqa ANN001
+    """Install a fresh coalescer with a 5 ms window."""
+    fresh = CheckCoalescer(window=0.005, max_batch=50)
+    with patch.object(fga, "coalescer", fresh):
+        yield fresh
+
+
+def _batch_result(*allowed, errors=()):  # noqa ANN001
+    """Build a batch_check response answering correlation ids 0..n-1 in order."""
+    return SimpleNamespace(result=[
+        SimpleNamespace(correlation_id=str(i), allowed=a, error="boom" if i in errors else None)
+        for i, a in enumerate(allowed)
+    ])
+
+
+def _client(**methods):  # noqa ANN001
+    """Build a fake OpenFGA client and patch get_fga_client to return it."""
+    client = MagicMock(**{name: AsyncMock(**spec) for name, spec in methods.items()})
+    return client, patch("src.api.v1.auth.fga.get_fga_client", new=AsyncMock(return_value=client))
+
+
+# ─── get_fga_client ───────────────────────────────────────────────────────────
+
+
+async def test_client_uses_configured_pool_timeout_and_retries():  # noqa ANN001
+    """The singleton carries the pool size, keep-alive, per-call timeout and retry policy from config."""
+    with patch.object(fga, "_fga_client", None), patch.object(fga, "FGA_MAX_CONNECTIONS", 7), \
+            patch.object(fga, "FGA_KEEPALIVE_SECONDS", 12.0), patch.object(fga, "FGA_TIMEOUT_SECONDS", 1.5):
+        client = await fga.get_fga_client()
+        try:
+            config = client._api_client.configuration
+            connector = client._api_client.rest_client.pool_manager.connector
+            assert (connector.limit, connector._keepalive_timeout) == (7, 12.0)
+            assert config.timeout_millisec == 1500
+            assert config.retry_params.max_retry == fga.FGA_MAX_RETRIES
+        finally:
+            await client.close()
+
+
+async def test_sdk_still_exposes_the_session_we_replace():  # noqa ANN001
+    """The private attribute path _use_keepalive_session swaps exists on the pinned openfga-sdk."""
+    client = OpenFgaClient(ClientConfiguration(api_url="http://fga.internal:8080"))
+    try:
+        session = client._api_client.rest_client.pool_manager
+        assert isinstance(session, aiohttp.ClientSession)
+        assert isinstance(session.connector, aiohttp.TCPConnector)
+    finally:
+        await client.close()
+
+
+def test_keepalive_session_keeps_the_sdk_tls_settings():  # noqa ANN001
+    """The replacement connector honours verify_ssl (and the CA/client cert) like the SDK's own one."""
+    config = ClientConfiguration(api_url="https://fga.internal:8080")
+    assert fga._ssl_context(config).verify_mode == ssl.CERT_REQUIRED
+
+    config.verify_ssl = False
+    context = fga._ssl_context(config)
+    assert (context.check_hostname, context.verify_mode) == (False, ssl.CERT_NONE)
+
+
+# ─── batch_check ──────────────────────────────────────────────────────────────
+
+
+async def test_filter_bounds_batch_size_and_parallelism(breaker):  # noqa ANN001
+    """filter_by_permission asks the SDK to chunk batch_check and cap the parallel requests."""
+    cases = [SimpleNamespace(id=f"k{i}") for i in range(3)]
+    result = SimpleNamespace(result=[SimpleNamespace(correlation_id="k1", allowed=True)])
+    client, patched = _client(batch_check={"return_value": result})
+    with patched:
+        allowed = await filter_by_permission(cases, "alice")
+
+    assert [c.id for c in allowed] == ["k1"]
+    options = client.batch_check.await_args.args[1]
+    assert options == {"max_batch_size": fga.FGA_BATCH_CHECK_SIZE,
+                       "max_parallel_requests": fga.FGA_MAX_PARALLEL_REQUESTS}
+
+
+# ─── Circuit breaker ──────────────────────────────────────────────────────────
+
+
+async def test_breaker_opens_after_consecutive_failures_and_fails_fast(breaker):  # noqa ANN001
+    """Two timeouts open the breaker; the next call gets 503 with Retry-After and never reaches OpenFGA."""
+    client, patched = _client(check={"side_effect": TimeoutError})
+    with patched:
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                await check_permission("alice", "viewer", "case", "k1")
+        with pytest.raises(HTTPException) as exc:
+            await check_permission("alice", "viewer", "case", "k1")
+
+    assert exc.value.status_code == http.HTTPStatus.SERVICE_UNAVAILABLE
+    assert int(exc.value.headers["Retry-After"]) > 0
+    assert client.check.await_count == 2
+    assert breaker.state == "open"
+
+
+async def test_aiohttp_errors_count_as_failures(breaker):  # noqa ANN001
+    """A dropped connection that is not an OSError (ServerDisconnectedError) still counts against OpenFGA."""
+    _, patched = _client(check={"side_effect": aiohttp.ServerDisconnectedError()})
+    with patched, pytest.raises(aiohttp.ServerDisconnectedError):
+        await check_permission("alice", "viewer", "case", "k1")
+    assert breaker.failures == 1
+
+
+async def test_client_errors_do_not_trip_the_breaker(breaker):  # noqa ANN001
+    """A validation error means OpenFGA answered, so it resets the failure count instead of adding to it."""
+    _, patched = _client(check={"side_effect": [TimeoutError, ValidationException(), TimeoutError]})
+    with patched:
+        for error in (TimeoutError, ValidationException, TimeoutError):
+            with pytest.raises(error):
+                await check_permission("alice", "viewer", "case", "k1")
+
+    assert breaker.state == "closed"
+    assert breaker.failures == 1
+
+
+async def test_half_open_breaker_lets_one_trial_through(breaker):  # noqa ANN001
+    """After the reset period one trial call runs; success closes the breaker, failure re-opens it."""
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker._opened_at -= breaker.reset_after
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # the trial is still in flight
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    breaker._opened_at -= breaker.reset_after
+    _, patched = _client(check={"return_value": SimpleNamespace(allowed=True)})
+    with patched:
+        assert await check_permission("alice", "viewer", "case", "k1") is True
+    assert breaker.state == "closed"
+
+
+# ─── Check coalescing ─────────────────────────────────────────────────────────
+
+
+async def test_identical_concurrent_checks_share_one_request(breaker, coalescer):  # noqa ANN001
+    """Three concurrent checks for the same user, relation and case make a single OpenFGA call."""
+    client, patched = _client(check={"return_value": SimpleNamespace(allowed=True)})
+    with patched:
+        results = await asyncio.gather(*(check_permission("alice", "viewer", "case", "k1") for _ in range(3)))
+
+    assert results == [True, True, True]
+    assert client.check.await_count == 1
+    assert not client.batch_check.called
+
+
+async def test_distinct_checks_in_one_window_become_one_batch(breaker, coalescer):  # noqa ANN001
+    """Different checks arriving together are answered by one batch_check, each caller getting its own result."""
+    client, patched = _client(batch_check={"return_value": _batch_result(True, False, True)})
+    with patched:
+        results = await asyncio.gather(
+            check_permission("alice", "viewer", "case", "k1"),
+            check_permission("alice", "editor", "case", "k1"),
+            check_permission("bob", "viewer", "case", "k2"),
+        )
+
+    assert results == [True, False, True]
+    sent = client.batch_check.await_args.args[0].checks
+    assert [(c.user, c.relation, c.object) for c in sent] == [
+        ("user:alice", "viewer", "case:k1"), ("user:alice", "editor", "case:k1"), ("user:bob", "viewer", "case:k2"),
+    ]
+    assert not client.check.called
+
+
+async def test_coalesced_failures_reach_every_waiter(breaker, coalescer):  # noqa ANN001
+    """A failed batch raises in every caller and leaves nothing in flight; item errors are retried alone."""
+    client, patched = _client(batch_check={"side_effect": TimeoutError})
+    with patched:
+        results = await asyncio.gather(
+            check_permission("alice", "viewer", "case", "k1"),
+            check_permission("bob", "viewer", "case", "k1"),
+            return_exceptions=True,
+        )
+    assert [type(r) for r in results] == [TimeoutError, TimeoutError]
+    assert coalescer._inflight == {}
+
+    client, patched = _client(batch_check={"return_value": _batch_result(True, False, errors={1})},
+                              check={"return_value": SimpleNamespace(allowed=True)})
+    with patched:
+        results = await asyncio.gather(
+            check_permission("alice", "viewer", "case", "k1"),
+            check_permission("bob", "viewer", "case", "k1"),
+        )
+    assert results == [True, True]
+    assert client.check.await_args.args[0].user == "user:bob"
+
+
+async def test_item_failures_stay_with_their_own_callers(breaker, coalescer):  # noqa ANN001
+    """A failing re-check or a missing batch item only fails that key's callers; the others get their answers."""
+    batch = SimpleNamespace(result=[
+        SimpleNamespace(correlation_id="0", allowed=True, error=None),
+        SimpleNamespace(correlation_id="1", allowed=False, error="boom"),
+    ])  # carol's item is missing entirely
+    client, patched = _client(batch_check={"return_value": batch},
+                              check={"side_effect": [ValidationException(), SimpleNamespace(allowed=False)]})
+    with patched:
+        results = await asyncio.gather(
+            check_permission("alice", "viewer", "case", "k1"),
+            check_permission("bob", "viewer", "case", "k1"),
+            check_permission("carol", "viewer", "case", "k1"),
+            return_exceptions=True,
+        )
+
+    assert results[0] is True
+    assert isinstance(results[1], ValidationException)
+    assert results[2] is False
+    assert client.check.await_count == 2
+    assert coalescer._inflight == {}
+
+
+async def test_unanswered_keys_never_leave_waiters_hanging(coalescer):  # noqa ANN001
+    """A key absent from the remote results fails its waiters instead of blocking them forever."""
+    with patch("src.api.v1.auth.fga._check_remote", new=AsyncMock(return_value={})), pytest.raises(RuntimeError):
+        await asyncio.wait_for(check_permission("alice", "viewer", "case", "k1"), timeout=1)
+    assert coalescer._inflight == {}
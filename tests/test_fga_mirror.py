@@ -0,0 +1,133 @@
+"""Tests for the local OpenFGA tuple mirror — model evaluation, change-feed sync and fallback to the server."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from openfga_sdk.models import ReadChangesResponse, TupleChange, TupleKey, TupleOperation
+
+from src.api.db.seed_fga import CASE_AUTH_MODEL
+from src.api.v1.auth import fga_mirror
+from src.api.v1.auth.fga import filter_by_permission, write_tuple
+from src.api.v1.auth.fga_mirror import TupleMirror
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _change(user, relation, obj, operation=TupleOperation.WRITE):  # noqa ANN001
+    """Build one read-changes entry."""
+    return TupleChange(
+        tuple_key=TupleKey(user=user, relation=relation, object=obj),
+        operation=operation,
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def _feed(pages):  # noqa ANN001
+    """Fake client whose read_changes returns ``pages[type]`` one page per call, then empty pages."""
+    remaining = {t: list(p) for t, p in pages.items()}
+
+    async def read_changes(body, options):  # noqa ANN001, ANN202
+        page = remaining.get(body.type) or [[]]
+        changes = page.pop(0) if page else []
+        return ReadChangesResponse(changes=changes, continuation_token=f"{body.type}-{options.get('page_size')}")
+
+    return SimpleNamespace(read_changes=AsyncMock(side_effect=read_changes))
+
+
+@pytest.fixture
+def mirror():  # noqa ANN001
+    """Build a synced mirror holding one case in company c1 with creator, assignee and company roles."""
+    m = TupleMirror(CASE_AUTH_MODEL, max_lag=60)
+    for user, relation, obj in (
+        ("company:c1", "company", "case:k1"),
+        ("user:creator", "creator", "case:k1"),
+        ("user:assignee", "assignee", "case:k1"),
+        ("user:admin", "admin", "company:c1"),
+        ("user:member", "member", "company:c1"),
+    ):
+        m.apply(user, relation, obj, write=True)
+    m._caught_up_at = fga_mirror.time.monotonic()
+    return m
+
+
+# ─── Evaluation ───────────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(("user", "expected"), [
+    ("creator", {"viewer": True, "editor": False, "deleter": True}),
+    ("assignee", {"viewer": True, "editor": True, "deleter": False}),
+    ("admin", {"viewer": True, "editor": True, "deleter": True}),
+    ("member", {"viewer": True, "editor": False, "deleter": False}),
+    ("stranger", {"viewer": False, "editor": False, "deleter": False}),
+])
+def test_case_relations_follow_the_model(mirror, user, expected):  # noqa ANN001
+    """Computed and tuple-to-userset rewrites give the same answers as CASE_AUTH_MODEL on the server."""
+    assert {r: mirror.check(user, r, "case", "k1") for r in expected} == expected
+
+
+def test_direct_userset_grants_and_misses(mirror):  # noqa ANN001
+    """A direct ``company#member`` viewer tuple is expanded; unknown objects and stale mirrors are misses."""
+    mirror.apply("company:c2#member", "viewer", "case:k2", write=True)
+    mirror.apply("user:outsider", "member", "company:c2", write=True)
+    assert mirror.check("outsider", "viewer", "case", "k2") is True
+    assert mirror.check("outsider", "editor", "case", "k2") is False
+
+    assert mirror.check("creator", "viewer", "case", "unknown") is None
+    mirror.max_lag = 0
+    assert mirror.check("creator", "viewer", "case", "k1") is None
+
+
+# ─── Change feed ──────────────────────────────────────────────────────────────
+
+
+async def test_sync_pages_through_changes_and_applies_deletes():  # noqa ANN001
+    """Sync follows continuation tokens per type, applies writes and deletes in order and marks the mirror fresh."""
+    m = TupleMirror(CASE_AUTH_MODEL, max_lag=60)
+    assert m.check("alice", "viewer", "case", "k1") is None  # never synced
+
+    client = _feed({
+        "case": [
+            [_change("user:alice", "creator", "case:k1")] * fga_mirror._PAGE_SIZE,
+            [_change("user:alice", "creator", "case:k1", TupleOperation.DELETE),
+             _change("user:bob", "assignee", "case:k1")],
+        ],
+    })
+    applied = await m.sync(client)
+
+    assert applied == fga_mirror._PAGE_SIZE + 2
+    assert m.check("alice", "viewer", "case", "k1") is False
+    assert m.check("bob", "editor", "case", "k1") is True
+    case_pages = [c.args[1] for c in client.read_changes.await_args_list if c.args[0].type == "case"]
+    assert case_pages[1]["continuation_token"] == "case-100"
+    assert m.lag() < 1
+
+
+# ─── Integration with fga.py ──────────────────────────────────────────────────
+
+
+async def test_filter_sends_only_misses_to_the_server(mirror):  # noqa ANN001
+    """filter_by_permission answers known cases locally and batch-checks the rest."""
+    cases = [SimpleNamespace(id="k1"), SimpleNamespace(id="k9")]
+    client = MagicMock()
+    client.batch_check = AsyncMock(return_value=SimpleNamespace(result=[SimpleNamespace(correlation_id="k9",
+                                                                                        allowed=True)]))
+    with patch.object(fga_mirror, "FGA_LOCAL_EVALUATION", True), patch.object(fga_mirror, "mirror", mirror), \
+            patch("src.api.v1.auth.fga.get_fga_client", new=AsyncMock(return_value=client)):
+        allowed = await filter_by_permission(cases, "creator")
+
+    assert [c.id for c in allowed] == ["k1", "k9"]
+    sent = client.batch_check.await_args.args[0].checks
+    assert [c.object for c in sent] == ["case:k9"]
+
+
+async def test_own_writes_are_visible_before_the_feed(mirror):  # noqa ANN001
+    """A tuple this worker writes is applied to the mirror immediately (read-your-writes)."""
+    client = MagicMock()
+    client.write = AsyncMock()
+    with patch.object(fga_mirror, "FGA_LOCAL_EVALUATION", True), patch.object(fga_mirror, "mirror", mirror), \
+            patch("src.api.v1.auth.fga.get_fga_client", new=AsyncMock(return_value=client)):
+        await write_tuple("newbie", "assignee", "case", "k1")
+
+    assert mirror.check("newbie", "editor", "case", "k1") is True
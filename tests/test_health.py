@@ -0,0 +1,106 @@
+"""Tests for the startup and readiness probes — dependency checks, timeouts, caching and warm-up."""
+
+import asyncio
+import http
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import Response
+
+from src.api.health import health
+from src.api.health.health import readiness_check, startup_health, warm_up
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():  # noqa ANN001
+    """Reset the cached report and the startup flag around each test."""
+    with patch.object(health, "_cached", None), patch.object(health, "_inflight", None), \
+            patch.object(health, "_started", False):
+        yield
+
+
+def _probes(**checks):  # noqa ANN001
+    """Patch the readiness probes with the given async callables."""
+    return patch.object(health, "PROBES", checks)
+
+
+async def _hang():  # noqa ANN202
+    await asyncio.sleep(10)
+
+
+# ─── /health/ready ────────────────────────────────────────────────────────────
+
+
+async def test_ready_reports_each_dependency_with_latency():  # noqa ANN001
+    """All probes passing gives 200 with an entry and a latency per dependency."""
+    response = Response()
+    with _probes(postgres=AsyncMock(), minio=AsyncMock(), openfga=AsyncMock()):
+        report = await readiness_check(response)
+
+    assert response.status_code == http.HTTPStatus.OK
+    assert report.ready is True
+    assert set(report.dependencies) == {"postgres", "minio", "openfga"}
+    assert all(d.ok and d.latency_ms >= 0 for d in report.dependencies.values())
+
+
+async def test_failing_or_slow_dependency_makes_the_worker_unready():  # noqa ANN001
+    """A raising probe reports only its error type, a hanging one times out, and the response is 503."""
+    response = Response()
+    with _probes(postgres=AsyncMock(side_effect=ConnectionRefusedError("db.internal:5432")), openfga=_hang), \
+            patch.object(health, "HEALTH_CHECK_TIMEOUT_SECONDS", 0.01):
+        report = await readiness_check(response)
+
+    assert response.status_code == http.HTTPStatus.SERVICE_UNAVAILABLE
+    assert report.ready is False
+    assert report.dependencies["postgres"].error == "ConnectionRefusedError"
+    assert report.dependencies["openfga"].error.startswith("timed out")
+
+
+async def test_ready_result_is_cached_and_shared():  # noqa ANN001
+    """Concurrent and repeated probes within the cache window run the dependency checks once."""
+    check = AsyncMock()
+    with _probes(postgres=check):
+        await asyncio.gather(*(readiness_check(Response()) for _ in range(3)))
+        await readiness_check(Response())
+        assert check.await_count == 1
+
+        with patch.object(health, "HEALTH_CACHE_SECONDS", 0), patch.object(health, "_cached", None):
+            await readiness_check(Response())
+            await readiness_check(Response())
+    assert check.await_count == 3
+
+
+def test_probe_connections_time_out_on_their_own():  # noqa ANN001
+    """The Postgres and MinIO probe clients give up by themselves, so no thread outlives a timed-out probe."""
+    from src.api.v1.case import storage
+
+    with patch.object(health._probe_engine.dialect, "connect", side_effect=ConnectionRefusedError) as connect, \
+            pytest.raises(ConnectionRefusedError):
+        health._ping_postgres()
+    params = connect.call_args.kwargs
+    assert params["connect_timeout"] >= 2
+    assert params["options"] == f"-c statement_timeout={int(health.HEALTH_CHECK_TIMEOUT_SECONDS * 1000)}"
+    assert health._probe_engine.pool.timeout() == health.HEALTH_CHECK_TIMEOUT_SECONDS
+
+    pool = storage._probe_client._http.connection_pool_kw
+    assert pool["timeout"].connect_timeout == pool["timeout"].read_timeout == storage.MINIO_PROBE_TIMEOUT_SECONDS
+    assert pool["retries"].total is False
+
+
+# ─── /health/startup ──────────────────────────────────────────────────────────
+
+
+async def test_startup_fails_until_warm_up_ran_even_if_a_step_fails():  # noqa ANN001
+    """Startup answers 503 before warm-up; a failing warm-up step is logged and does not block it."""
+    response = Response()
+    assert await startup_health(response) == http.HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.status_code == http.HTTPStatus.SERVICE_UNAVAILABLE
+
+    steps = {"postgres": AsyncMock(), "openfga": AsyncMock(side_effect=OSError("refused"))}
+    with patch.object(health, "WARMUP_STEPS", steps):
+        await warm_up()
+
+    assert all(step.await_count == 1 for step in steps.values())
+    assert await startup_health(Response()) == http.HTTPStatus.OK
@@ -0,0 +1,125 @@
+"""Tests for Prometheus metrics — timing helper, pool gauges and request middleware."""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from src.api.metrics import router as metrics_router
+from src.api.metrics.metrics import (
+    DB_POOL_CHECKED_OUT,
+    FGA_ERRORS_TOTAL,
+    FGA_REQUEST_SECONDS,
+    instrument_engine,
+    observe,
+)
+from src.api.middleware.metrics import MetricsMiddleware
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _sample(name, **labels):  # noqa ANN001
+    """Return the current value of a sample in the default registry (0.0 if absent)."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client():  # noqa ANN001
+    """Build a tiny app wired with the metrics middleware and a scrape endpoint guarded by token ``scrape``."""
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: str) -> dict:
+        return {"id": item_id}
+
+    with patch("src.api.metrics.metrics.METRICS_TOKEN", "scrape"):
+        yield TestClient(app)
+
+
+# ─── observe ──────────────────────────────────────────────────────────────────
+
+
+def test_observe_records_duration():  # noqa ANN001
+    """A successful block adds one observation and no error."""
+    before = _sample("kanapi_fga_request_duration_seconds_count", operation="test_ok")
+    errors_before = _sample("kanapi_fga_errors_total", operation="test_ok")
+
+    with observe(FGA_REQUEST_SECONDS, "test_ok", FGA_ERRORS_TOTAL):
+        pass
+
+    assert _sample("kanapi_fga_request_duration_seconds_count", operation="test_ok") == before + 1
+    assert _sample("kanapi_fga_errors_total", operation="test_ok") == errors_before
+
+
+def test_observe_counts_errors_and_reraises():  # noqa ANN001
+    """An exception is counted, still timed, and propagated."""
+    before = _sample("kanapi_fga_request_duration_seconds_count", operation="test_err")
+
+    with pytest.raises(RuntimeError), observe(FGA_REQUEST_SECONDS, "test_err", FGA_ERRORS_TOTAL):
+        raise RuntimeError("boom")
+
+    assert _sample("kanapi_fga_request_duration_seconds_count", operation="test_err") == before + 1
+    assert _sample("kanapi_fga_errors_total", operation="test_err") == 1
+
+
+# ─── instrument_engine ────────────────────────────────────────────────────────
+
+
+def test_instrument_engine_tracks_checkouts():  # noqa ANN001
+    """Checked-out gauge rises while a connection is held and falls on release."""
+    engine = create_engine("sqlite:///:memory:")
+    instrument_engine(engine)
+    base = DB_POOL_CHECKED_OUT._value.get()
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert DB_POOL_CHECKED_OUT._value.get() == base + 1
+    assert DB_POOL_CHECKED_OUT._value.get() == base
+    engine.dispose()
+
+
+# ─── MetricsMiddleware / endpoint ─────────────────────────────────────────────
+
+
+def test_middleware_labels_by_route_template(client):  # noqa ANN001
+    """Requests are labelled with the route template, not the concrete path."""
+    before = _sample("kanapi_http_requests_total", method="GET", route="/items/{item_id}", status="200")
+
+    client.get("/items/1")
+    client.get("/items/2")
+
+    after = _sample("kanapi_http_requests_total", method="GET", route="/items/{item_id}", status="200")
+    assert after == before + 2
+
+
+def test_middleware_groups_unmatched_paths(client):  # noqa ANN001
+    """404s for unknown paths share a single 'unmatched' label."""
+    before = _sample("kanapi_http_requests_total", method="GET", route="unmatched", status="404")
+
+    client.get("/does/not/exist")
+
+    assert _sample("kanapi_http_requests_total", method="GET", route="unmatched", status="404") == before + 1
+
+
+def test_metrics_endpoint_exposes_text_format(client):  # noqa ANN001
+    """/metrics returns the Prometheus exposition format and is not itself recorded."""
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "kanapi_http_request_duration_seconds" in response.text
+    assert 'route="/metrics"' not in response.text
+
+
+def test_metrics_endpoint_requires_the_token(client):  # noqa ANN001
+    """Scrapes without the bearer token get 401, and the endpoint is 404 when no token is configured."""
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer guess"}).status_code == 401
+
+    with patch("src.api.metrics.metrics.METRICS_TOKEN", ""):
+        assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 404
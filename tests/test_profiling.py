@@ -0,0 +1,129 @@
+"""Tests for the opt-in sampling profiler."""
+
+import http
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from src.api.middleware.profiling import _is_super_admin_request
+from src.api.profiling import router as profiling_router
+from src.api.profiling.profiler import StackSampler, profile_worker
+from src.api.v1.auth.auth import create_access_token, user_from_session
+from src.api.v1.user.models import User, UserDB
+
+SUPER = User(username="super", email="super@test.dev", is_admin=True, parent_id=None)
+COMPANY_ADMIN = User(username="cadmin", email="cadmin@test.dev", is_admin=True, parent_id="super")
+
+
+def _busy_loop(stop):  # noqa ANN001
+    """Spin until told to stop so the sampler has something to see."""
+    while not stop.is_set():
+        sum(range(100))
+
+
+# ─── StackSampler ─────────────────────────────────────────────────────────────
+
+
+def test_sampler_captures_other_threads():  # noqa ANN001
+    """Stacks of a busy thread appear in folded output, rooted at the thread name."""
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy-worker")
+    worker.start()
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    time.sleep(0.05)
+    sampler.stop()
+    stop.set()
+    worker.join()
+
+    folded = sampler.folded()
+    busy = [line for line in folded.splitlines() if line.startswith("busy-worker;")]
+    assert busy
+    assert any("_busy_loop" in line for line in busy)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.splitlines())
+
+
+def test_sampler_excludes_itself():  # noqa ANN001
+    """The sampler thread never records its own stack."""
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    time.sleep(0.02)
+    sampler.stop()
+    assert "kanapi-profiler" not in sampler.folded()
+
+
+async def test_stop_async_does_not_block_the_event_loop():  # noqa ANN001
+    """stop_async signals the sampler at once and joins its thread away from the loop."""
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    await sampler.stop_async()
+    assert sampler._stop.is_set()
+    assert not sampler._thread.is_alive()
+
+
+# ─── profile_worker ───────────────────────────────────────────────────────────
+
+
+def test_profile_route_is_404_before_auth_when_disabled():  # noqa ANN001
+    """Anonymous callers get 404, not 401, while profiling is off, so the route's existence is not revealed."""
+    app = FastAPI()
+    app.include_router(profiling_router)
+    client = TestClient(app)
+    with patch("src.api.profiling.profiler.PROFILING_ENABLED", new=False):
+        assert client.get("/profiling/worker").status_code == http.HTTPStatus.NOT_FOUND
+    with patch("src.api.profiling.profiler.PROFILING_ENABLED", new=True):
+        assert client.get("/profiling/worker").status_code == http.HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_profile_worker_requires_super_admin():  # noqa ANN001
+    """Company admins get 403 even when profiling is enabled."""
+    with patch("src.api.profiling.profiler.PROFILING_ENABLED", new=True), pytest.raises(HTTPException) as exc:
+        await profile_worker(COMPANY_ADMIN, seconds=0.01, interval_ms=1)
+    assert exc.value.status_code == http.HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_profile_worker_returns_folded_stacks():  # noqa ANN001
+    """A super admin receives collapsed stacks for the sampled window."""
+    with patch("src.api.profiling.profiler.PROFILING_ENABLED", new=True):
+        response = await profile_worker(SUPER, seconds=0.05, interval_ms=1)
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.body.decode().strip()
+
+
+# ─── ProfilingMiddleware ──────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_middleware_resolves_the_session_like_the_auth_dependency(db):  # noqa ANN001
+    """The cookie goes through user_from_session in a worker thread, then the shared is_super_admin check."""
+    db.add(UserDB(username="super", email="super@test.dev", password="x", is_admin=True, parent_id=None))
+    db.add(UserDB(username="cadmin", email="cadmin@test.dev", password="x", is_admin=True, parent_id="super"))
+    db.flush()
+    threads = []
+
+    def resolve(session_db, session):  # noqa ANN001
+        threads.append(threading.current_thread())
+        return user_from_session(session_db, session)
+
+    def request(cookie):  # noqa ANN001
+        headers = [(b"cookie", f"session={cookie}".encode())] if cookie else []
+        return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+    factory = MagicMock()
+    factory.return_value.__enter__.return_value = db
+    with patch("src.api.middleware.profiling.SessionLocal", factory), \
+            patch("src.api.middleware.profiling.user_from_session", side_effect=resolve):
+        assert await _is_super_admin_request(request(create_access_token({"sub": "super"}))) is True
+        assert await _is_super_admin_request(request(create_access_token({"sub": "cadmin"}))) is False
+        assert await _is_super_admin_request(request(create_access_token({"sub": "ghost"}))) is False
+        assert await _is_super_admin_request(request("not-a-jwt")) is False
+        assert await _is_super_admin_request(request(None)) is False
+    assert threads
+    assert threading.main_thread() not in threads
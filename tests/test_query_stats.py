@@ -0,0 +1,132 @@
+"""Tests for per-request SQL statement counting and the max-queries test helper."""
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src.api.db.query_stats import assert_max_queries, track_queries
+from src.api.middleware.query_stats import QueryStatsMiddleware
+from src.api.v1.case.models import CaseDB, db_rebuild_team_companies
+from src.api.v1.company.company import get_my_companies
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.user.models import User, UserDB
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _make_user(db, *, username, is_admin, parent_id=None):  # noqa ANN001
+    """Insert a UserDB row and return its username."""
+    db.add(UserDB(
+        username=username, email=f"{username}@test.dev", password="x", is_admin=is_admin, parent_id=parent_id,
+    ))
+    db.flush()
+    return username
+
+
+def _run_two_queries_with_limit_one(db):  # noqa ANN001
+    """Execute two statements under a one-query budget."""
+    with assert_max_queries(1):
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+
+
+# ─── track_queries ────────────────────────────────────────────────────────────
+
+
+def test_track_queries_counts_statements(db):  # noqa ANN001
+    """Every executed statement is counted and timed."""
+    with track_queries() as stats:
+        db.execute(text("SELECT 1"))
+        db.execute(text("SELECT 2"))
+    assert stats.count == 2
+    assert stats.total_ms >= 0
+
+
+def test_track_queries_ignores_statements_outside_block(db):  # noqa ANN001
+    """Statements run after the block has exited are not recorded."""
+    with track_queries() as stats:
+        db.execute(text("SELECT 1"))
+    db.execute(text("SELECT 1"))
+    assert stats.count == 1
+
+
+def test_repeated_flags_identical_statements(db):  # noqa ANN001
+    """The same statement text executed repeatedly is reported as a possible N+1."""
+    with track_queries() as stats:
+        for username in ("a", "b", "c"):
+            db.query(UserDB).filter(UserDB.username == username).first()
+        db.execute(text("SELECT 1"))
+    repeated = stats.repeated(3)
+    assert len(repeated) == 1
+    assert repeated[0][1] == 3
+
+
+# ─── assert_max_queries ───────────────────────────────────────────────────────
+
+
+def test_assert_max_queries_passes_within_limit(db):  # noqa ANN001
+    """No error when the block stays within the limit."""
+    with assert_max_queries(1):
+        db.execute(text("SELECT 1"))
+
+
+def test_assert_max_queries_fails_over_limit(db):  # noqa ANN001
+    """AssertionError lists the statements when the limit is exceeded."""
+    with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+        _run_two_queries_with_limit_one(db)
+
+
+@pytest.mark.asyncio
+async def test_get_my_companies_query_budget(db):  # noqa ANN001
+    """get_my_companies stays within a fixed number of queries regardless of team size."""
+    admin = _make_user(db, username="cadmin", is_admin=True)
+    company_id = str(uuid.uuid4())
+    db.add(CompanyDB(id=company_id, name="Co", created_at=datetime.now(timezone.utc)))
+    for i in range(5):
+        sub = _make_user(db, username=f"sub{i}", is_admin=False, parent_id=admin)
+        db.add(CaseDB(
+            id=str(uuid.uuid4()), responsible_person="T", status="open", customer="C",
+            company_id=company_id, created_at=datetime.now(timezone.utc), user_id=sub,
+        ))
+    db.flush()
+    db_rebuild_team_companies(db)
+    caller = User(username=admin, email=f"{admin}@test.dev", is_admin=True, parent_id="super")
+
+    with assert_max_queries(1):
+        result = await get_my_companies(caller, db)
+    assert [c.id for c in result] == [company_id]
+
+
+# ─── QueryStatsMiddleware ─────────────────────────────────────────────────────
+
+
+def test_middleware_counts_queries_run_while_streaming(caplog):  # noqa ANN001
+    """Statements executed by a streamed body are counted, and logged once the body has been sent."""
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/export")
+    def export() -> StreamingResponse:
+        def rows():  # noqa ANN202
+            with engine.connect() as conn:
+                for i in range(3):
+                    yield f"{conn.execute(text('SELECT :i'), {'i': i}).scalar()}\n"
+
+        return StreamingResponse(rows(), media_type="text/plain")
+
+    with patch("src.api.middleware.query_stats._COUNT_THRESHOLD", 2), \
+            patch("src.api.middleware.query_stats._REPEAT_THRESHOLD", 3), \
+            caplog.at_level(logging.WARNING, logger="src.api.middleware.query_stats"):
+        response = TestClient(app).get("/export")
+
+    assert response.text == "0\n1\n2\n"
+    assert "GET /export ran 3 SQL statements" in caplog.text
+    assert "Possible N+1 in GET /export: statement executed 3 times" in caplog.text
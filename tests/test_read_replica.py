@@ -0,0 +1,107 @@
+"""Tests for read-replica session routing and read-your-writes stickiness."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from src.api.db.database import STICKY_COOKIE, _load_replica_config, get_read_db
+from src.api.middleware.replica import ReadYourWritesMiddleware
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _request(cookies=None):  # noqa ANN001
+    """Build a bare Starlette request carrying the given cookies."""
+    header = "; ".join(f"{k}={v}" for k, v in (cookies or {}).items())
+    headers = [(b"cookie", header.encode())] if header else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def _resolve(request, primary):  # noqa ANN001
+    """Run the get_read_db generator and return the session it yields."""
+    gen = get_read_db(request, primary)
+    session = next(gen)
+    gen.close()
+    return session
+
+
+# ─── get_read_db ──────────────────────────────────────────────────────────────
+
+
+def test_read_db_uses_primary_without_replica():  # noqa ANN001
+    """Without a configured replica the primary session is reused."""
+    primary = MagicMock()
+    with patch("src.api.db.database.ReplicaSessionLocal", new=None):
+        assert _resolve(_request(), primary) is primary
+
+
+def test_read_db_uses_replica_when_configured():  # noqa ANN001
+    """With a replica configured, reads get a replica session that is closed afterwards."""
+    primary, replica = MagicMock(), MagicMock()
+    with patch("src.api.db.database.ReplicaSessionLocal", new=MagicMock(return_value=replica)):
+        assert _resolve(_request(), primary) is replica
+    replica.close.assert_called_once()
+
+
+def test_read_db_sticks_to_primary_after_write():  # noqa ANN001
+    """A valid read-your-writes cookie routes reads back to the primary."""
+    primary = MagicMock()
+    cookies = {STICKY_COOKIE: f"{time.time() + 30:.3f}"}
+    with patch("src.api.db.database.ReplicaSessionLocal", new=MagicMock()):
+        assert _resolve(_request(cookies), primary) is primary
+
+
+def test_read_db_ignores_expired_or_garbage_cookie():  # noqa ANN001
+    """Expired or malformed stickiness cookies do not pin reads to the primary."""
+    primary, replica = MagicMock(), MagicMock()
+    with patch("src.api.db.database.ReplicaSessionLocal", new=MagicMock(return_value=replica)):
+        assert _resolve(_request({STICKY_COOKIE: "1"}), primary) is replica
+        assert _resolve(_request({STICKY_COOKIE: "nope"}), primary) is replica
+
+
+# ─── _load_replica_config ─────────────────────────────────────────────────────
+
+_REPLICA_INI = "[postgresql_replica]\nhost=replica\nport=5432\ndatabase=kanapi\nuser=kanapi\n{password}"
+
+
+def test_replica_config_is_none_without_section(tmp_path):  # noqa ANN001
+    """A database.ini without a replica section means no replica."""
+    ini = tmp_path / "database.ini"
+    ini.write_text("[postgresql]\nhost=db\n")
+    assert _load_replica_config(str(ini)) is None
+
+
+def test_replica_config_is_loaded_when_complete(tmp_path):  # noqa ANN001
+    """A complete replica section is returned as a dict."""
+    ini = tmp_path / "database.ini"
+    ini.write_text(_REPLICA_INI.format(password="password=secret\n"))
+    assert _load_replica_config(str(ini))["host"] == "replica"
+
+
+def test_replica_config_rejects_incomplete_section(tmp_path):  # noqa ANN001
+    """A replica section missing connection keys raises instead of silently disabling the replica."""
+    ini = tmp_path / "database.ini"
+    ini.write_text(_REPLICA_INI.format(password=""))
+    with pytest.raises(ValueError, match="password"):
+        _load_replica_config(str(ini))
+
+
+# ─── ReadYourWritesMiddleware ─────────────────────────────────────────────────
+
+
+def test_middleware_sets_cookie_only_after_successful_writes():  # noqa ANN001
+    """Successful mutations set the stickiness cookie; reads and failed writes do not."""
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.get("/thing")(lambda: {})
+    app.post("/thing")(lambda: {})
+    app.delete("/thing", status_code=404)(lambda: None)
+    client = TestClient(app)
+
+    assert STICKY_COOKIE not in client.get("/thing").cookies
+    assert STICKY_COOKIE in client.post("/thing").headers.get("set-cookie", "")
+    assert STICKY_COOKIE not in client.delete("/thing").headers.get("set-cookie", "")
@@ -0,0 +1,60 @@
+"""Tests for worker start-up cost — lazy heavy imports and the explicit migration step."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.api.db import create_tables as migration
+from src.api.v1.case.case import _markdown_converter
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# ─── Lazy imports ─────────────────────────────────────────────────────────────
+
+
+def test_app_import_does_not_load_markitdown():  # noqa ANN001
+    """Importing the app in a fresh interpreter leaves markitdown and its PDF stack unloaded."""
+    probe = "import sys, src.api.main; print(sorted(m for m in ('markitdown', 'pdfminer') if m in sys.modules))"
+    env = {**os.environ, "JWT_SECRET_KEY": os.environ.get("JWT_SECRET_KEY", "test")}
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_health_module_leaves_dependency_clients_unloaded():  # noqa ANN001
+    """The probes import the OpenFGA, MinIO and company modules on first use, not with the health router."""
+    probe = ("import sys, src.api.health.health; "
+             "print(sorted(m for m in ('src.api.v1.auth.fga', 'src.api.v1.case.storage', "
+             "'src.api.v1.company.models') if m in sys.modules))")
+    env = {**os.environ, "JWT_SECRET_KEY": os.environ.get("JWT_SECRET_KEY", "test")}
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_markdown_converter_is_built_once_on_first_use():  # noqa ANN001
+    """The converter is created lazily by the first upload and reused afterwards."""
+    _markdown_converter.cache_clear()
+    try:
+        with patch("markitdown.MarkItDown") as converter_cls:
+            assert _markdown_converter() is _markdown_converter()
+        converter_cls.assert_called_once_with()
+    finally:
+        _markdown_converter.cache_clear()
+
+
+# ─── Migration step ───────────────────────────────────────────────────────────
+
+
+def test_migrate_creates_schema_backfills_and_ensures_bucket():  # noqa ANN001
+    """``make migrate`` runs the schema, team_companies backfill and bucket setup the lifespan used to do."""
+    calls = []
+    with patch.object(migration, "create_tables", side_effect=lambda: calls.append("schema")), \
+            patch.object(migration, "SessionLocal", MagicMock()), \
+            patch.object(migration, "db_backfill_team_companies", side_effect=lambda _db: calls.append("backfill")), \
+            patch.object(migration, "ensure_bucket", side_effect=lambda: calls.append("bucket")):
+        migration.migrate()
+
+    assert calls == ["schema", "backfill", "bucket"]
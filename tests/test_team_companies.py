@@ -0,0 +1,130 @@
+"""Tests for the materialized team → company membership (team_companies).
+
+Hierarchy:
+  root
+  ├── cadmin  (company admin) ── alice, bob
+  └── other   (company admin) ── carol
+"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.api.v1.case.models import (
+    CaseCreate,
+    CaseDB,
+    TeamCompanyDB,
+    db_backfill_team_companies,
+    db_create_case,
+    db_create_cases_bulk,
+    db_delete_case,
+    db_rebuild_team_companies,
+    db_search_cases_by_user,
+    db_team_company_ids,
+)
+from src.api.v1.company.models import CompanyDB
+from src.api.v1.user.models import UserDB, UserUpdate, db_update_user
+
+# ─── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _membership(db):  # noqa ANN001
+    """Return team_companies as {(team_id, company_id): case_count}."""
+    return {(r.team_id, r.company_id): r.case_count for r in db.query(TeamCompanyDB)}
+
+
+def _create(db, user_id, company_id):  # noqa ANN001
+    """Create a case through db_create_case and return its ID."""
+    case_id = str(uuid.uuid4())
+    db_create_case(db, CaseCreate(responsible_person="T", status="open", customer="C", company_id=company_id),
+                   user_id, case_id)
+    return case_id
+
+
+@pytest.fixture
+def scenario(db):  # noqa ANN001
+    """Create two teams under root and two companies."""
+    db.add(UserDB(username="root", email="root@test.dev", password="x", is_admin=True))
+    db.flush()
+    for admin in ("cadmin", "other"):
+        db.add(UserDB(username=admin, email=f"{admin}@test.dev", password="x", is_admin=True, parent_id="root"))
+    db.flush()
+    for name, parent in (("alice", "cadmin"), ("bob", "cadmin"), ("carol", "other")):
+        db.add(UserDB(username=name, email=f"{name}@test.dev", password="x", is_admin=False, parent_id=parent))
+    companies = [str(uuid.uuid4()), str(uuid.uuid4())]
+    for i, cid in enumerate(companies):
+        db.add(CompanyDB(id=cid, name=f"Co{i}", created_at=datetime.now(timezone.utc)))
+    db.flush()
+    return {"db": db, "co1": companies[0], "co2": companies[1]}
+
+
+# ─── Maintenance ──────────────────────────────────────────────────────────────
+
+
+def test_create_and_delete_keep_counts(scenario):  # noqa ANN001
+    """Each team's cases are counted per company; the row goes when the last case is deleted."""
+    s = scenario
+    first = _create(s["db"], "alice", s["co1"])
+    second = _create(s["db"], "bob", s["co1"])
+    _create(s["db"], "cadmin", s["co2"])  # created by the admin: belongs to root's "team", not cadmin's
+    assert _membership(s["db"]) == {("cadmin", s["co1"]): 2, ("root", s["co2"]): 1}
+
+    db_delete_case(s["db"], first)
+    assert _membership(s["db"])[("cadmin", s["co1"])] == 1
+    db_delete_case(s["db"], second)
+    assert ("cadmin", s["co1"]) not in _membership(s["db"])
+
+
+def test_bulk_create_upserts_counts(scenario):  # noqa ANN001
+    """A bulk insert adds to existing rows and creates missing ones."""
+    s = scenario
+    _create(s["db"], "carol", s["co1"])
+    rows = [(str(uuid.uuid4()), CaseCreate(responsible_person="T", status="open", customer="C", company_id=co))
+            for co in (s["co1"], s["co1"], s["co2"])]
+    db_create_cases_bulk(s["db"], rows, "carol")
+
+    assert _membership(s["db"]) == {("other", s["co1"]): 3, ("other", s["co2"]): 1}
+    assert sorted(db_team_company_ids(s["db"], "other")) == sorted([s["co1"], s["co2"]])
+
+
+def test_changing_parent_moves_cases(scenario):  # noqa ANN001
+    """Re-parenting a user moves their case counts to the new team."""
+    s = scenario
+    _create(s["db"], "alice", s["co1"])
+    _create(s["db"], "bob", s["co1"])
+
+    db_update_user(s["db"], "alice", UserUpdate(parent_id="other"))
+
+    assert _membership(s["db"]) == {("cadmin", s["co1"]): 1, ("other", s["co1"]): 1}
+
+
+def test_rebuild_matches_incremental_state(scenario):  # noqa ANN001
+    """A full rebuild reproduces what the write paths maintained; backfill only runs on an empty table."""
+    s = scenario
+    _create(s["db"], "alice", s["co1"])
+    _create(s["db"], "carol", s["co2"])
+    maintained = _membership(s["db"])
+
+    assert db_rebuild_team_companies(s["db"]) == 2
+    assert _membership(s["db"]) == maintained
+
+    s["db"].query(TeamCompanyDB).delete()
+    db_backfill_team_companies(s["db"])
+    assert _membership(s["db"]) == maintained
+
+
+# ─── Visibility ───────────────────────────────────────────────────────────────
+
+
+def test_sub_user_sees_cases_in_team_companies(scenario):  # noqa ANN001
+    """Sub-users see every case in companies their team works in, including other teams' cases there."""
+    s = scenario
+    mine = _create(s["db"], "bob", s["co1"])
+    others_in_co1 = _create(s["db"], "carol", s["co1"])
+    _create(s["db"], "carol", s["co2"])
+
+    visible = {c.id for c in db_search_cases_by_user(s["db"], "alice")}
+
+    assert visible == {mine, others_in_co1}
+    assert s["db"].query(CaseDB).count() == 3
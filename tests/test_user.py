@@ -7,15 +7,17 @@ Hierarchy used across all tests:
 """
 
 import http
+import json
 import uuid
 from datetime import datetime, timezone
 
 import pytest
 from fastapi import HTTPException
 
+from src.api.db.query_stats import assert_max_queries
 from src.api.v1.case.models import CaseDB
 from src.api.v1.user.models import User, UserDB, UserUpdate, db_update_user
-from src.api.v1.user.user import delete_user_by_id, get_user, update_user
+from src.api.v1.user.user import delete_user_by_id, get_all_users, get_user, update_user
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -140,6 +142,26 @@ async def test_company_admin_can_delete_user(scenario):  # noqa ANN001
     assert row is None
 
 
+@pytest.mark.asyncio
+async def test_company_admin_cannot_delete_unmanaged_user(scenario):  # noqa ANN001
+    """A company admin gets 403 for a user they do not manage, and the row stays."""
+    s = scenario
+    outsider = _make_user(s["db"], username="outsider", is_admin=False, parent_id=s["super_admin"].username)
+    caller = _as_user(s["company_admin"])
+    with pytest.raises(HTTPException) as exc:
+        await delete_user_by_id(outsider.username, caller, s["db"])
+    assert exc.value.status_code == http.HTTPStatus.FORBIDDEN
+    assert s["db"].query(UserDB).filter(UserDB.username == "outsider").first() is not None
+
+
+@pytest.mark.asyncio
+async def test_delete_user_is_a_single_statement(scenario):  # noqa ANN001
+    """The happy path checks management and cases inside one DELETE, without loading the user first."""
+    s = scenario
+    with assert_max_queries(1):
+        await delete_user_by_id(s["regular_user"].username, _as_user(s["company_admin"]), s["db"])
+
+
 @pytest.mark.asyncio
 async def test_delete_user_with_cases_gets_409(scenario, db):  # noqa ANN001
     """Deleting a user who owns cases returns 409 Conflict."""
@@ -216,3 +238,19 @@ async def test_get_user_success(scenario):  # noqa ANN001
 
     assert result.username == target.username
     assert result.email == target.email
+
+
+# ─── get_all_users ────────────────────────────────────────────────────────────
+
+
+async def test_get_all_users_sparse_fieldset(scenario):  # noqa ANN001
+    """``fields`` narrows the returned keys; username is always present and unknown fields get 400."""
+    response = await get_all_users(_as_user(scenario["company_admin"]), scenario["db"], fields="full_name")
+
+    assert json.loads(response.body) == [
+        {"username": "company_admin", "full_name": "Company_Admin"},
+        {"username": "regular_user", "full_name": "Regular_User"},
+    ]
+    with pytest.raises(HTTPException) as exc:
+        await get_all_users(_as_user(scenario["company_admin"]), scenario["db"], fields="password")
+    assert exc.value.status_code == http.HTTPStatus.BAD_REQUEST